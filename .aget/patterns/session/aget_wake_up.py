@@ -5,10 +5,18 @@ Wake Up Protocol Pattern - Start agent session with context.
 
 import json
 import subprocess
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Shared git status collector in the agent's scripts/ (ADR-004: absent = own git calls)
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'scripts'))
+try:
+    import repo_state as _repo
+except ImportError:
+    _repo = None
+
 
 class WakeProtocol:
     """Wake up protocol for starting agent sessions."""
@@ -204,6 +212,12 @@ class WakeProtocol:
 
     def _check_git(self) -> Dict[str, Any]:
         """Check git repository status."""
+        if _repo is not None:
+            state = _repo.repo_state(self.project_path, timeout=2)
+            if not state['is_repo']:
+                return {'is_repo': False, 'clean': False}
+            return {'is_repo': True, 'clean': state['clean'],
+                    'changes': list(state['changes'])}
         try:
             # Check if it's a git repo
             result = subprocess.run(
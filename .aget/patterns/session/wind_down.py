@@ -5,10 +5,18 @@ Wind Down Protocol Pattern - Save work and end session gracefully.
 
 import json
 import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List
 
+# Shared git status collector in the agent's scripts/ (ADR-004: absent = own git calls)
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'scripts'))
+try:
+    import repo_state as _repo
+except ImportError:
+    _repo = None
+
 
 class WindDownProtocol:
     """Wind down protocol for ending agent sessions."""
@@ -187,7 +195,19 @@ class WindDownProtocol:
         return "unknown"
 
     def _check_git_status(self) -> Dict[str, Any]:
-        """Check for uncommitted changes."""
+        """Check for uncommitted changes (uncached: see wind_down.py)."""
+        if _repo is not None:
+            state = _repo.repo_state(self.project_path, cache=False, timeout=2)
+            if not state['is_repo']:
+                return {'has_changes': False, 'is_repo': False}
+            if state['changes']:
+                return {
+                    'has_changes': True,
+                    'is_repo': True,
+                    'changes': list(state['changes']),
+                    'count': len(state['changes'])
+                }
+            return {'has_changes': False, 'is_repo': True}
         try:
             result = subprocess.run(
                 ['git', 'status', '--porcelain'],
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+study_topic benchmark suite.
+
+Runs scripts/study_topic.py as a user would (one process per invocation,
+--no-daemon) against a synthetic agent tree from generate_corpus.py and
+records wall-clock latency for:
+
+    startup              python3 study_topic.py --verify (interpreter + import floor)
+    cold_scan            --no-index: every file read and regex-scanned, per query
+    index_build          first query after --reindex (tokenize the whole corpus)
+    indexed_query        warm index, result cache bypassed, per query
+    cached_query         warm index and result cache, per query
+    incremental_refresh  --touch files edited, then one indexed query
+    batch                every batch topic through one --topics-file process
+
+Each scenario reports every run and min/median/max in ms; per-query
+scenarios add throughput (queries/s) and batch adds topics/s. Results are
+written as JSON with the commit they measured, so two commits can be
+compared (--compare OLD.json prints the median deltas).
+
+Usage:
+    python3 benchmarks/bench_study_topic.py                       # temp corpus, defaults
+    python3 benchmarks/bench_study_topic.py --scale 10 --repeat 5
+    python3 benchmarks/bench_study_topic.py --corpus /tmp/kb      # reuse a generated tree
+    python3 benchmarks/bench_study_topic.py --compare benchmarks/results/OLD.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import generate_corpus  # noqa: E402
+
+REPO = Path(__file__).resolve().parent.parent
+SCRIPT = REPO / 'scripts' / 'study_topic.py'
+RESULTS_DIR = REPO / 'benchmarks' / 'results'
+
+
+def run_study(corpus: Path, *args, stdin: str = None) -> tuple:
+    """(elapsed ms, parsed JSON stdout or None) for one study_topic process
+    (None also for batch output, which is one JSON document per line)."""
+    env = dict(os.environ, AGET_STUDY_ROOT=str(corpus))
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(SCRIPT), '--no-daemon', *args],
+                          input=stdin, capture_output=True, text=True, env=env)
+    elapsed = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f'study_topic {" ".join(args)} exited {proc.returncode}: '
+                           f'{proc.stderr.strip() or proc.stdout.strip()}')
+    try:
+        return elapsed, json.loads(proc.stdout)
+    except ValueError:
+        return elapsed, None
+
+
+def summarize(runs: list, per_run_items: int = None) -> dict:
+    out = {'runs_ms': [round(r, 2) for r in runs], 'min_ms': round(min(runs), 2),
+           'median_ms': round(statistics.median(runs), 2), 'max_ms': round(max(runs), 2)}
+    if per_run_items:
+        out['throughput_per_s'] = round(per_run_items * 1000 / statistics.median(runs), 2)
+    return out
+
+
+def drop_index(corpus: Path):
+    shutil.rmtree(corpus / '.aget' / 'index', ignore_errors=True)
+
+
+def touch_files(corpus: Path, count: int, round_no: int) -> int:
+    """Append a line to `count` L-docs, spread over the corpus. (Not session
+    notes: most of those sit in sealed monthly segments, which by design are
+    never re-tokenized.)"""
+    ldocs = sorted((corpus / '.aget' / 'evolution').glob('L*.md'))
+    step = max(1, len(ldocs) // max(count, 1))
+    touched = ldocs[::step][:count]
+    for path in touched:
+        with open(path, 'a') as f:
+            f.write(f'benchmark edit {round_no}\n')
+    return len(touched)
+
+
+def bench(corpus: Path, manifest: dict, repeat: int, touch: int) -> dict:
+    queries = manifest['queries']
+    sessions = ('--include-sessions', '--session-days', str(manifest['session_span_days']))
+    results = {}
+
+    results['startup'] = summarize([run_study(corpus, '--verify')[0] for _ in range(repeat)])
+
+    runs = []
+    for _ in range(repeat):
+        runs += [run_study(corpus, '--topic', q, '--json', '--no-index', *sessions)[0]
+                 for q in queries.values()]
+    results['cold_scan'] = summarize(runs, 1)
+
+    runs = []
+    for _ in range(repeat):
+        drop_index(corpus)
+        runs.append(run_study(corpus, '--topic', queries['common'], '--json', '--no-cache',
+                              '--reindex', *sessions)[0])
+    results['index_build'] = summarize(runs)
+
+    runs = []
+    for _ in range(repeat):
+        runs += [run_study(corpus, '--topic', q, '--json', '--no-cache', *sessions)[0]
+                 for q in queries.values()]
+    results['indexed_query'] = summarize(runs, 1)
+
+    for q in queries.values():          # fill the result cache
+        run_study(corpus, '--topic', q, '--json', *sessions)
+    runs = []
+    for _ in range(repeat):
+        runs += [run_study(corpus, '--topic', q, '--json', *sessions)[0]
+                 for q in queries.values()]
+    results['cached_query'] = summarize(runs, 1)
+
+    runs, refreshed = [], []
+    for n in range(repeat):
+        touched = touch_files(corpus, touch, n)
+        elapsed, output = run_study(corpus, '--topic', queries['mid'], '--json', '--no-cache',
+                                    *sessions)
+        runs.append(elapsed)
+        refreshed.append(output['search_contract']['index']['refresh']['changed'])
+    results['incremental_refresh'] = dict(summarize(runs), files_touched=touched,
+                                          files_retokenized=refreshed)
+
+    topics = '\n'.join(json.dumps({'topic': t}) for t in manifest['batch_topics']) + '\n'
+    runs = [run_study(corpus, '--topics-file', '-', '--no-cache', *sessions, stdin=topics)[0]
+            for _ in range(repeat)]
+    results['batch'] = dict(summarize(runs, len(manifest['batch_topics'])),
+                            topics=len(manifest['batch_topics']))
+    return results
+
+
+def git_revision() -> dict:
+    """Commit being measured; fail-soft outside a git checkout (ADR-004)."""
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=REPO, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {'commit': git('rev-parse', '--short', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--', 'scripts'))}
+
+
+def compare(old: dict, new: dict) -> str:
+    lines = [f"{'scenario':<22}{'old ms':>10}{'new ms':>10}{'change':>9}"]
+    for name, result in new['results'].items():
+        before = old.get('results', {}).get(name)
+        if not before:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms'] * 100
+        lines.append(f"{name:<22}{before['median_ms']:>10.1f}{result['median_ms']:>10.1f}"
+                     f"{change:>+8.1f}%")
+    return '\n'.join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Benchmark study_topic on a synthetic corpus')
+    parser.add_argument('--corpus', metavar='DIR',
+                        help='Use this generated tree (default: generate into a temp dir)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario (default 3)')
+    parser.add_argument('--touch', type=int, default=10,
+                        help='Files edited per incremental_refresh run (default 10)')
+    parser.add_argument('--output', metavar='PATH',
+                        help='Results JSON (default benchmarks/results/study_topic-<commit>.json)')
+    parser.add_argument('--compare', metavar='OLD_JSON',
+                        help='Print median deltas against an earlier results file')
+    generate_corpus.add_corpus_arguments(parser)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    workdir = None
+    if args.corpus:
+        corpus = Path(args.corpus)
+        manifest_path = corpus / generate_corpus.MANIFEST
+        if not manifest_path.exists():
+            print(f'Error: {corpus} has no {generate_corpus.MANIFEST} '
+                  f'(generate it with generate_corpus.py)', file=sys.stderr)
+            return 1
+        manifest = json.loads(manifest_path.read_text())
+    else:
+        workdir = tempfile.mkdtemp(prefix='study_topic_bench_')
+        corpus = Path(workdir)
+        manifest = generate_corpus.generate(corpus, **generate_corpus.corpus_options(args))
+    try:
+        started = datetime.now()
+        results = bench(corpus, manifest, args.repeat, args.touch)
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            drop_index(corpus)
+
+    report = {'benchmark': 'study_topic', 'timestamp': started.isoformat(),
+              'revision': git_revision(),
+              'environment': {'python': platform.python_version(),
+                              'platform': platform.platform(), 'cpus': os.cpu_count()},
+              'corpus': {k: v for k, v in manifest.items() if k != 'batch_topics'},
+              'repeat': args.repeat, 'results': results}
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"study_topic-{report['revision']['commit'] or 'unknown'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + '\n')
+
+    for name, result in results.items():
+        print(f"{name:<22}median {result['median_ms']:>9.1f} ms", file=sys.stderr)
+    print(f'-> {output}', file=sys.stderr)
+    if args.compare:
+        print(compare(json.loads(Path(args.compare).read_text()), report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Synthetic agent tree generator for the study_topic benchmarks.
+
+A real fleet KB (thousands of session notes, hundreds of L-docs and specs) is
+not something a benchmark can check in, and this repo's own tree is far too
+small to show scaling. This writes a deterministic stand-in: every surface
+study_topic searches, laid out the way its SURFACE_RULES expect, with text
+drawn from a synthetic vocabulary under a Zipf distribution so common, mid
+and rare terms behave like real ones (long postings lists vs short).
+
+Same seed + same parameters = the same tree, so two commits are benchmarked
+against the same corpus. Session dates are relative to the day of generation,
+so a --session-days window always covers the same share of them.
+
+Usage:
+    python3 benchmarks/generate_corpus.py /tmp/kb                  # defaults
+    python3 benchmarks/generate_corpus.py /tmp/kb --scale 10       # 10x every count
+    python3 benchmarks/generate_corpus.py /tmp/kb --sessions 5000 --vocab 20000 --zipf 1.2
+
+The tree root gets a .bench_corpus.json manifest (parameters, file and byte
+counts, and suggested query topics at several document frequencies) that
+bench_study_topic.py reads.
+"""
+
+import argparse
+import bisect
+import datetime
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+MANIFEST = '.bench_corpus.json'
+
+# Files per surface at --scale 1.
+COUNTS = {'ldocs': 200, 'sessions': 500, 'specs': 50, 'plans': 20, 'sops': 30,
+          'governance': 10, 'knowledge': 50, 'patterns': 40, 'inbox': 20}
+
+SYLLABLES = [c + v for c in 'bcdfghklmnprstvz' for v in 'aeiou']
+
+
+def vocabulary(size: int, rng: random.Random) -> list:
+    """`size` distinct pronounceable words, most frequent first."""
+    words, seen = [], set()
+    for length in itertools.cycle((2, 3, 3, 4)):
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(length))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+            if len(words) == size:
+                return words
+
+
+class TextSource:
+    """Zipf-distributed words and lines over a fixed vocabulary."""
+
+    def __init__(self, words: list, exponent: float, rng: random.Random):
+        self.words = words
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(
+            1.0 / rank ** exponent for rank in range(1, len(words) + 1)))
+
+    def word(self) -> str:
+        return self.words[bisect.bisect(self.cumulative,
+                                        self.rng.random() * self.cumulative[-1])]
+
+    def line(self, min_words: int = 6, max_words: int = 16) -> str:
+        return ' '.join(self.word() for _ in range(self.rng.randint(min_words, max_words)))
+
+    def document(self, title: str, min_lines: int, max_lines: int, header: str = '') -> str:
+        lines = [f'# {title}', '']
+        if header:
+            lines += [header, '']
+        for n in range(self.rng.randint(min_lines, max_lines)):
+            if n and n % 12 == 0:
+                lines += ['', f'## {self.line(2, 4).title()}', '']
+            lines.append(self.line())
+        return '\n'.join(lines) + '\n'
+
+
+def generate(root: Path, scale: float = 1.0, counts: dict = None, vocab: int = 5000,
+             zipf: float = 1.1, min_lines: int = 20, max_lines: int = 200,
+             session_span_days: int = 730, seed: int = 1) -> dict:
+    """Write the synthetic tree under `root`; returns (and writes) its manifest."""
+    rng = random.Random(seed)
+    words = vocabulary(vocab, rng)
+    text = TextSource(words, zipf, rng)
+    counts = dict({k: max(0, round(v * scale)) for k, v in COUNTS.items()}, **(counts or {}))
+    root = Path(root)
+    today = datetime.date.today()
+    written = {'files': 0, 'bytes': 0}
+
+    def write(rel: str, title: str, header: str = ''):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = text.document(title, min_lines, max_lines, header).encode()
+        path.write_bytes(data)
+        written['files'] += 1
+        written['bytes'] += len(data)
+
+    def slug(n_words: int = 2) -> str:
+        return '_'.join(text.word() for _ in range(n_words))
+
+    for n in range(counts['ldocs']):
+        name = slug()
+        write(f'.aget/evolution/L{n + 1:04d}_{name}.md', f'L{n + 1:04d}: {name}',
+              f'**Date**: {today.isoformat()}')
+    for n in range(counts['sessions']):
+        day = today - datetime.timedelta(days=rng.randrange(session_span_days))
+        write(f'sessions/SESSION_{day.isoformat()}_{slug(1)}_{n}.md', f'Session {day}')
+    for n in range(counts['specs']):
+        name = slug().upper()
+        write(f'specs/SPEC_{name}_{n}.md', f'Spec {name}')
+    for n in range(counts['plans']):
+        status = 'Active' if rng.random() < 0.3 else 'Complete'
+        write(f'planning/PROJECT_PLAN_{slug()}_{n}.md', f'Plan {n}', f'**Status**: {status}')
+    for n in range(counts['sops']):
+        write(f'sops/SOP_{slug()}_{n}.md', f'SOP {n}')
+    for n in range(counts['governance']):
+        write(f'governance/{slug().upper()}_{n}.md', f'Governance {n}')
+    for n in range(counts['knowledge']):
+        write(f'knowledge/{slug(1)}/{slug()}_{n}.md', f'Knowledge {n}')
+    for n in range(counts['patterns']):
+        write(f'docs/patterns/PATTERN_{slug()}_{n}.md', f'Pattern {n}')
+    for n in range(counts['inbox']):
+        write(f'inbox/NOTIFY_{slug()}_{n}.md', f'Inbox {n}')
+
+    # Topics at a spread of document frequencies, plus the query shapes the
+    # index treats specially (multi-keyword, phrase, NEAR).
+    pick = lambda rank: words[min(rank, len(words) - 1)]
+    queries = {'common': pick(3), 'mid': pick(len(words) // 20), 'rare': pick(len(words) // 2),
+               'two_words': f'{pick(10)} {pick(len(words) // 10)}',
+               'phrase': f'"{pick(1)} {pick(2)}"', 'near': f'{pick(4)} NEAR/5 {pick(40)}'}
+    batch = [pick(rng.randrange(len(words) // 4)) for _ in range(20)]
+    manifest = {'seed': seed, 'scale': scale, 'counts': counts, 'vocab': vocab, 'zipf': zipf,
+                'lines': [min_lines, max_lines], 'session_span_days': session_span_days,
+                'generated_on': today.isoformat(), 'files': written['files'],
+                'bytes': written['bytes'], 'queries': queries, 'batch_topics': batch}
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2) + '\n')
+    return manifest
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser):
+    """Corpus-shape flags, shared with bench_study_topic.py."""
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every per-surface count (default 1)')
+    for surface, count in COUNTS.items():
+        parser.add_argument(f'--{surface}', type=int, metavar='N',
+                            help=f'{surface} files (default {count} x scale)')
+    parser.add_argument('--vocab', type=int, default=5000, help='Vocabulary size (default 5000)')
+    parser.add_argument('--zipf', type=float, default=1.1,
+                        help='Zipf exponent of word frequencies (default 1.1)')
+    parser.add_argument('--min-lines', type=int, default=20, help='Body lines per file, minimum')
+    parser.add_argument('--max-lines', type=int, default=200, help='Body lines per file, maximum')
+    parser.add_argument('--session-span-days', type=int, default=730,
+                        help='Session filename dates spread over this many days back')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default 1)')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Generate a synthetic agent tree for benchmarks')
+    parser.add_argument('root', help='Directory to write (created; existing files are overwritten)')
+    add_corpus_arguments(parser)
+    return parser
+
+
+def corpus_options(args) -> dict:
+    """generate() keyword arguments from parsed build_parser() flags."""
+    counts = {s: getattr(args, s) for s in COUNTS if getattr(args, s) is not None}
+    return {'scale': args.scale, 'counts': counts, 'vocab': args.vocab, 'zipf': args.zipf,
+            'min_lines': args.min_lines, 'max_lines': args.max_lines,
+            'session_span_days': args.session_span_days, 'seed': args.seed}
+
+
+def main():
+    args = build_parser().parse_args()
+    manifest = generate(Path(args.root), **corpus_options(args))
+    print(f"{manifest['files']} files, {manifest['bytes']:,} bytes -> {args.root}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
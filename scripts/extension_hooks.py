@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Extension Hooks - shared loader for the framework scripts' instance hooks
+
+wake_up.py (WU-008), wind_down.py (WD-008), health_check.py and
+study_topic.py (v3.26 C-26-05) each call scripts/<name>_ext.py:<entry>(data)
+after gathering their data. Each used to exec the hook source through
+spec_from_file_location on every call: recompiled whenever bytecode is not
+written (PYTHONDONTWRITEBYTECODE, a read-only checkout), re-executed per
+topic in study_topic batch and --serve runs, and never timed, so a slow
+hook was indistinguishable from a slow script.
+
+This loader:
+  - compiles a hook once per source content: code objects are kept in a
+    marshal cache keyed on the hook's resolved path, its source hash and the
+    interpreter's cache tag (~/.aget/cache/hooks/, or $AGET_CACHE_DIR/hooks/).
+    The path is part of the key because a code object carries its
+    co_filename, so two identical hooks cannot share one. Writing an entry
+    evicts the same hook's older entries and any entry unused for
+    HOOK_CACHE_MAX_AGE. The cache does not depend on source mtimes and still
+    works when __pycache__ cannot be written.
+  - imports each hook module once per process; a changed source (new hash)
+    is re-imported.
+  - times the load and the call, and enforces an opt-in time budget. With
+    one set, the hook runs on a copy of the data in a worker thread. If it
+    overruns, the caller warns on stderr and continues with its own data;
+    the late result is discarded. The hook itself cannot be stopped and runs
+    on until the interpreter exits, so only budget hooks whose side effects
+    can be cut off at any point.
+  - returns a report for the caller's JSON output: status, load/run ms,
+    budget and code-cache outcome.
+
+Budget, in priority order: the caller's argument, $AGET_HOOK_BUDGET_MS,
+.aget/config.json "extension_hooks": {"budget_ms": N}, HOOK_BUDGET_MS_DEFAULT.
+0 = unlimited, the default: the hook runs inline to completion, as before.
+
+Contract per hook is unchanged: the hook receives the data dict and returns
+the augmented dict (additive-only, L464). Absence = no-op; failure or a
+non-dict return = the data as the hook left it or as it was, plus a warning
+(ADR-004).
+"""
+
+import copy
+import hashlib
+import json
+import marshal
+import os
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+HOOK_BUDGET_MS_DEFAULT = 0
+# Seconds a marshal cache entry may go unused before a miss evicts it.
+HOOK_CACHE_MAX_AGE = 30 * 86400
+
+# Hook modules imported by this process: source path -> (source hash, module).
+_MODULES = {}
+
+
+def cache_dir() -> Path:
+    """User-level AGET cache root (~/.aget/cache, or $AGET_CACHE_DIR)."""
+    return Path(os.environ.get('AGET_CACHE_DIR') or Path.home() / '.aget' / 'cache')
+
+
+def hook_budget_ms(agent_path: Path, budget_ms: int = None) -> int:
+    """Resolve the time budget (see module docstring)."""
+    if budget_ms is not None:
+        return budget_ms
+    if os.environ.get('AGET_HOOK_BUDGET_MS'):
+        try:
+            return int(os.environ['AGET_HOOK_BUDGET_MS'])
+        except ValueError:
+            pass
+    try:
+        config = json.loads((Path(agent_path) / '.aget' / 'config.json').read_text())
+        return int(config.get('extension_hooks', {}).get('budget_ms', HOOK_BUDGET_MS_DEFAULT))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return HOOK_BUDGET_MS_DEFAULT
+
+
+def _evict(directory: Path, keep: Path, prefix: str) -> None:
+    """Drop the hook's other entries (older source, other interpreter) and
+    any entry unused for HOOK_CACHE_MAX_AGE."""
+    cutoff = time.time() - HOOK_CACHE_MAX_AGE
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name == keep.name:
+            continue
+        try:
+            if ((entry.name.startswith(prefix) and entry.name.endswith('.bin'))
+                    or entry.stat().st_mtime < cutoff):
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def _compile(path: Path, source: bytes, digest: str) -> tuple:
+    """(code object, 'hit' | 'miss' | 'uncached') via the marshal cache.
+    A hit refreshes the entry's mtime, which is what eviction ages on."""
+    filename = str(path.resolve())
+    place = hashlib.blake2b(filename.encode(), digest_size=8).hexdigest()
+    prefix = f'{path.stem}-{place}-'
+    tag = sys.implementation.cache_tag
+    cached = cache_dir() / 'hooks' / f'{prefix}{digest}-{tag}.bin' if tag else None
+    if cached is not None:
+        try:
+            code = marshal.loads(cached.read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+        else:
+            try:
+                os.utime(cached)
+            except OSError:
+                pass
+            return code, 'hit'
+    code = compile(source, filename, 'exec', dont_inherit=True)
+    if cached is None:
+        return code, 'uncached'
+    tmp = cached.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(marshal.dumps(code))
+        os.replace(tmp, cached)
+    except OSError:
+        return code, 'uncached'
+    _evict(cached.parent, cached, prefix)
+    return code, 'miss'
+
+
+def load_hook(path: Path) -> tuple:
+    """(module, code cache outcome) for a hook source file; 'memory' when this
+    process already imported the same content."""
+    path = Path(path)
+    source = path.read_bytes()
+    digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+    known = _MODULES.get(str(path))
+    if known is not None and known[0] == digest:
+        return known[1], 'memory'
+    code, outcome = _compile(path, source, digest)
+    module = types.ModuleType(path.stem)
+    module.__file__ = str(path)
+    exec(code, module.__dict__)
+    _MODULES[str(path)] = (digest, module)
+    return module, outcome
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def call_hook(agent_path: Path, name: str, entry: str, data: dict,
+              budget_ms: int = None) -> tuple:
+    """Call scripts/<name>_ext.py:<entry>(data) under the time budget.
+
+    Returns (data to use, report). Report 'status': 'absent' (no hook file),
+    'no_entry' (no such function), 'ok', 'non_dict', 'failed' or
+    'over_budget'.
+    """
+    ext_path = Path(agent_path) / 'scripts' / f'{name}_ext.py'
+    report = {'hook': f'scripts/{ext_path.name}', 'status': 'absent'}
+    if not ext_path.exists():
+        return data, report
+    budget = hook_budget_ms(agent_path, budget_ms)
+    report.update({'budget_ms': budget, 'load_ms': 0.0, 'run_ms': 0.0})
+    started = time.perf_counter()
+    try:
+        module, report['code_cache'] = load_hook(ext_path)
+    except Exception as e:
+        report.update({'status': 'failed', 'load_ms': _ms(started), 'error': str(e)})
+        print(f"Warning: {name} extension hook failed: {e}", file=sys.stderr)
+        return data, report
+    report['load_ms'] = _ms(started)
+    function = getattr(module, entry, None)
+    if function is None:
+        report['status'] = 'no_entry'
+        return data, report
+
+    payload = copy.deepcopy(data)
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = function(payload)
+        except Exception as e:
+            outcome['error'] = e
+
+    started = time.perf_counter()
+    if budget > 0:
+        worker = threading.Thread(target=run, name=f'{name}_ext', daemon=True)
+        worker.start()
+        worker.join(budget / 1000)
+        overran = worker.is_alive()
+    else:
+        run()
+        overran = False
+    report['run_ms'] = _ms(started)
+    if overran:
+        report['status'] = 'over_budget'
+        print(f"Warning: {name} extension hook exceeded its {budget} ms budget; "
+              f"continuing without it", file=sys.stderr)
+        return data, report
+    if 'error' in outcome:
+        report.update({'status': 'failed', 'error': str(outcome['error'])})
+        print(f"Warning: {name} extension hook failed: {outcome['error']}", file=sys.stderr)
+        return data, report
+    if not isinstance(outcome.get('result'), dict):
+        report['status'] = 'non_dict'
+        return payload, report
+    report['status'] = 'ok'
+    return outcome['result'], report
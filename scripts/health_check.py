@@ -46,6 +46,12 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+try:
+    import extension_hooks as _hooks  # noqa: E402  (shared hook loader)
+except ImportError:  # loader not deployed — hooks exec'd in-process, untimed (ADR-004)
+    _hooks = None
+
 
 # =============================================================================
 # L039: Diagnostic Efficiency - Timing
@@ -622,7 +628,17 @@ def call_extension_hook(agent_path, data, verbose=False):
     needing agent-specific checks had no hook point and patched the
     Framework_Artifact itself, which the next upgrade clobbered (legalon
     GATE-0 halt class).
+
+    Loaded, timed and (opt-in) held to a time budget by extension_hooks.py;
+    when a hook exists its report lands in data['extension_hook'].
     """
+    if _hooks is not None:
+        data, report = _hooks.call_hook(agent_path, 'health_check', 'post_health', data)
+        if verbose and report['status'] == 'non_dict':
+            log_diagnostic("health_check_ext returned non-dict, ignoring")
+        if report['status'] != 'absent':
+            data['extension_hook'] = report
+        return data
     ext_path = agent_path / 'scripts' / 'health_check_ext.py'
     if not ext_path.exists():
         return data
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Repo State - one git invocation for the session scripts' working-tree view
+
+wake_up.py ran `git rev-parse --abbrev-ref HEAD` and `git status --porcelain`,
+wind_down.py another `git status --porcelain`, and the session patterns
+(.aget/patterns/session/) `git rev-parse --git-dir` plus their own status
+call: up to five git processes per session boundary for one fact.
+
+This collector runs a single `git status --porcelain=v2 --branch -z` and
+parses branch, upstream, ahead/behind and the change list from it. Results
+are kept per process, keyed on the repository's .git/index and HEAD mtimes:
+anything that stages, commits or switches branches rewrites one of them, so
+a second caller in the same process (wake_up and its hook, a pattern and the
+script it wraps) gets the cached state. Edits to tracked files and new
+untracked files do not touch the index, so callers that must see them pass
+cache=False.
+
+State keys:
+    is_repo     False outside a work tree (or when git is missing / times out)
+    branch      branch name; 'HEAD' when detached, 'unknown' when not a repo
+    oid         HEAD commit, None before the first commit
+    upstream    tracking branch or None; ahead/behind are None without one
+    changes     `git status --porcelain` (v1) style lines, e.g. ' M file',
+                '?? dir/', 'R  old -> new' — paths are not quoted
+    staged, unstaged, untracked, conflicted   counts
+    clean       no changes; None when not a repo
+
+Fail-soft (ADR-004): errors yield the not-a-repo state, never an exception.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Per-process cache: resolved path -> (index/HEAD mtimes, state).
+_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def not_a_repo() -> Dict[str, Any]:
+    return {'is_repo': False, 'branch': 'unknown', 'oid': None, 'upstream': None,
+            'ahead': None, 'behind': None, 'changes': [], 'staged': 0,
+            'unstaged': 0, 'untracked': 0, 'conflicted': 0, 'clean': None}
+
+
+def git_dir(path: Path) -> Optional[Path]:
+    """The .git directory for `path` (following a worktree's `gitdir:` file),
+    found without running git; None if there is none."""
+    for candidate in [path, *path.parents]:
+        dot_git = candidate / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                pointer = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if pointer.startswith('gitdir:'):
+                return (candidate / pointer[len('gitdir:'):].strip()).resolve()
+            return None
+    return None
+
+
+def _cache_key(path: Path) -> Optional[Tuple[int, int]]:
+    directory = git_dir(path)
+    if directory is None:
+        return None
+    mtimes = []
+    for name in ('index', 'HEAD'):
+        try:
+            mtimes.append((directory / name).stat().st_mtime_ns)
+        except OSError:
+            mtimes.append(0)
+    return tuple(mtimes)
+
+
+def parse_status(output: str) -> Dict[str, Any]:
+    """State from `git status --porcelain=v2 --branch -z` output."""
+    state = not_a_repo()
+    state['is_repo'] = True
+    changes: List[str] = []
+    records = output.split('\0')
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        if record.startswith('# '):
+            key, _, value = record[2:].partition(' ')
+            if key == 'branch.oid':
+                state['oid'] = None if value == '(initial)' else value
+            elif key == 'branch.head':
+                state['branch'] = 'HEAD' if value == '(detached)' else value
+            elif key == 'branch.upstream':
+                state['upstream'] = value
+            elif key == 'branch.ab':
+                ahead, behind = value.split()
+                state['ahead'], state['behind'] = int(ahead), abs(int(behind))
+            continue
+        kind = record[0]
+        if kind == '?':
+            state['untracked'] += 1
+            changes.append(f'?? {record[2:]}')
+        elif kind == '1':
+            xy, path = record[2:4], record.split(' ', 8)[8]
+            changes.append(f"{xy.replace('.', ' ')} {path}")
+        elif kind == '2':
+            xy, path = record[2:4], record.split(' ', 9)[9]
+            original = records[i]
+            i += 1
+            changes.append(f"{xy.replace('.', ' ')} {original} -> {path}")
+        elif kind == 'u':
+            xy, path = record[2:4], record.split(' ', 10)[10]
+            state['conflicted'] += 1
+            changes.append(f'{xy} {path}')
+            continue
+        else:
+            continue
+        if kind != '?':
+            state['staged'] += xy[0] != '.'
+            state['unstaged'] += xy[1] != '.'
+    state['changes'] = changes
+    state['clean'] = not changes
+    return state
+
+
+def repo_state(path: Path, cache: bool = True, timeout: float = 5,
+               run: Optional[Callable[..., subprocess.CompletedProcess]] = None
+               ) -> Dict[str, Any]:
+    """Working-tree state for `path` (see module docstring). The returned
+    dict is shared with other callers when cached: copy before mutating.
+
+    `run` replaces subprocess.run for the git call (wake_up.py passes one
+    that can kill the child at its deadline); it gets the command, timeout
+    and cwd and must capture text output."""
+    path = Path(path).resolve()
+    key = _cache_key(path) if cache else None
+    if key is not None:
+        known = _CACHE.get(str(path))
+        if known is not None and known[0] == key:
+            return known[1]
+    try:
+        command = ['git', 'status', '--porcelain=v2', '--branch', '-z']
+        if run is None:
+            result = subprocess.run(command, capture_output=True, text=True,
+                                    timeout=timeout, cwd=str(path))
+        else:
+            result = run(command, timeout=timeout, cwd=str(path))
+    except (subprocess.TimeoutExpired, OSError):
+        return not_a_repo()
+    if result.returncode != 0:
+        return not_a_repo()
+    state = parse_status(result.stdout)
+    if cache:
+        key = _cache_key(path)  # after the call: git status may refresh the index
+        if key is not None:
+            _CACHE[str(path)] = (key, state)
+    return state
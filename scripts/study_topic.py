@@ -25,18 +25,99 @@ Related: L187 (Silent execution), L335 (Memory Architecture), L761, L762
 Usage:
     python3 study_topic.py --topic "wind down"       # Research wind down
     python3 study_topic.py --topic "release" --json  # JSON output
+    python3 study_topic.py --topic "release" --ndjson    # Stream hits as surfaces finish
+    python3 study_topic.py --topic "release" --no-index  # Bypass the index (full scan)
+    python3 study_topic.py --topic "release" --reindex   # Rebuild the index from scratch
+    python3 study_topic.py --topic "release" --jobs 4    # Scan/tokenize in 4 processes
+    python3 study_topic.py --topics-file topics.jsonl    # Batch: one JSON line per topic
+    python3 study_topic.py --serve                       # Resident daemon (Unix socket)
     python3 study_topic.py --verify                  # Migration verification
 """
 
 import argparse
+import bisect
+import codecs
+import concurrent.futures
+import contextlib
+import copy
+import fnmatch
+import functools
 import importlib.util
+import itertools
 import json
+import locale
+import mmap
 import os
 import re
 import sys
+import time
+from array import array
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+try:
+    import study_topic_index as _sti  # noqa: E402  (persistent inverted index)
+except ImportError:  # index module not deployed — regex scan only (ADR-004)
+    _sti = None
+try:
+    import extension_hooks as _hooks  # noqa: E402  (shared hook loader)
+except ImportError:  # loader not deployed — hooks exec'd in-process, untimed (ADR-004)
+    _hooks = None
+
+# Active index for this run (set in main unless --no-index). When present,
+# search_file_for_topic answers token-shaped keywords from postings instead of
+# re-scanning file bytes; results are identical to the scan path.
+_INDEX = None
+
+# Per-keyword match counts of every hit this run, keyed by result 'file'.
+# Finders keep only their display fields, so term frequencies for the BM25
+# ranker are carried here rather than in the findings themselves.
+_KEYWORD_COUNTS = {}
+
+# Context line numbers (0-based, body lines) of every hit, keyed like
+# _KEYWORD_COUNTS. Finders never read context text; attach_contexts() reads
+# just these lines for the items actually displayed (or all, with --all).
+_MATCH_LINES = {}
+
+# describe_file() of every scan-path hit, keyed like _KEYWORD_COUNTS, so
+# finders needing a title or plan status never read the file a second time.
+_FILE_META = {}
+
+# Scan-path results keyed by (path, topic, domain keywords): filled ahead of
+# the finders by worker processes (--jobs N) and by every serial scan, so a
+# file reachable from two surfaces is read once. Finders still run in their
+# own order and see exactly what a serial scan would have returned.
+_PREFETCH = {}
+
+# read_text() decodes with the locale encoding; the mmap path decodes UTF-8.
+_UTF8_LOCALE = codecs.lookup(locale.getpreferredencoding(False)).name == 'utf-8'
+
+# Finished-study LRU (study_topic_index.ResultCache); needs the index.
+_CACHE = None
+
+# Identifies this scorer version in result-cache keys.
+_CODE_STAMP = '/'.join(f'{st.st_size}:{st.st_mtime_ns}' for st in (
+    os.stat(p) for p in (__file__, Path(__file__).with_name('study_topic_index.py'))
+    if os.path.exists(p)))
+
+# True inside a --serve daemon; recorded in search_contract['served_by'].
+_SERVING = False
+
+# Term expansion of the current study (--stem / --fuzzy): None, or (stem on,
+# fuzzy distance cap or None). Set per study; see expansion_setting().
+_EXPANSION = None
+
+# --like PATH: {index key: (cosine, shared terms, context lines)} from
+# StudyIndex.similar, set per study. While set, search_file_for_topic answers
+# from this table instead of matching keywords, so every finder keeps its own
+# surface rules and item shape.
+_LIKE = None
+
+# --profile: the StudyProfile of the current study, None otherwise. Every
+# probe below is a single `is not None` test when profiling is off.
+_PROFILE = None
+
 
 def get_agent_root():
     """Get the agent root directory."""
@@ -67,6 +148,9 @@ def load_study_topic_config():
         return {}
 
 
+PURPOSES = ('pre-implementation', 'pre-release', 'exploration', 'audit')
+
+
 def resolve_purpose(explicit_purpose, config):
     """Resolve epistemic purpose from flag or config default.
 
@@ -124,7 +208,13 @@ def compute_domain_boost(content, domain_keywords):
     """
     if not domain_keywords:
         return 1.0
-    matches = sum(1 for kw in domain_keywords if kw.lower() in content.lower())
+    content = content.lower()
+    return domain_boost_for(sum(1 for kw in domain_keywords if kw.lower() in content))
+
+
+def domain_boost_for(matches):
+    """compute_domain_boost() from the number of domain keywords present in
+    the file, as counted by the combined-matcher scan or the index."""
     return min(2.0, 1.0 + matches * 0.25)
 
 
@@ -152,6 +242,20 @@ STOPWORDS = {'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
 SHORT_TOKEN_LEN = 5      # tokens ≤ this use word-boundary matching (audit M4)
 FILENAME_BOOST = 3.0     # name/title match is the strongest feature (audit R2, #1757)
 RELEVANCE_FLOOR_DEFAULT = 2.0  # composite-score floor (audit R3, #1560); --no-floor escapes
+REPORT_TOP_K = 5          # items shown (and given context snippets) per section
+NEAR_DEFAULT_DISTANCE = 10  # bare NEAR = NEAR/10 (the SQLite FTS5 default)
+EXPANSION_LIST_MAX = 20   # variants listed per keyword in search_contract['expansion']
+LIKE_SCORE_SCALE = 10.0   # --like score = cosine x this x purpose: cosine 0.2 meets the floor
+LIKE_TERMS_LISTED = 10    # heaviest source terms shown in search_contract['ranking']
+MMAP_MIN_BYTES = 1 << 20  # scan-path files this large are searched through mmap
+MMAP_CHUNK = 1 << 20      # bytes materialized at a time when counting lines / validating
+
+# Non-ASCII characters that case-insensitively match, or lower-case to, an
+# ASCII letter (U+0130 İ, U+0131 ı, U+017F ſ, U+212A Kelvin sign). A line
+# holding one can match an ASCII keyword under str IGNORECASE / str.lower()
+# while an ASCII-folding byte regex would miss it, so the mmap prefilter
+# treats them as needles too. tests/ re-derive this set from unicodedata.
+ASCII_CASE_ALIASES = ('\u0130', '\u0131', '\u017f', '\u212a')
 
 SURFACES_SEARCHED = [
     '.aget/evolution/**/L*.md (RECURSIVE — includes discoveries/; 2026-07-25 fix)',
@@ -186,22 +290,132 @@ def prepare_keywords(topic: str) -> list:
     handling — a trailing comma ("health,") previously survived into the token
     and broke word-boundary matching silently. Internal punctuation survives
     ("v3.26" is untouched; only token edges are stripped).
+
+    Phrase and proximity operators: a quoted multi-word phrase ("wind down")
+    is ONE keyword, and `a NEAR/k b` (bare NEAR = NEAR/10) joins its operands
+    — words or phrases — into one keyword; see query_term() for how they
+    match. Stopwords inside either are kept. A topic using neither operator
+    is tokenized exactly as before.
     """
+    units = [('phrase', m.group(1)) if m.group(1) is not None else ('word', m.group(2))
+             for m in _QUERY_UNIT_RE.finditer(topic)]
+    if not any(_is_near(units, i) or (kind == 'phrase' and len(text.split()) > 1)
+               for i, (kind, text) in enumerate(units)):
+        units = [('word', kw) for kw in topic.split()]
     raw = [kw for kw in topic.split() if re.search(r'\w', kw)]
+    near = {i for i in range(len(units)) if _is_near(units, i)}
+    operands = {i + d for i in near for d in (-1, 1)}
     seen, out = set(), []
-    for kw in raw:
-        kw = kw.strip('.,;:!?"\'`()[]{}<>*_-/\\')  # edges only (gh#1876)
-        if not kw:
+    for i, (kind, text) in enumerate(units):
+        if i in near:
+            m = _NEAR_RE.fullmatch(text)
+            kw = (f'{_operand(units[i - 1])} NEAR/{m.group(1) or NEAR_DEFAULT_DISTANCE} '
+                  f'{_operand(units[i + 1])}')
+        elif i in operands:
             continue
-        kw = kw[:-2] if kw.lower().endswith("'s") else kw
+        elif kind == 'phrase' and len(text.split()) > 1:
+            kw = _operand((kind, text))
+        else:
+            kw = _clean_keyword(text)
+            if not kw or kw.lower() in STOPWORDS:
+                continue
         key = kw.lower()
-        if key in STOPWORDS or key in seen:
+        if key in seen:
             continue
         seen.add(key)
         out.append(kw)
     return out or raw
 
 
+_QUERY_UNIT_RE = re.compile(r'"([^"]*)"|(\S+)')
+_NEAR_RE = re.compile(r'NEAR(?:/(\d+))?')
+
+
+def _clean_keyword(kw: str) -> str:
+    """Edge punctuation (gh#1876) and possessive fold for one raw token."""
+    kw = kw.strip('.,;:!?"\'`()[]{}<>*_-/\\')  # edges only (gh#1876)
+    return kw[:-2] if kw.lower().endswith("'s") else kw
+
+
+def _operand(unit) -> str:
+    """Keyword text of a phrase/NEAR operand: a "quoted phrase" or a word."""
+    kind, text = unit
+    if kind == 'phrase' and len(text.split()) > 1:
+        return '"' + ' '.join(text.split()) + '"'
+    return _clean_keyword(text)
+
+
+def _is_near(units: list, i: int) -> bool:
+    """units[i] is a NEAR operator between two usable operands."""
+    def usable(j):
+        return (0 <= j < len(units) and re.search(r'\w', _operand(units[j]))
+                and not (units[j][0] == 'word' and _NEAR_RE.fullmatch(units[j][1])))
+    kind, text = units[i]
+    return kind == 'word' and bool(_NEAR_RE.fullmatch(text)) and usable(i - 1) and usable(i + 1)
+
+
+@functools.lru_cache(maxsize=256)
+def query_term(kw: str):
+    """Structure of a phrase/NEAR keyword, None for a plain one.
+
+    Returns (operands, distance): each operand is the tuple of \\w-runs that
+    must occur as consecutive tokens (punctuation between them is ignored,
+    as in the index's token model), each run matched under _token_pattern's
+    rules (short = whole-token forms, long = substring). A phrase is one
+    operand with distance None; `a NEAR/k b` is two operands with at most k
+    tokens between them, in either order. All tokens of a match lie in the
+    body or all in the filename text.
+
+    prepare_keywords() writes these keywords, but any spaced keyword is
+    accepted: a NEAR without /k gets NEAR_DEFAULT_DISTANCE, and text that is
+    not `operand NEAR operand` is one phrase of all its words."""
+    if ' ' not in kw:
+        return None
+    units = [m.group(1) if m.group(1) is not None else m.group(2)
+             for m in _QUERY_UNIT_RE.finditer(kw)]
+    near = _NEAR_RE.fullmatch(units[1]) if len(units) == 3 else None
+    if near is not None:
+        distance = int(near.group(1) or NEAR_DEFAULT_DISTANCE)
+        operands = (units[0], units[2])
+    else:
+        distance, operands = None, (' '.join(units),)
+    return tuple(tuple(re.findall(r'\w+', text)) for text in operands), distance
+
+
+def _word_matches(word: str, token: str, fold=str.lower) -> bool:
+    """One \\w-run of a phrase/NEAR operand against one (already folded) token."""
+    key = fold(word)
+    if len(word) <= SHORT_TOKEN_LEN:
+        return token in {key + suffix for suffix in ('', 's', 'es', 'ed', 'ing')}
+    return key in token
+
+
+def _term_lines(term, occurrences) -> list:
+    """Lines of every match of a query_term() (one per match, ascending;
+    -1 = filename). `occurrences(word)` gives {position: line} of the tokens
+    a word matches — positional postings or a tokenized scan alike."""
+    operands, distance = term
+    spans = []
+    for words in operands:
+        occ = [occurrences(word) for word in words]
+        spans.append([(p, line) for p, line in sorted(occ[0].items())
+                      if all(occ[i].get(p + i, 0) < 0 if line < 0
+                             else occ[i].get(p + i, -1) >= 0 for i in range(1, len(words)))])
+    if distance is None:
+        return sorted(line for _, line in spans[0])
+    first_len, second_len = len(operands[0]), len(operands[1])
+    starts = [p for p, _ in spans[1]]
+    lines = []
+    for p, line in spans[0]:
+        after = range(bisect.bisect_left(starts, p + first_len),
+                      bisect.bisect_right(starts, p + first_len + distance))
+        before = range(bisect.bisect_left(starts, p - second_len - distance),
+                       bisect.bisect_right(starts, p - second_len))
+        if any((spans[1][j][1] < 0) == (line < 0) for j in (*after, *before)):
+            lines.append(line)
+    return sorted(lines)
+
+
 def _token_pattern(kw: str) -> str:
     """Boundary semantics (audit M4 + M3): short tokens are word-boundary
     anchored with light inflection tolerance (so "check" stops matching
@@ -225,8 +439,673 @@ def composite_score(item: dict) -> float:
             * (1 + math.log2(count)))
 
 
+RANKERS = ('composite', 'bm25')
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def bm25_idf(doc_freq: int, docs: int) -> float:
+    """Non-negative BM25 idf (Lucene form): rare terms weigh more, a term in
+    every document still weighs a little."""
+    import math
+    return math.log(1 + (docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25_score(item: dict, idf: dict, doc_length: int, avg_length: float) -> float:
+    """Alternative ranking (--ranker bm25): BM25 over the keyword term
+    frequencies, length-normalized against the indexed corpus, times the same
+    purpose/domain/filename boosts as composite_score. Coverage is not a
+    separate factor — BM25 already rewards matching more distinct keywords."""
+    counts = _KEYWORD_COUNTS.get(item.get('file'), {})
+    norm = 1 - BM25_B + BM25_B * (doc_length / avg_length if avg_length else 1.0)
+    bm25 = sum(idf.get(kw, 0.0) * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+               for kw, tf in counts.items())
+    item['bm25'] = round(bm25, 4)
+    return (bm25
+            * item.get('purpose_boost', 1.0)
+            * item.get('domain_boost', 1.0)
+            * item.get('filename_boost', 1.0))
+
+
+def filename_text(file_path: Path) -> str:
+    """Searchable filename text: raw stem + slug-normalized stem (see the
+    filename-index note in search_file_for_topic)."""
+    return file_path.stem + ' ' + re.sub(r'[_\-.]+', ' ', file_path.stem)
+
+
+def plan_is_active(content: str) -> bool:
+    """PROJECT_PLAN activity probe (v3.25 C-25-14, gh#1809 + gh#1791).
+
+    Case-insensitive, Plan_Status-first. Plans write "In Progress" (title case) —
+    the old upper-case-only probe rendered every live plan [inactive]. Prefer the
+    disambiguated Plan_Status header (CAP-PP-003); fall back to legacy header
+    Status, then to whole-content scan for pre-template-2.1 plans.
+    """
+    m = (re.search(r'\*\*Plan_Status\*\*:\s*([^\n]*)', content)
+         or re.search(r'\*\*Status\*\*:\s*([^\n]*)', content))
+    probe = m.group(1) if m else content
+    return 'IN PROGRESS' in probe.upper()
+
+
+def describe_file(content: str) -> dict:
+    """Per-file metadata the finders need beyond match counts: the first
+    heading (L-doc title) and the plan activity probe. Stored in the index so
+    a warm query never re-reads a file for them."""
+    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+    return {'title': title_match.group(1) if title_match else None,
+            'is_active': plan_is_active(content)}
+
+
+def file_meta(file_path: Path) -> dict:
+    """describe_file() for one file — from this run's scan, the index, or a
+    read, in that order. Unreadable files yield empty metadata (callers fall
+    back per field)."""
+    cached = _FILE_META.get(_relative(file_path))
+    if cached is not None:
+        return cached
+    if _INDEX is not None:
+        rec = _INDEX.ensure(file_path)
+        if rec is not None:
+            return rec['meta']
+    try:
+        meta = describe_file(file_path.read_text())
+    except (OSError, UnicodeDecodeError):
+        return {}
+    _note_read(file_path)
+    return meta
+
+
+def _index_answerable(keywords: list) -> bool:
+    """Token-shaped keywords only: a \\w-run keyword can never match across a
+    token boundary, so the vocabulary answers it exactly. Phrase/NEAR keywords
+    are sequences of \\w-runs, answered from positional postings. Anything
+    else with internal punctuation ("v3.26") takes the regex scan."""
+    return bool(keywords) and all(re.fullmatch(r'\w+', kw) or query_term(kw)
+                                  for kw in keywords)
+
+
+def _short_forms(kw: str) -> set:
+    """Whole-token forms _token_pattern accepts for a short keyword."""
+    kw = kw.lower()
+    return {kw + suffix for suffix in ('', 's', 'es', 'ed', 'ing')}
+
+
+def _keyword_tokens(kw: str):
+    """Vocabulary tokens a token-shaped keyword matches (_token_pattern rules)."""
+    key = kw.lower()
+    if len(kw) <= SHORT_TOKEN_LEN:
+        return _INDEX.expand(key, _short_forms(key))
+    return _INDEX.expand(key)
+
+
+def expansion_setting(args):
+    """_EXPANSION for a run: needs study_topic_index's stemmer / edit
+    distance even on the scan path, so absent module = no expansion."""
+    if _sti is None or not (args.stem or args.fuzzy is not None):
+        return None
+    return (args.stem, args.fuzzy)
+
+
+def fuzzy_distance(word: str, cap: int) -> int:
+    """Edit budget for a keyword (Lucene-style AUTO, capped by --fuzzy N):
+    none up to 2 characters, 1 up to 5, 2 beyond."""
+    auto = 0 if len(word) <= 2 else 1 if len(word) <= 5 else 2
+    return min(auto, cap)
+
+
+def _expands(kw: str, token: str, expansion) -> bool:
+    """Does a (folded) token match keyword `kw` through --stem / --fuzzy?"""
+    stem_on, cap = expansion
+    key = kw.lower()
+    if stem_on and _sti.stem(token) == _sti.stem(key):
+        return True
+    if cap is None:
+        return False
+    budget = fuzzy_distance(kw, cap)
+    return budget > 0 and _sti.edit_distance(token, key, budget) <= budget
+
+
+def _expanded_tokens(kw: str):
+    """_keyword_tokens plus, under --stem / --fuzzy, the vocabulary's stem
+    variants and typo neighbours of `kw` (the index answers both)."""
+    tokens = _keyword_tokens(kw)
+    if _EXPANSION is None:
+        return tokens
+    stem_on, cap = _EXPANSION
+    tokens = dict(tokens)
+    if stem_on:
+        tokens.update(dict.fromkeys(_INDEX.stem_variants(kw)))
+    if cap is not None:
+        tokens.update(dict.fromkeys(_INDEX.fuzzy_neighbours(kw, fuzzy_distance(kw, cap))))
+    return tokens
+
+
+def _keyword_lines(rec: dict, kw: str) -> list:
+    """Sorted line numbers (one per match, -1 = filename) of `kw` in an
+    indexed file, under the same boundary semantics as _token_pattern."""
+    term = query_term(kw)
+    if term is not None:
+        return _term_lines(term, lambda word: _INDEX.positions_of(rec, _keyword_tokens(word)))
+    occ = _INDEX.occurrences(rec, _expanded_tokens(kw))
+    if len(kw) <= SHORT_TOKEN_LEN:
+        return sorted(ln for _, lines in occ for ln in lines)
+    key = kw.lower()
+    # An expanded variant without the keyword inside counts once per token.
+    return sorted(ln for token, lines in occ for ln in lines
+                  for _ in range(token.count(key) or 1))
+
+
+def keyword_doc_freq(kw: str) -> int:
+    """Indexed files holding `kw`. Punctuated keywords ("v3.26") are not
+    token-shaped; their count is the files holding every \\w-run of the keyword
+    — an upper bound, so their idf errs low rather than high. Phrase/NEAR
+    keywords are bounded the same way, by the files holding all their words."""
+    if re.fullmatch(r'\w+', kw):
+        return len(_INDEX.doc_ids(_expanded_tokens(kw)))
+    ids = _INDEX.all_ids()
+    term = query_term(kw)
+    if term is not None:
+        for word in {w for words in term[0] for w in words}:
+            ids &= _INDEX.doc_ids(_keyword_tokens(word))
+        return len(ids)
+    for run in re.findall(r'\w+', kw.lower()):
+        ids &= _INDEX.doc_ids(_INDEX.expand(run))
+    return len(ids)
+
+
+def apply_ranker(findings: dict, ranker: str, keywords: list) -> dict:
+    """Score every finding with the chosen ranker; returns the ranking block
+    for search_contract. BM25 needs the index's corpus statistics — without an
+    index it degrades to composite and says so (ADR-004)."""
+    ranking = {'requested': ranker, 'ranker': ranker}
+    if _LIKE is not None:
+        # --like: the keyword rankers have no keywords to weigh; similarity
+        # replaces them and keeps the purpose boost (and so the floor) intact.
+        ranking.update({'ranker': 'similarity',
+                        'formula': f'cosine(tf-idf) x {LIKE_SCORE_SCALE:g} x purpose'})
+        for items in findings.values():
+            for item in items if isinstance(items, list) else ():
+                cosine = _LIKE.get(_INDEX.key(get_agent_root() / item.get('file', '')),
+                                   (0.0,))[0]
+                item['similarity'] = round(cosine, 4)
+                item['score'] = cosine * LIKE_SCORE_SCALE * item.get('purpose_boost', 1.0)
+        return ranking
+    if ranker == 'bm25' and _INDEX is None:
+        ranking.update({'ranker': 'composite',
+                        'degraded': 'bm25 needs the persistent index (--no-index given '
+                                    'or index module absent)'})
+    if ranking['ranker'] == 'composite':
+        ranking['formula'] = ('keyword_coverage x purpose x domain x filename '
+                              'x (1 + log2(match_count))')
+        for items in findings.values():
+            for item in items if isinstance(items, list) else ():
+                item['score'] = composite_score(item)
+        return ranking
+
+    stats = _INDEX.corpus_stats()
+    idf = {kw: bm25_idf(keyword_doc_freq(kw), stats['docs']) for kw in keywords}
+    ranking.update({'formula': 'bm25 x purpose x domain x filename',
+                    'k1': BM25_K1, 'b': BM25_B, 'corpus_docs': stats['docs'],
+                    'avg_doc_length': round(stats['avg_length'], 2),
+                    'idf': {kw: round(v, 4) for kw, v in idf.items()}})
+    for items in findings.values():
+        for item in items if isinstance(items, list) else ():
+            rec = _INDEX.files.get(item.get('file', ''))
+            length = rec['length'] if rec else stats['avg_length']
+            item['score'] = bm25_score(item, idf, length, stats['avg_length'])
+    return ranking
+
+
+class LineTable:
+    """Newline-offset table for one file's text.
+
+    Built once per file (one pass over the newlines); a match offset maps to
+    its line by bisect and a line number to its text by slicing, so context
+    extraction is O(matches x log lines) and never counts from the start of
+    the file or splits the whole text into a line list.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.starts = array('L', [0])
+        self.starts.extend(m.end() for m in re.finditer('\n', content))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line_of(self, pos: int) -> int:
+        """0-based line holding character offset `pos`."""
+        return bisect.bisect_right(self.starts, pos) - 1
+
+    def text(self, line_no: int) -> str:
+        start = self.starts[line_no]
+        if line_no + 1 < len(self.starts):
+            return self.content[start:self.starts[line_no + 1] - 1]
+        return self.content[start:]
+
+
+class QueryMatcher:
+    """Single-pass matcher for one query (keywords + domain keywords).
+
+    Built once per query and cached across files (compile_query). Every
+    token-shaped keyword and domain keyword joins ONE compiled pattern that
+    matches each whole \\w-run containing any of them; each matched token is
+    then attributed to its keywords through a per-query token cache, under
+    exactly _token_pattern's rules (short = whole-token forms, long =
+    non-overlapping substring count). Attribution is per token rather than
+    per alternation branch because keywords can overlap inside one token
+    ("lesson" and "lessons" both count in "lessons") — a plain alternation
+    would consume the token for the first branch and undercount the rest.
+
+    Punctuated keywords ("v3.26") and phrase domain keywords cannot be
+    token-shaped; they keep their own pattern / one lowered copy per file.
+    Phrase/NEAR keywords (query_term) are matched on the file's token
+    sequence, built only when every word they need occurs in the text.
+    Under --stem / --fuzzy every token is a candidate (a variant need not
+    contain the keyword), attributed by the same predicate the index uses.
+    """
+
+    def __init__(self, keywords: tuple, domain_keywords: tuple, case_insensitive: bool = True,
+                 expansion=None):
+        self.keywords = keywords
+        self.expansion = expansion
+        self.domain_keywords = domain_keywords
+        self.flags = re.IGNORECASE if case_insensitive else 0
+        self._fold = str.lower if case_insensitive else (lambda s: s)
+        self.token_keywords = [kw for kw in keywords if re.fullmatch(r'\w+', kw)]
+        self.token_domain = [dk for dk in domain_keywords if re.fullmatch(r'\w+', dk)]
+        self.structured = [(kw, query_term(kw)) for kw in keywords if query_term(kw)]
+        self.punctuated = [(kw, re.compile(_token_pattern(kw), self.flags))
+                           for kw in keywords
+                           if kw not in self.token_keywords and not query_term(kw)]
+        self.phrase_domain = [dk.lower() for dk in domain_keywords
+                              if dk not in self.token_domain]
+        needles = sorted({self._fold(x) for x in self.token_keywords + self.token_domain},
+                         key=len, reverse=True)
+        self.pattern = (re.compile(r'\b\w*?(?:' + '|'.join(map(re.escape, needles)) + r')\w*',
+                                   self.flags) if needles else None)
+        if expansion is not None and self.token_keywords:
+            self.pattern = re.compile(r'\w+')
+        self._tokens = {}
+        # mmap path (scan_mapped): a bytes regex can only stand in for the str
+        # matcher as a LINE prefilter, and only when its ASCII-only case
+        # folding is exact — i.e. every needle is ASCII (aliases added below).
+        # Phrase/NEAR matches can span lines, which a per-line scan cannot see.
+        self.mappable = not self.structured and expansion is None and all(
+            x.isascii() and '\n' not in x and '\r' not in x for x in keywords + domain_keywords)
+        self.byte_prefilter = None
+        if self.mappable:
+            raw = [self._fold(x) for x in self.token_keywords + self.token_domain]
+            raw += [kw for kw, _ in self.punctuated] + self.phrase_domain
+            alternatives = [re.escape(x.encode('ascii')) for x in raw]
+            if case_insensitive:
+                alternatives += [re.escape(c.encode('utf-8')) for c in ASCII_CASE_ALIASES]
+            self.byte_prefilter = re.compile(b'|'.join(alternatives), self.flags)
+
+    def resolve(self, token: str):
+        """(keyword hits [(kw, count)], domain keywords present) for one token."""
+        key = self._fold(token)
+        hit = self._tokens.get(key)
+        if hit is None:
+            kws = []
+            for kw in self.token_keywords:
+                k = self._fold(kw)
+                if len(kw) <= SHORT_TOKEN_LEN:
+                    n = 1 if key in {k + sfx for sfx in ('', 's', 'es', 'ed', 'ing')} else 0
+                else:
+                    n = key.count(k)
+                if not n and self.expansion is not None:
+                    n = int(_expands(kw, key, self.expansion))
+                if n:
+                    kws.append((kw, n))
+            dks = tuple(dk for dk in self.token_domain if dk.lower() in key.lower())
+            hit = self._tokens[key] = (kws, dks)
+        return hit
+
+    def scan(self, content: str, fname_text: str):
+        """One pass over a file: ({kw: [line, ...]} with -1 for filename
+        matches, number of domain keywords present in the body, LineTable or
+        None). Match offsets are collected first; the line table is built
+        only for a file that actually has a hit."""
+        keyword_positions = {kw: [] for kw in self.keywords}
+        domain_seen = set()
+        if self.pattern is not None:
+            for m in self.pattern.finditer(content):
+                kws, dks = self.resolve(m.group(0))
+                for kw, n in kws:
+                    keyword_positions[kw].extend([m.start()] * n)
+                domain_seen.update(dks)
+            for m in self.pattern.finditer(fname_text):
+                for kw, n in self.resolve(m.group(0))[0]:
+                    keyword_positions[kw].extend([-1] * n)
+        haystack = content + '\n' + fname_text
+        for kw, pattern in self.punctuated:
+            keyword_positions[kw].extend(m.start() if m.start() < len(content) else -1
+                                         for m in pattern.finditer(haystack))
+        if self.phrase_domain:
+            lowered = content.lower()
+            domain_seen.update(dk for dk in self.phrase_domain if dk in lowered)
+        hits = {kw: v for kw, v in keyword_positions.items() if v}
+        structured = self.scan_terms(content, fname_text)
+        table = LineTable(content) if hits or structured else None
+        keyword_lines = {kw: [table.line_of(pos) if pos >= 0 else -1 for pos in v]
+                         for kw, v in hits.items()}
+        keyword_lines.update(structured)
+        return keyword_lines, len(domain_seen), table
+
+    def scan_terms(self, content: str, fname_text: str) -> dict:
+        """{kw: lines} for the phrase/NEAR keywords, over the same token
+        sequence the index stores (body lines, then the filename text on -1)."""
+        if not self.structured:
+            return {}
+        haystack = self._fold(content + '\n' + fname_text)
+        terms = [(kw, term) for kw, term in self.structured
+                 if all(self._fold(w) in haystack for words in term[0] for w in words)]
+        if not terms:
+            return {}
+        stream = [(self._fold(m.group(0)), lineno)
+                  for lineno, line in itertools.chain(enumerate(content.split('\n')),
+                                                      [(-1, fname_text)])
+                  for m in re.finditer(r'\w+', line)]
+        memo = {}
+
+        def occurrences(word):
+            if word not in memo:
+                memo[word] = {p: line for p, (token, line) in enumerate(stream)
+                              if _word_matches(word, token, self._fold)}
+            return memo[word]
+
+        found = {}
+        for kw, term in terms:
+            lines = _term_lines(term, occurrences)
+            if lines:
+                found[kw] = lines
+        return found
+
+    def scan_mapped(self, mm, fname_text: str):
+        """scan() over a memory-mapped UTF-8 file, without decoding it.
+
+        The byte prefilter runs directly on the mapping; only the lines it
+        hits are decoded and handed to the same str matching as scan(), so
+        counts, line numbers and contexts are identical. Line numbers follow
+        universal newlines (\\n, \\r\\n, bare \\r) like read_text().
+        Returns (keyword_lines, domain count, {line: text}), or None when the
+        file is not valid UTF-8 (read_text() would have raised).
+        """
+        has_cr = mm.find(b'\r') != -1
+        keyword_lines = {kw: [] for kw in self.keywords}
+        domain_seen = set()
+        texts = {}
+        line_no = counted = pos = 0
+        while True:
+            m = self.byte_prefilter.search(mm, pos)
+            if m is None:
+                break
+            start = mm.rfind(b'\n', 0, m.start()) + 1
+            end = mm.find(b'\n', m.start())
+            end = len(mm) if end == -1 else end
+            if has_cr:
+                start = max(start, mm.rfind(b'\r', 0, m.start()) + 1)
+                cr = mm.find(b'\r', m.start(), end)
+                end = cr if cr != -1 else end
+            line_no += _count_line_breaks(mm, counted, start, has_cr)
+            counted = start
+            try:
+                text = mm[start:end].decode('utf-8')
+            except UnicodeDecodeError:
+                return None
+            texts[line_no] = text
+            self._scan_line(text, line_no, keyword_lines, domain_seen)
+            pos = end + 1
+        self._scan_line(fname_text, -1, keyword_lines, None)
+        hits = {kw: v for kw, v in keyword_lines.items() if v}
+        if hits and not _valid_utf8(mm):
+            return None
+        return hits, len(domain_seen), texts
+
+    def _scan_line(self, text: str, line_no: int, keyword_lines: dict, domain_seen):
+        """Attribute every match in one line (or the filename text, line -1)."""
+        if self.pattern is not None:
+            for m in self.pattern.finditer(text):
+                kws, dks = self.resolve(m.group(0))
+                for kw, n in kws:
+                    keyword_lines[kw].extend([line_no] * n)
+                if domain_seen is not None:
+                    domain_seen.update(dks)
+        for kw, pattern in self.punctuated:
+            keyword_lines[kw].extend(line_no for _ in pattern.finditer(text))
+        if domain_seen is not None and self.phrase_domain:
+            lowered = text.lower()
+            domain_seen.update(dk for dk in self.phrase_domain if dk in lowered)
+
+
+def _count_line_breaks(mm, start: int, stop: int, has_cr: bool) -> int:
+    """Universal-newline line breaks in mm[start:stop], MMAP_CHUNK at a time.
+    A chunk never ends between \\r and \\n, so a CRLF counts once."""
+    n = 0
+    while start < stop:
+        end = min(stop, start + MMAP_CHUNK)
+        if has_cr and end < stop and mm[end - 1:end] == b'\r':
+            end += 1
+        chunk = mm[start:end]
+        n += chunk.count(b'\n')
+        if has_cr:
+            n += chunk.count(b'\r') - chunk.count(b'\r\n')
+        start = end
+    return n
+
+
+def _valid_utf8(mm) -> bool:
+    """Whole-file UTF-8 check in bounded chunks (only run for a file with a hit)."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for offset in range(0, len(mm), MMAP_CHUNK):
+            decoder.decode(mm[offset:offset + MMAP_CHUNK])
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _scan_large_file(file_path: Path, matcher, fname_text: str):
+    """Map a large file read-only and scan it (QueryMatcher.scan_mapped).
+    Returns scan_mapped's triple, or None if unreadable/undecodable."""
+    try:
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return matcher.scan_mapped(mm, fname_text)
+    except (OSError, ValueError):   # ValueError: file emptied under us
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def compile_query(keywords: tuple, domain_keywords: tuple = (),
+                  case_insensitive: bool = True, expansion=None) -> QueryMatcher:
+    """One QueryMatcher per distinct query, shared by every file it scans."""
+    return QueryMatcher(keywords, domain_keywords, case_insensitive, expansion)
+
+
+def _relative(file_path: Path) -> str:
+    """Result path: agent-root-relative, or absolute outside the root.
+
+    `relative_to` RAISES for any path outside the agent root, and that is
+    very likely why the spec tier was never wired despite being advertised
+    in SURFACES_SEARCHED since gh#1580: the canonical contract tier lives at
+    `../aget/specs/` (AGENTS.md §Canonical Path Resolution), one level ABOVE
+    the agent root, so the first attempt to search it would have crashed the
+    whole run. A helper that cannot express a path outside the repo silently
+    bounds every surface to the repo.
+    """
+    try:
+        return str(file_path.relative_to(get_agent_root()))
+    except ValueError:
+        return str(file_path)          # cross-repo (canonical tier) — keep absolute
+
+
+def _context_line_numbers(keywords: list, keyword_lines: dict, limit: int = 3) -> list:
+    """Lines to show as context: the first `limit` distinct body lines, taking
+    each keyword's matches in order (filename-derived matches have none)."""
+    chosen = []
+    for kw in keywords:
+        for line_no in keyword_lines.get(kw, ()):
+            if line_no < 0 or line_no in chosen:
+                continue
+            chosen.append(line_no)
+            if len(chosen) >= limit:
+                return chosen
+    return chosen
+
+
+def _format_context(line_no: int, text: str) -> dict:
+    context_line = text.strip()
+    if len(context_line) > 100:
+        context_line = context_line[:100] + '...'
+    return {'line': line_no + 1, 'context': context_line}
+
+
+def read_context_lines(file_path: Path, line_numbers: list) -> list:
+    """Text of a few 0-based lines: seek via the index's offset table when it
+    holds a fresh record, else stream the file only up to the last line
+    needed (universal newlines, as read_text() splits). None = unreadable."""
+    if not line_numbers:
+        return []
+    if _INDEX is not None:
+        rec = _INDEX.fresh_record(file_path)
+        if rec is not None:
+            try:
+                return _INDEX.read_lines(file_path, rec, line_numbers)
+            except (OSError, UnicodeDecodeError):
+                return None
+    wanted, last, found = set(line_numbers), max(line_numbers), {}
+    consumed = 0
+    try:
+        with open(file_path) as f:
+            for n, line in enumerate(f):
+                consumed += len(line)
+                if n in wanted:
+                    found[n] = line.rstrip('\n')
+                if n >= last:
+                    break
+    except (OSError, UnicodeDecodeError):
+        return None
+    _note_read(nbytes=consumed)
+    return [found.get(n, '') for n in line_numbers]
+
+
+def attach_contexts(findings: dict, limit: int = REPORT_TOP_K):
+    """Give the first `limit` items of each (score-sorted) section their
+    context snippets — the only place context text is read. None = all."""
+    for items in findings.values():
+        if not isinstance(items, list):
+            continue
+        for item in items[:limit]:
+            lines = _MATCH_LINES.get(item.get('file'))
+            if lines is None or 'contexts' in item:
+                continue
+            path = Path(item['file'])
+            texts = read_context_lines(path if path.is_absolute() else get_agent_root() / path,
+                                       lines)
+            item['contexts'] = [_format_context(n, t) for n, t in zip(lines, texts or [])]
+
+
+def _build_result(file_path: Path, keywords: list, keyword_lines: dict, fetch_lines,
+                  domain_keywords: list = None, domain_matches=None) -> dict:
+    """Shared tail of the scan and index paths: coverage rule, context lines,
+    boosts and score from per-keyword match lines (in keyword order, each
+    list ascending; -1 = filename-derived match).
+
+    `fetch_lines(line_numbers)` returns those lines' text (None = unreadable)
+    and `domain_matches()` the domain keyword count; both are callables so
+    file text is only touched for files that survive the coverage rule.
+    `fetch_lines=None` defers the text entirely: the result carries only
+    'context_lines' and attach_contexts() reads them if the item is shown.
+    """
+    if len(keywords) > 1:
+        # Require at least 50% of (hygiened) keywords present
+        min_required = max(1, (len(keywords) + 1) // 2)
+        if len(keyword_lines) < min(min_required, len(keywords)):
+            return None
+    if not keyword_lines:
+        return None
+
+    # Context lines for the first few matches: numbers now, text on demand
+    line_numbers = _context_line_numbers(keywords, keyword_lines)
+    rel = _relative(file_path)
+    result = {
+        'file': rel,
+        # Summed per keyword slot: an all-stopword fallback topic can repeat a
+        # keyword ("the the"), and the scan has always counted each slot.
+        'match_count': sum(len(keyword_lines.get(kw, ())) for kw in keywords),
+        'context_lines': line_numbers
+    }
+    if fetch_lines is not None:
+        texts = fetch_lines(line_numbers) if line_numbers else []
+        if texts is None:
+            return None
+        result['contexts'] = [_format_context(n, t) for n, t in zip(line_numbers, texts)]
+    _KEYWORD_COUNTS[rel] = {kw: len(v) for kw, v in keyword_lines.items()}
+    _MATCH_LINES[rel] = line_numbers
+    # Add keyword coverage for multi-word ranking
+    if len(keywords) > 1:
+        result['keyword_coverage'] = len(keyword_lines) / len(keywords)
+    # Add domain boost if keywords provided (CAP-SESSION-007-07)
+    if domain_keywords:
+        matches = domain_matches()
+        if matches is None:
+            return None
+        result['domain_boost'] = domain_boost_for(matches)
+    # Filename boost (audit R2, #1757): a token in the file's own name is
+    # the strongest single relevance feature in the corpus.
+    stem = file_path.stem.lower()
+    if any(-1 in keyword_lines.get(kw, ()) if query_term(kw) else kw.lower() in stem
+           for kw in keywords):
+        result['filename_boost'] = FILENAME_BOOST
+    result['score'] = composite_score(result)
+    return result
+
+
+def search_file_indexed(file_path: Path, keywords: list,
+                        domain_keywords: list = None, with_contexts: bool = True) -> dict:
+    """Index-backed twin of search_file_for_topic — same result dict, but
+    match counts come from postings. The file is only read to render context
+    lines (or test a phrase domain keyword) for an actual hit."""
+    rec = _INDEX.ensure(file_path)
+    if rec is None:
+        return None
+    started = time.perf_counter()
+    keyword_lines = {}
+    for kw in keywords:
+        lines = _keyword_lines(rec, kw)
+        if lines:
+            keyword_lines[kw] = lines
+    _note_time('index', started)
+
+    def fetch_lines(line_numbers):
+        try:
+            return _INDEX.read_lines(file_path, rec, line_numbers)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def domain_matches():
+        matches = 0
+        for dk in domain_keywords:
+            if re.fullmatch(r'\w+', dk):
+                occ = _INDEX.occurrences(rec, _INDEX.expand(dk))
+                matches += any(ln >= 0 for _, lines in occ for ln in lines)
+            else:
+                try:
+                    matches += dk.lower() in file_path.read_text().lower()
+                except (OSError, UnicodeDecodeError):
+                    return None
+                _note_read(file_path)
+        return matches
+
+    return _build_result(file_path, keywords, keyword_lines,
+                         fetch_lines if with_contexts else None, domain_keywords, domain_matches)
+
+
 def search_file_for_topic(file_path: Path, topic: str, case_insensitive: bool = True,
-                          domain_keywords: list = None) -> dict:
+                          domain_keywords: list = None, with_contexts: bool = True) -> dict:
     """Search a file for topic matches.
 
     Args:
@@ -234,98 +1113,122 @@ def search_file_for_topic(file_path: Path, topic: str, case_insensitive: bool =
         topic: Topic string to search for
         case_insensitive: Whether to ignore case
         domain_keywords: Optional list of domain keywords for relevance boosting (CAP-SESSION-007-07)
+        with_contexts: Include context snippet text ('contexts'). Finders pass
+            False — only 'context_lines' is kept and text is read for shown
+            items only (attach_contexts)
 
     Returns:
         Dict with match info or None if no match
     """
+    if _PROFILE is not None:
+        _PROFILE.files_enumerated += 1
+    if _LIKE is not None:
+        return _like_result(file_path, with_contexts)
+    prefetched = _PREFETCH.get((str(file_path), topic, tuple(domain_keywords or ())))
+    if prefetched is not None and case_insensitive:
+        result, counts, meta = prefetched
+        if result is None:
+            return None
+        _KEYWORD_COUNTS[result['file']] = counts
+        _MATCH_LINES[result['file']] = result['context_lines']
+        _FILE_META[result['file']] = meta
+        result = dict(result)
+        if with_contexts:
+            texts = read_context_lines(file_path, result['context_lines'])
+            if texts is None:
+                return None
+            result['contexts'] = [_format_context(n, t)
+                                  for n, t in zip(result['context_lines'], texts)]
+        return result
+
+    # Token hygiene (v3.26 C-26-11): stopwords/dupes dropped, possessive folded
+    keywords = prepare_keywords(topic)
+    if _INDEX is not None and case_insensitive and _index_answerable(keywords):
+        return search_file_indexed(file_path, keywords, domain_keywords, with_contexts)
+    matcher = compile_query(tuple(keywords or [topic]), tuple(domain_keywords or ()),
+                            case_insensitive, _EXPANSION)
+
+    # Large files (big specs, the ontology YAML) are not read into a str at
+    # all: the byte prefilter runs on an mmap and only hit lines are decoded.
+    # Needs the UTF-8 locale read_text() would use and an ASCII-only query.
+    try:
+        large = (file_path.stat().st_size >= MMAP_MIN_BYTES and matcher.mappable
+                 and _UTF8_LOCALE)
+    except OSError:
+        return None
+    if large:
+        started = time.perf_counter()
+        scanned = _scan_large_file(file_path, matcher, filename_text(file_path))
+        _note_time('regex', started)
+        _note_read(file_path)
+        if scanned is None:
+            return None
+        keyword_lines, domain_count, texts = scanned
+        result = _build_result(file_path, keywords or [topic], keyword_lines,
+                               lambda nums: [texts.get(n, '') for n in nums], domain_keywords,
+                               lambda: domain_count)
+        _remember(file_path, topic, domain_keywords, case_insensitive, result, None)
+        return _strip_contexts(result, with_contexts)
+
     try:
         content = file_path.read_text()
-        flags = re.IGNORECASE if case_insensitive else 0
-
-        # Filename-index (instance fix 2026-06-26, canonicalized v3.26 C-26-11):
-        # filename tokens (raw stem + slug-normalized) join the searchable text,
-        # so a topic equal to an artifact's name surfaces that artifact even
-        # when the body never echoes the slug. Recall-half of audit R2/#1757;
-        # the rank-half is FILENAME_BOOST below.
-        fname_text = file_path.stem + ' ' + re.sub(r'[_\-.]+', ' ', file_path.stem)
-        haystack = content + '\n' + fname_text
+    except (OSError, UnicodeDecodeError):
+        return None
+    _note_read(file_path)
+
+    # Filename-index (instance fix 2026-06-26, canonicalized v3.26 C-26-11):
+    # filename tokens (raw stem + slug-normalized) join the searchable text,
+    # so a topic equal to an artifact's name surfaces that artifact even
+    # when the body never echoes the slug. Recall-half of audit R2/#1757;
+    # the rank-half is FILENAME_BOOST below.
+    #
+    # One read, one pass (QueryMatcher): per-keyword counts and lines, domain
+    # keyword presence, all from a pattern compiled once per query.
+    started = time.perf_counter()
+    keyword_lines, domain_count, table = matcher.scan(content, filename_text(file_path))
+    _note_time('regex', started)
+    result = _build_result(file_path, keywords or [topic], keyword_lines,
+                           lambda nums: [table.text(n) for n in nums], domain_keywords,
+                           lambda: domain_count)
+    meta = describe_file(content) if result is not None else None
+    if result is not None:
+        _FILE_META[result['file']] = meta
+    _remember(file_path, topic, domain_keywords, case_insensitive, result, meta)
+    return _strip_contexts(result, with_contexts)
+
+
+def _like_result(file_path: Path, with_contexts: bool):
+    """search_file_for_topic under --like: a file sharing any term with the
+    source is a hit; match_count is the number of shared terms and the
+    context lines are where the heaviest of them first occur."""
+    hit = _LIKE.get(_INDEX.key(file_path))
+    if hit is None:
+        return None
+    cosine, shared, lines = hit
+    # keyword_coverage: there is no keyword set to cover, so every hit is whole.
+    result = {'file': _relative(file_path), 'match_count': shared, 'keyword_coverage': 1.0,
+              'context_lines': lines, 'score': cosine}
+    _MATCH_LINES[result['file']] = lines
+    if with_contexts:
+        texts = read_context_lines(file_path, lines)
+        if texts is None:
+            return None
+        result['contexts'] = [_format_context(n, t) for n, t in zip(lines, texts)]
+    return result
 
-        # Token hygiene (v3.26 C-26-11): stopwords/dupes dropped, possessive folded
-        keywords = prepare_keywords(topic)
-        if len(keywords) <= 1:
-            single = keywords[0] if keywords else topic
-            matches = list(re.finditer(_token_pattern(single), haystack, flags))
-        else:
-            # Multi-keyword: search each independently, require majority coverage
-            keyword_matches = {}
-            all_matches = []
-            for kw in keywords:
-                kw_matches = list(re.finditer(_token_pattern(kw), haystack, flags))
-                if kw_matches:
-                    keyword_matches[kw] = len(kw_matches)
-                    all_matches.extend(kw_matches)
-            # Require at least 50% of (hygiened) keywords present
-            min_required = max(1, (len(keywords) + 1) // 2) if len(keywords) >= 2 else 1
-            if len(keyword_matches) < min(min_required, len(keywords)):
-                return None
-            matches = all_matches
 
-        if not matches:
-            return None
+def _remember(file_path, topic, domain_keywords, case_insensitive, result, meta):
+    """Memoize a scan result (without context text) in _PREFETCH."""
+    if case_insensitive:
+        _PREFETCH[(str(file_path), topic, tuple(domain_keywords or ()))] = (
+            _strip_contexts(result, False),
+            _KEYWORD_COUNTS.get(result['file']) if result else None, meta)
 
-        # Extract context lines for first few matches
-        lines = content.split('\n')
-        contexts = []
-        seen_lines = set()
-        for match in matches:
-            if match.start() >= len(content):
-                continue  # filename-derived match; no body context to show
-            line_start = content.count('\n', 0, match.start())
-            if line_start in seen_lines:
-                continue
-            seen_lines.add(line_start)
-            if line_start < len(lines):
-                context_line = lines[line_start].strip()
-                if len(context_line) > 100:
-                    context_line = context_line[:100] + '...'
-                contexts.append({
-                    'line': line_start + 1,
-                    'context': context_line
-                })
-            if len(contexts) >= 3:
-                break
 
-        # `relative_to` RAISES for any path outside the agent root, and that is
-        # very likely why the spec tier was never wired despite being advertised
-        # in SURFACES_SEARCHED since gh#1580: the canonical contract tier lives at
-        # `../aget/specs/` (AGENTS.md §Canonical Path Resolution), one level ABOVE
-        # the agent root, so the first attempt to search it would have crashed the
-        # whole run. A helper that cannot express a path outside the repo silently
-        # bounds every surface to the repo.
-        try:
-            rel = str(file_path.relative_to(get_agent_root()))
-        except ValueError:
-            rel = str(file_path)          # cross-repo (canonical tier) — keep absolute
-        result = {
-            'file': rel,
-            'match_count': len(matches),
-            'contexts': contexts
-        }
-        # Add keyword coverage for multi-word ranking
-        if len(keywords) > 1:
-            result['keyword_coverage'] = len(keyword_matches) / len(keywords)
-        # Add domain boost if keywords provided (CAP-SESSION-007-07)
-        if domain_keywords:
-            result['domain_boost'] = compute_domain_boost(content, domain_keywords)
-        # Filename boost (audit R2, #1757): a token in the file's own name is
-        # the strongest single relevance feature in the corpus.
-        stem = file_path.stem.lower()
-        if any(kw.lower() in stem for kw in keywords):
-            result['filename_boost'] = FILENAME_BOOST
-        result['score'] = composite_score(result)
+def _strip_contexts(result, with_contexts: bool):
+    if result is None or with_contexts:
         return result
-    except (OSError, UnicodeDecodeError):
-        return None
+    return {k: v for k, v in result.items() if k != 'contexts'}
 
 
 def search_directory(path: Path, topic: str, extensions: list = None,
@@ -367,23 +1270,23 @@ def search_directory(path: Path, topic: str, extensions: list = None,
     return results
 
 
-def find_ldocs(topic: str, domain_keywords: list = None) -> list:
-    """Find L-docs related to topic.
-
-    Args:
-        topic: Topic to search for
-        domain_keywords: Optional domain keywords for boosting (CAP-SESSION-007-07)
+# ---------------------------------------------------------------------------
+# Surface enumeration — which files each finder searches, in the order it
+# searches them. ONE os.scandir walk per run classifies every file into the
+# surfaces SURFACES_SEARCHED declares (SURFACE_RULES is that list in code);
+# the *_files() helpers are views over the classified walk, so the tree is
+# traversed once no matter how many finders (or --jobs) consume it.
+# ---------------------------------------------------------------------------
 
-    Returns:
-        List of matching L-doc info
-    """
-    agent_root = get_agent_root()
-    evolution_path = agent_root / '.aget' / 'evolution'
+# Never descended into, at any depth: VCS internals and the index itself.
+PRUNE_DIRS = {'.git', '__pycache__'}
+# Top-level trees outside the study universe (SURFACES_EXCLUDED). sessions/
+# is not here: it is a surface, just an opt-in one.
+PRUNE_TOP = {'workspace', 'data'}
+INSTRUMENT_SUFFIXES = ('.py', '.sh', '.js', '.ts', '.json')
 
-    results = []
-    if not evolution_path.exists():
-        return results
 
+def _rule_ldoc(parts):
     # rglob, not glob: `.aget/evolution/discoveries/` (and any other
     # sub-directory a seat uses) held real, citable KB and was invisible to a
     # non-recursive glob. Field evidence 2026-07-25: a study-topic run reported
@@ -398,18 +1301,312 @@ def find_ldocs(topic: str, domain_keywords: list = None) -> list:
     # their own conventions — `discoveries/north_star_revelation.md` carries no
     # `L` prefix, so a recursive walk that still demanded one re-excluded the
     # exact artifact the recursion was added to reach.
-    for file in sorted(evolution_path.rglob('*.md')):
-        if file.parent == evolution_path and not file.name.startswith('L'):
+    return (parts[:2] == ('.aget', 'evolution') and len(parts) > 2
+            and parts[-1].endswith('.md') and (len(parts) > 3 or parts[-1].startswith('L')))
+
+
+def _rule_pattern(parts):
+    # TWO pattern roots, and neither filename convention is universal.
+    # `docs/patterns/PATTERN_*.md` was the only surface searched until
+    # 2026-07-25; seats also keep patterns at a top-level `patterns/` tree with
+    # descriptive names (e.g. `patterns/identity/north_star_pattern.md`), which
+    # matches neither the directory nor the `PATTERN_*` prefix. Both were
+    # therefore reported as "no pattern hits" while the governing pattern
+    # document existed. Recurse both roots and drop the prefix requirement.
+    return (parts[-1].endswith('.md')
+            and (parts[:2] == ('docs', 'patterns') or parts[0] == 'patterns'))
+
+
+def _top_level(directory, pattern):
+    return lambda parts: (len(parts) == 2 and parts[0] == directory
+                          and fnmatch.fnmatchcase(parts[1], pattern))
+
+
+def _rule_spec(parts):
+    return (parts[0] == 'specs' or parts[:2] == ('.aget', 'specs')) \
+        and parts[-1].endswith(('.md', '.yaml'))
+
+
+def _rule_instrument(parts):
+    return ((parts[0] in ('scripts', 'tests')
+             or parts[:2] in (('.claude', 'hooks'), ('.codex', 'hooks')))
+            and parts[-1].endswith(INSTRUMENT_SUFFIXES))
+
+
+# surface -> (subtrees the rule can match under, membership test on the
+# root-relative path parts). Order follows SURFACES_SEARCHED, then opt-ins.
+SURFACE_RULES = {
+    'ldocs': ((('.aget', 'evolution'),), _rule_ldoc),
+    'patterns': ((('docs', 'patterns'), ('patterns',)), _rule_pattern),
+    'project_plans': ((('planning',),), _top_level('planning', 'PROJECT_PLAN*.md')),
+    'sops': ((('sops',),), _top_level('sops', 'SOP_*.md')),
+    'governance': ((('governance',),), _top_level('governance', '*.md')),
+    'knowledge': ((('knowledge',), ('ontology',)),
+                  lambda parts: parts[0] in ('knowledge', 'ontology') and parts[-1].endswith('.md')),
+    'specs': ((('specs',), ('.aget', 'specs')), _rule_spec),
+    'inbox': ((('inbox',),), lambda parts: parts[0] == 'inbox' and parts[-1].endswith('.md')),
+    'sessions': ((('sessions',),), _top_level('sessions', '*.md')),
+    'instruments': ((('scripts',), ('tests',), ('.claude', 'hooks'), ('.codex', 'hooks')),
+                    _rule_instrument),
+}
+
+# Classified walk of the current agent root: surface -> [Path, ...], and the
+# mtime of every directory it listed (None = absent), which is what --serve
+# re-stats to notice files being added, removed or renamed.
+_SURFACE_FILES = None
+_WALK_DIRS = {}
+
+
+def _wanted(parts) -> bool:
+    """Descend into a directory only if some surface can match inside it."""
+    for roots, _ in SURFACE_RULES.values():
+        for root in roots:
+            n = min(len(parts), len(root))
+            if parts[:n] == root[:n]:
+                return True
+    return False
+
+
+def _walk(base: Path, prefix: tuple = ()):
+    """Yield (root-relative parts, Path) for every regular file under `base`,
+    pruning PRUNE_DIRS everywhere, PRUNE_TOP at the top and any directory no
+    surface rule reaches. Directory symlinks are not followed (no cycles)."""
+    stack = [(base, prefix)]
+    while stack:
+        directory, parts = stack.pop()
+        try:
+            _WALK_DIRS[str(directory)] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            _WALK_DIRS[str(directory)] = None
             continue
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
-        if match:
-            # Extract L-doc title from first heading
+        for entry in entries:
+            child = parts + (entry.name,)
             try:
-                content = file.read_text()
-                title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-                title = title_match.group(1) if title_match else file.stem
-            except Exception:
-                title = file.stem
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in PRUNE_DIRS or (not parts and entry.name in PRUNE_TOP):
+                        continue
+                    if _wanted(child):
+                        stack.append((entry.path, child))
+                elif entry.is_file():
+                    yield child, Path(entry.path)
+            except OSError:
+                continue
+
+
+def surface_files() -> dict:
+    """surface -> [Path], from one walk of the agent root (cached per run).
+
+    Each list is in sorted path order; specs keep their tier order (instance
+    .md, then .yaml, per root) with the canonical ../aget/specs tier last.
+    """
+    global _SURFACE_FILES
+    if _SURFACE_FILES is not None:
+        return _SURFACE_FILES
+    agent_root = get_agent_root()
+    surfaces = {name: [] for name in SURFACE_RULES}
+    for parts, path in _walk(agent_root):
+        for name, (_, rule) in SURFACE_RULES.items():
+            if rule(parts):
+                surfaces[name].append((parts, path))
+    for name, entries in surfaces.items():
+        entries.sort(key=lambda e: e[0])
+        surfaces[name] = [path for _, path in entries]
+
+    # Instance-local tiers, then the canonical contract tier one level up.
+    # AGENTS.md §Canonical Path Resolution: canonical specs live at ../aget/,
+    # NOT at aget/ — a cwd-scoped search produces silent false-negatives.
+    spec_tiers = [agent_root / 'specs', agent_root / '.aget' / 'specs']
+    specs = []
+    for root in spec_tiers:
+        tier = [p for p in surfaces['specs'] if root in p.parents]
+        specs += [p for p in tier if p.suffix == '.md'] + [p for p in tier if p.suffix == '.yaml']
+    # Seeded with the ('specs',) prefix so _wanted() and PRUNE_TOP see the
+    # same root-relative parts the instance tier does; an empty prefix pruned
+    # every sub-directory of the canonical tier.
+    canonical = agent_root.parent / 'aget' / 'specs'
+    tier = sorted((parts, path) for parts, path in _walk(canonical, ('specs',))
+                  if path.suffix in ('.md', '.yaml'))
+    specs += [p for _, p in tier if p.suffix == '.md'] + [p for _, p in tier if p.suffix == '.yaml']
+    surfaces['specs'] = specs
+
+    # Same file reachable twice through a file symlink: keep the first.
+    for name in ('patterns', 'instruments'):
+        seen = set()
+        kept = []
+        for path in surfaces[name]:
+            resolved = path.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                kept.append(path)
+        surfaces[name] = kept
+    _SURFACE_FILES = surfaces
+    return surfaces
+
+
+def surfaces_stale() -> bool:
+    """True when a directory the cached walk listed has changed (or appeared
+    or vanished) since — i.e. surface membership may differ."""
+    for directory, mtime in _WALK_DIRS.items():
+        try:
+            current = os.stat(directory).st_mtime_ns
+        except OSError:
+            current = None
+        if current != mtime:
+            return True
+    return False
+
+
+def reset_surfaces():
+    global _SURFACE_FILES
+    _SURFACE_FILES = None
+    _WALK_DIRS.clear()
+
+
+def ldoc_files() -> list:
+    """L-doc surface: `.aget/evolution/**/*.md`, `L*` at the top level only."""
+    return surface_files()['ldocs']
+
+
+def pattern_files() -> list:
+    """Pattern surface: `docs/patterns/**/*.md` and `patterns/**/*.md`."""
+    return surface_files()['patterns']
+
+
+def project_plan_files() -> list:
+    return surface_files()['project_plans']
+
+
+def sop_files() -> list:
+    return surface_files()['sops']
+
+
+def governance_files() -> list:
+    return surface_files()['governance']
+
+
+def knowledge_files() -> list:
+    return surface_files()['knowledge']
+
+
+def spec_files() -> list:
+    """Spec tier, instance-local first. Same-name dedupe is the finder's job:
+    it keys on the first MATCHING file of a name, not the first file."""
+    return surface_files()['specs']
+
+
+def inbox_files(window_days: int = 14) -> list:
+    """Inbox items modified within the recency window."""
+    import time
+    cutoff = time.time() - window_days * 86400
+    files = []
+    for file in surface_files()['inbox']:
+        try:
+            if file.stat().st_mtime < cutoff:
+                continue
+        except OSError:
+            continue
+        files.append(file)
+    return files
+
+
+def session_files(days: int = 90) -> list:
+    """Session notes inside the recency window, by filename date (see find_sessions)."""
+    import datetime as _dt
+    cutoff = (_dt.date.today() - _dt.timedelta(days=days)).isoformat()
+    files = []
+    for file in surface_files()['sessions']:
+        m = re.search(r'(\d{4})-(\d{2})-(\d{2})', file.name)
+        if m:
+            if '-'.join(m.groups()) < cutoff:
+                continue
+        else:
+            # Undated filename: include rather than silently drop. An absence of
+            # a date is not evidence of age (L1220 §Absence).
+            pass
+        files.append(file)
+    return files
+
+
+def instrument_files() -> list:
+    """Executable instruments: scripts/, tests/ and hook sources."""
+    return surface_files()['instruments']
+
+
+def candidate_files(include_sessions: bool = False, session_days: int = 90,
+                    include_instruments: bool = False) -> list:
+    """Every file this run's finders will search, in finder order, each once."""
+    surfaces = [ldoc_files(), pattern_files(), project_plan_files(), sop_files(),
+                governance_files(), spec_files(), knowledge_files(), inbox_files()]
+    if include_sessions:
+        surfaces.append(session_files(session_days))
+    if include_instruments:
+        surfaces.append(instrument_files())
+    files, seen = [], set()
+    for surface in surfaces:
+        for file in surface:
+            if str(file) not in seen:
+                seen.add(str(file))
+                files.append(file)
+    return files
+
+
+def _scan_task(task):
+    """Worker body for prefetch(): one file, scan path, plus the side tables."""
+    global _EXPANSION
+    file_path, topic, domain_keywords, _EXPANSION = task
+    result = search_file_for_topic(file_path, topic, domain_keywords=domain_keywords,
+                                   with_contexts=False)
+    if result is None:
+        return None, None, None
+    return result, _KEYWORD_COUNTS.get(result['file']), _FILE_META.get(result['file'])
+
+
+def prefetch(files: list, topic: str, domain_keywords: list = None, jobs: int = 1):
+    """Spread the per-file work of a study across `jobs` processes (--jobs N).
+
+    Indexed queries hand stale files to StudyIndex.refresh (tokenizing is the
+    only per-file cost there); scan-path queries run search_file_for_topic in
+    workers and park the results in _PREFETCH. Either way the finders then run
+    serially, unchanged, so ordering, dedupe and scores match --jobs 1.
+    No process support = nothing prefetched, serial scan (ADR-004).
+    """
+    if jobs <= 1 or len(files) < 2:
+        return
+    if _INDEX is not None and _index_answerable(prepare_keywords(topic)):
+        _INDEX.refresh(files, jobs=jobs)
+        return
+    tasks = [(file, topic, domain_keywords, _EXPANSION) for file in files]
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(_scan_task, tasks,
+                                     chunksize=max(1, len(tasks) // (jobs * 4))))
+    except (OSError, RuntimeError):
+        return
+    dk = tuple(domain_keywords or ())
+    for (file, _, _, _), outcome in zip(tasks, outcomes):
+        _PREFETCH[(str(file), topic, dk)] = outcome
+        _note_read(file)      # each worker read its file whole
+
+
+def find_ldocs(topic: str, domain_keywords: list = None) -> list:
+    """Find L-docs related to topic.
+
+    Args:
+        topic: Topic to search for
+        domain_keywords: Optional domain keywords for boosting (CAP-SESSION-007-07)
+
+    Returns:
+        List of matching L-doc info
+    """
+    results = []
+    for file in ldoc_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
+        if match:
+            # L-doc title from first heading (index metadata when warm)
+            title = file_meta(file).get('title') or file.stem
 
             results.append({
                 'ldoc': file.stem,
@@ -435,35 +1632,17 @@ def find_patterns(topic: str, domain_keywords: list = None) -> list:
     Returns:
         List of matching pattern info
     """
-    agent_root = get_agent_root()
-
-    # TWO pattern roots, and neither filename convention is universal.
-    # `docs/patterns/PATTERN_*.md` was the only surface searched until
-    # 2026-07-25; seats also keep patterns at a top-level `patterns/` tree with
-    # descriptive names (e.g. `patterns/identity/north_star_pattern.md`), which
-    # matches neither the directory nor the `PATTERN_*` prefix. Both were
-    # therefore reported as "no pattern hits" while the governing pattern
-    # document existed. Recurse both roots and drop the prefix requirement.
-    pattern_roots = [agent_root / 'docs' / 'patterns', agent_root / 'patterns']
-
     results = []
-    seen = set()
-    for patterns_path in pattern_roots:
-        if not patterns_path.exists():
-            continue
-        for file in sorted(patterns_path.rglob('*.md')):
-            resolved = file.resolve()
-            if resolved in seen:
-                continue
-            seen.add(resolved)
-            match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
-            if match:
-                results.append({
-                    'pattern': file.stem,
-                    'file': match['file'],
-                    'match_count': match['match_count'],
-                    'score': match.get('score', 0.0)
-                })
+    for file in pattern_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
+        if match:
+            results.append({
+                'pattern': file.stem,
+                'file': match['file'],
+                'match_count': match['match_count'],
+                'score': match.get('score', 0.0)
+            })
 
     results.sort(key=lambda x: x['score'], reverse=True)
     return results
@@ -479,30 +1658,13 @@ def find_project_plans(topic: str, domain_keywords: list = None) -> list:
     Returns:
         List of matching plan info
     """
-    agent_root = get_agent_root()
-    planning_path = agent_root / 'planning'
-
     results = []
-    if not planning_path.exists():
-        return results
-
-    for file in planning_path.glob('PROJECT_PLAN*.md'):
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
+    for file in project_plan_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
         if match:
-            # Check if active
-            try:
-                content = file.read_text()
-                # v3.25 C-25-14 (gh#1809 + gh#1791): case-insensitive, Plan_Status-first.
-                # Plans write "In Progress" (title case) — the old upper-case-only probe
-                # rendered every live plan [inactive]. Prefer the disambiguated
-                # Plan_Status header (CAP-PP-003); fall back to legacy header Status,
-                # then to whole-content scan for pre-template-2.1 plans.
-                m = (re.search(r'\*\*Plan_Status\*\*:\s*([^\n]*)', content)
-                     or re.search(r'\*\*Status\*\*:\s*([^\n]*)', content))
-                probe = m.group(1) if m else content
-                is_active = 'IN PROGRESS' in probe.upper()
-            except Exception:
-                is_active = False
+            # Check if active (plan_is_active; index metadata when warm)
+            is_active = file_meta(file).get('is_active', False)
 
             results.append({
                 'plan': file.name,
@@ -526,15 +1688,10 @@ def find_sops(topic: str, domain_keywords: list = None) -> list:
     Returns:
         List of matching SOP info
     """
-    agent_root = get_agent_root()
-    sops_path = agent_root / 'sops'
-
     results = []
-    if not sops_path.exists():
-        return results
-
-    for file in sops_path.glob('SOP_*.md'):
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
+    for file in sop_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
         if match:
             results.append({
                 'sop': file.name,
@@ -557,19 +1714,16 @@ def find_knowledge(topic: str, domain_keywords: list = None) -> list:
     """
     agent_root = get_agent_root()
     results = []
-    for area in ('knowledge', 'ontology'):
-        base = agent_root / area
-        if not base.exists():
-            continue
-        for file in base.rglob('*.md'):
-            match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
-            if match:
-                results.append({
-                    'doc': str(file.relative_to(agent_root)),
-                    'file': match['file'],
-                    'match_count': match['match_count'],
-                    'score': match.get('score', 0.0)
-                })
+    for file in knowledge_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
+        if match:
+            results.append({
+                'doc': str(file.relative_to(agent_root)),
+                'file': match['file'],
+                'match_count': match['match_count'],
+                'score': match.get('score', 0.0)
+            })
     results.sort(key=lambda x: x['score'], reverse=True)
     return results
 
@@ -599,23 +1753,10 @@ def find_sessions(topic: str, domain_keywords: list = None, days: int = 90) -> l
         tree, which would put every session "in window" (this exact artifact was
         observed in the parallel 2026-07-26 corpus study)
     """
-    import datetime as _dt
-    agent_root = get_agent_root()
-    base = agent_root / 'sessions'
-    if not base.exists():
-        return []
-    cutoff = (_dt.date.today() - _dt.timedelta(days=days)).isoformat()
     results = []
-    for file in base.glob('*.md'):
-        m = re.search(r'(\d{4})-(\d{2})-(\d{2})', file.name)
-        if m:
-            if '-'.join(m.groups()) < cutoff:
-                continue
-        else:
-            # Undated filename: include rather than silently drop. An absence of
-            # a date is not evidence of age (L1220 §Absence).
-            pass
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
+    for file in session_files(days):
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
         if match:
             results.append({
                 'doc': file.stem,
@@ -655,34 +1796,22 @@ def find_specs(topic: str, domain_keywords: list = None) -> list:
     agent_root = get_agent_root()
     results = []
     seen = set()
-
-    # Instance-local tiers, then the canonical contract tier one level up.
-    # AGENTS.md §Canonical Path Resolution: canonical specs live at ../aget/,
-    # NOT at aget/ — a cwd-scoped search produces silent false-negatives.
-    roots = [
-        agent_root / 'specs',
-        agent_root / '.aget' / 'specs',
-        agent_root.parent / 'aget' / 'specs',
-    ]
-
-    for root in roots:
-        if not root.exists():
+    for file in spec_files():
+        if file.name in seen:
             continue
-        for file in sorted(root.rglob('*.md')) + sorted(root.rglob('*.yaml')):
-            if file.name in seen:
-                continue
-            match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
-            if match:
-                seen.add(file.name)
-                results.append({
-                    'spec': file.stem,
-                    'doc': file.name,
-                    'file': (str(file.relative_to(agent_root))
-                             if agent_root in file.parents else str(file)),
-                    'matches': match.get('match_count', 0),
-                    'keyword_coverage': match.get('keyword_coverage', 0.0),
-                    'score': match.get('score', 0.0),
-                })
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
+        if match:
+            seen.add(file.name)
+            results.append({
+                'spec': file.stem,
+                'doc': file.name,
+                'file': (str(file.relative_to(agent_root))
+                         if agent_root in file.parents else str(file)),
+                'matches': match.get('match_count', 0),
+                'keyword_coverage': match.get('keyword_coverage', 0.0),
+                'score': match.get('score', 0.0),
+            })
 
     results.sort(key=lambda r: r.get('score', 0.0), reverse=True)
     return results
@@ -698,15 +1827,10 @@ def find_governance(topic: str, domain_keywords: list = None) -> list:
     Returns:
         List of matching governance doc info
     """
-    agent_root = get_agent_root()
-    governance_path = agent_root / 'governance'
-
     results = []
-    if not governance_path.exists():
-        return results
-
-    for file in governance_path.glob('*.md'):
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
+    for file in governance_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
         if match:
             results.append({
                 'doc': file.name,
@@ -730,22 +1854,11 @@ def find_inbox(topic: str, domain_keywords: list = None, window_days: int = 14)
     failure. sessions/, workspace/, data/ remain OUT (2026-07-04 rationale
     holds; no seat's failure implicates them).
     """
-    import time
     agent_root = get_agent_root()
-    inbox_path = agent_root / 'inbox'
-
     results = []
-    if not inbox_path.exists():
-        return results
-
-    cutoff = time.time() - window_days * 86400
-    for file in inbox_path.rglob('*.md'):
-        try:
-            if file.stat().st_mtime < cutoff:
-                continue
-        except OSError:
-            continue
-        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
+    for file in inbox_files(window_days):
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
         if match:
             results.append({
                 'doc': str(file.relative_to(agent_root)),
@@ -765,32 +1878,33 @@ def find_instruments(topic: str, domain_keywords: list = None) -> list:
     """
     agent_root = get_agent_root()
     results = []
-    seen = set()
-    roots = (agent_root / 'scripts', agent_root / 'tests',
-             agent_root / '.claude' / 'hooks', agent_root / '.codex' / 'hooks')
-    for base in roots:
-        if not base.exists():
-            continue
-        for file in sorted(base.rglob('*')):
-            if not file.is_file() or file.suffix not in ('.py', '.sh', '.js', '.ts', '.json'):
-                continue
-            resolved = file.resolve()
-            if resolved in seen:
-                continue
-            seen.add(resolved)
-            match = search_file_for_topic(file, topic, domain_keywords=domain_keywords)
-            if match:
-                results.append({'doc': str(file.relative_to(agent_root)),
-                                'file': match['file'],
-                                'match_count': match['match_count'],
-                                'keyword_coverage': match.get('keyword_coverage', 1.0),
-                                'score': match.get('score', 0.0)})
+    for file in instrument_files():
+        match = search_file_for_topic(file, topic, domain_keywords=domain_keywords,
+                                      with_contexts=False)
+        if match:
+            results.append({'doc': str(file.relative_to(agent_root)),
+                            'file': match['file'],
+                            'match_count': match['match_count'],
+                            'keyword_coverage': match.get('keyword_coverage', 1.0),
+                            'score': match.get('score', 0.0)})
     results.sort(key=lambda x: x['score'], reverse=True)
     return results
 
 
+def _snippet(lines: list, item: dict):
+    """Provenance tag (--fleet) on a listed item's line, and its first
+    context snippet under it, when it has them."""
+    if item.get('agent'):
+        lines[-1] += f" [{item['agent']}]"
+    if item.get('contexts'):
+        first = item['contexts'][0]
+        lines.append(f"  > L{first['line']}: {first['context']}")
+
+
 def generate_report(topic: str, findings: dict, floor_info: dict = None,
-                    purpose: str = None, purpose_globs: list = None) -> str:
+                    purpose: str = None, purpose_globs: list = None,
+                    ranking: dict = None, surfaces: tuple = None,
+                    display_limit: int = REPORT_TOP_K, profile: dict = None) -> str:
     """Generate human-readable study report.
 
     Args:
@@ -798,6 +1912,11 @@ def generate_report(topic: str, findings: dict, floor_info: dict = None,
         findings: Dict of findings from search
         floor_info: Optional {'floor': float, 'suppressed': int} from relevance
             filtering (v3.26 C-26-11; audit R3/C1)
+        ranking: Optional ranking block from apply_ranker (search_contract)
+        surfaces: Optional (searched, excluded) from surface_contract();
+            defaults to the module declarations
+        display_limit: Items listed per section (None = all)
+        profile: Optional search_contract['profile'] (--profile), shown as a table
 
     Returns:
         Formatted markdown report
@@ -809,13 +1928,21 @@ def generate_report(topic: str, findings: dict, floor_info: dict = None,
     lines.append("")
     lines.append(f"**Search Date**: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     lines.append(f"**Topic**: {topic}")
-    lines.append(f"**Keywords (after hygiene)**: {', '.join(prepare_keywords(topic))}")
+    if ranking and ranking.get('like'):
+        lines.append(f"**More like**: {ranking['like']}; heaviest terms: "
+                     f"{', '.join(ranking['top_terms'])}")
+    else:
+        lines.append(f"**Keywords (after hygiene)**: {', '.join(prepare_keywords(topic))}")
     lines.append(f"**Purpose**: {purpose or 'exploration'}; priority globs: "
                  f"{', '.join(purpose_globs or []) or 'none configured'}")
+    if ranking:
+        note = f" (requested {ranking['requested']}: {ranking['degraded']})" if ranking.get('degraded') else ""
+        lines.append(f"**Ranker**: {ranking['ranker']}{note}")
     lines.append("")
     # Declared surface manifest (audit S1/C1): absence is now interpretable.
-    lines.append("**Surfaces searched**: " + " ; ".join(SURFACES_SEARCHED))
-    lines.append("**NOT searched (repo-internal)**: " + " ; ".join(SURFACES_EXCLUDED))
+    searched, excluded = surfaces or (SURFACES_SEARCHED, SURFACES_EXCLUDED)
+    lines.append("**Surfaces searched**: " + " ; ".join(searched))
+    lines.append("**NOT searched (repo-internal)**: " + " ; ".join(excluded))
     lines.append("**⚠ Scope of that list**: " + SURFACES_OUT_OF_UNIVERSE)
     lines.append("")
 
@@ -841,51 +1968,58 @@ def generate_report(topic: str, findings: dict, floor_info: dict = None,
     if findings.get('ldocs'):
         lines.append("### Related L-docs")
         lines.append("")
-        for item in findings['ldocs'][:5]:  # Top 5
+        for item in findings['ldocs'][:display_limit]:  # Top 5
             lines.append(f"- **{item['ldoc']}**: {item['title']} ({item['match_count']} matches)")
-        if len(findings['ldocs']) > 5:
-            lines.append(f"- ... and {len(findings['ldocs']) - 5} more")
+            _snippet(lines, item)
+        hidden = len(findings['ldocs'][display_limit:]) if display_limit else 0
+        if hidden:
+            lines.append(f"- ... and {hidden} more")
         lines.append("")
 
     # Patterns section
     if findings.get('patterns'):
         lines.append("### Related Patterns")
         lines.append("")
-        for item in findings['patterns'][:5]:
+        for item in findings['patterns'][:display_limit]:
             lines.append(f"- {item['pattern']} ({item['match_count']} matches)")
+            _snippet(lines, item)
         lines.append("")
 
     # PROJECT_PLANs section
     if findings.get('project_plans'):
         lines.append("### Related PROJECT_PLANs")
         lines.append("")
-        for item in findings['project_plans'][:5]:
+        for item in findings['project_plans'][:display_limit]:
             status = "ACTIVE" if item['is_active'] else "inactive"
             lines.append(f"- {item['plan']} [{status}] ({item['match_count']} matches)")
+            _snippet(lines, item)
         lines.append("")
 
     # SOPs section
     if findings.get('sops'):
         lines.append("### Related SOPs")
         lines.append("")
-        for item in findings['sops'][:5]:
+        for item in findings['sops'][:display_limit]:
             lines.append(f"- {item['sop']} ({item['match_count']} matches)")
+            _snippet(lines, item)
         lines.append("")
 
     # Governance section
     if findings.get('governance'):
         lines.append("### Related Governance")
         lines.append("")
-        for item in findings['governance'][:5]:
+        for item in findings['governance'][:display_limit]:
             lines.append(f"- {item['doc']} ({item['match_count']} matches)")
+            _snippet(lines, item)
         lines.append("")
 
     # Knowledge section (v3.25 C-25-14)
     if findings.get('knowledge'):
         lines.append("### Related Knowledge/Ontology")
         lines.append("")
-        for item in findings['knowledge'][:5]:
+        for item in findings['knowledge'][:display_limit]:
             lines.append(f"- {item['doc']} ({item['match_count']} matches)")
+            _snippet(lines, item)
         lines.append("")
 
     # Every opt-in or contract tier is rendered, not merely counted in Summary.
@@ -894,10 +2028,11 @@ def generate_report(topic: str, findings: dict, floor_info: dict = None,
         if findings.get(key):
             lines.append(f"### {title}")
             lines.append("")
-            for item in findings[key][:5]:
+            for item in findings[key][:display_limit]:
                 label = item.get('spec') or item.get('doc') or item.get('file')
                 count = item.get('match_count', item.get('matches', 0))
                 lines.append(f"- {label} ({count} matches)")
+                _snippet(lines, item)
             lines.append("")
 
     # Recommendation — contract-derived (audit C1): states quantity over the
@@ -929,6 +2064,22 @@ def generate_report(topic: str, findings: dict, floor_info: dict = None,
         lines.append("Cite precedents from these when proposing changes; consult the "
                      "NOT-searched list for surfaces this study cannot speak to.")
 
+    if profile:
+        lines.append("")
+        lines.append(f"### Profile ({profile['total_ms']:.1f} ms, {profile['files_read']} "
+                     f"files / {profile['bytes_read']:,} bytes read)")
+        lines.append("")
+        lines.append("| Surface | Wall ms | Files | Read | Bytes read |")
+        lines.append("|---------|--------:|------:|-----:|-----------:|")
+        for name, row in sorted(profile['surfaces'].items(), key=lambda kv: -kv[1]['wall_ms']):
+            lines.append(f"| {name} | {row['wall_ms']:.1f} | {row['files_enumerated']} | "
+                         f"{row['files_read']} | {row['bytes_read']:,} |")
+        lines.append("")
+        lines.append("| Phase | ms |")
+        lines.append("|-------|---:|")
+        for phase, ms in profile['phases_ms'].items():
+            lines.append(f"| {phase} | {ms:.1f} |")
+
     lines.append("")
     lines.append("=" * 60)
 
@@ -943,10 +2094,17 @@ def call_extension_hook(payload):
     'findings', 'floor_info'}; hook returns augmented dict (additive-only,
     L464 — e.g. instance-specific search surfaces or annotations); absence =
     no-op; failure = warning + continue (ADR-004).
+
+    Returns (payload, report): extension_hooks.py imports the hook once per
+    process (batch and --serve runs no longer re-exec it per topic), times it
+    and holds it to an opt-in budget; when a hook exists the report goes to
+    search_contract.
     """
+    if _hooks is not None:
+        return _hooks.call_hook(get_agent_root(), 'study_topic', 'post_study', payload)
     ext_path = get_agent_root() / 'scripts' / 'study_topic_ext.py'
     if not ext_path.exists():
-        return payload
+        return payload, None
     try:
         spec = importlib.util.spec_from_file_location('study_topic_ext', str(ext_path))
         module = importlib.util.module_from_spec(spec)
@@ -954,13 +2112,726 @@ def call_extension_hook(payload):
         if hasattr(module, 'post_study'):
             result = module.post_study(payload)
             if isinstance(result, dict):
-                return result
+                return result, None
     except Exception as e:
         print(f"Warning: study_topic extension hook failed: {e}", file=sys.stderr)
-    return payload
+    return payload, None
+
+
+def open_study_run(args, index_path: Path = None):
+    """Per-process setup shared by every topic of a run (index, result cache).
+    `index_path` overrides the agent root's own index location (--fleet)."""
+    # Persistent inverted index: warm queries read postings, not file bytes.
+    # Absent module or --no-index = the original full scan (identical results).
+    global _INDEX, _CACHE
+    if _sti is not None and not args.no_index:
+        _INDEX = _sti.StudyIndex(index_path or _sti.default_index_path(get_agent_root()),
+                                 get_agent_root(),
+                                 describe=describe_file, filename_text=filename_text,
+                                 rebuild=args.reindex)
+        # Result cache rides on the index: validity is judged per corpus change.
+        if not args.no_cache:
+            _CACHE = _sti.ResultCache(_sti.default_cache_path(get_agent_root()))
+
+
+def surface_contract(args) -> tuple:
+    """(searched, excluded) surface declarations for one study. Built per call
+    rather than by editing the module lists, so one process (batch, --serve)
+    can answer studies with different opt-ins."""
+    searched, excluded = list(SURFACES_SEARCHED), list(SURFACES_EXCLUDED)
+    # Opt-in surfaces (2026-07-26 scope revisit). Declared only when asked for,
+    # so the default surface list and its rationale are unchanged.
+    if args.include_sessions:
+        searched.append(
+            f'sessions/*.md, last {args.session_days}d (OPT-IN via --include-sessions)')
+        for i, s in enumerate(excluded):
+            if s.startswith('sessions/'):
+                excluded[i] = (
+                    'workspace/, data/ (deliberate — 2026-07-04 scope decision, noise at '
+                    'study-time). sessions/ is INCLUDED this run via --include-sessions')
+    if args.include_instruments:
+        searched.append(
+            'scripts/** + tests/** + .claude/hooks/** + .codex/hooks/** '
+            '(OPT-IN via --include-instruments)')
+    return searched, excluded
 
 
-def main():
+def read_topic_requests(stream):
+    """Yield batch requests from JSONL: a JSON string is a topic; an object
+    carries 'topic' and optionally 'purpose' / 'domain_keywords'. Blank lines
+    are skipped; a bad line yields an error record in its place (ADR-004).
+    Fields are held to the CLI's own checks: 'purpose' one of --purpose's
+    choices, 'domain_keywords' a list of strings."""
+    for lineno, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            yield {'line': lineno, 'error': f'invalid JSON: {e}'}
+            continue
+        if isinstance(request, str):
+            request = {'topic': request}
+        if not isinstance(request, dict) or not isinstance(request.get('topic'), str) \
+                or not request['topic'].strip():
+            yield {'line': lineno, 'error': 'expected a topic string or {"topic": ...}'}
+            continue
+        if request.get('purpose') is not None and request['purpose'] not in PURPOSES:
+            yield {'line': lineno, 'error': f"purpose must be one of {', '.join(PURPOSES)}"}
+            continue
+        domain_keywords = request.get('domain_keywords')
+        if domain_keywords is not None and not (
+                isinstance(domain_keywords, list)
+                and all(isinstance(kw, str) for kw in domain_keywords)):
+            yield {'line': lineno, 'error': 'domain_keywords must be a list of strings'}
+            continue
+        yield request
+
+
+def expansion_contract(args, topic: str) -> dict:
+    """search_contract['expansion']: what --stem / --fuzzy did. With the
+    index, the vocabulary variants each keyword expanded to are listed."""
+    info = {'stem': args.stem, 'fuzzy': args.fuzzy}
+    if (args.stem or args.fuzzy is not None) and _EXPANSION is None:
+        info['degraded'] = 'expansion needs study_topic_index.py (stemmer, edit distance)'
+    elif _EXPANSION is not None and _INDEX is not None:
+        info['variants'] = {
+            kw: sorted(set(_expanded_tokens(kw)) - set(_keyword_tokens(kw)))[:EXPANSION_LIST_MAX]
+            for kw in prepare_keywords(topic) if re.fullmatch(r'\w+', kw)}
+    return info
+
+
+def result_cache_key(keywords: list, args, purpose_globs: list, domain_keywords: list,
+                     floor) -> str:
+    """Everything besides the corpus that decides a study's findings. The
+    code stamp retires entries written by a different version of the scorer."""
+    basis = {'keywords': keywords, 'purpose_globs': purpose_globs,
+             'domain_keywords': domain_keywords, 'floor': floor, 'ranker': args.ranker,
+             'sessions': args.session_days if args.include_sessions else None,
+             'instruments': args.include_instruments, 'expansion': _EXPANSION,
+             'code': _CODE_STAMP}
+    return _sti.content_hash(json.dumps(basis, sort_keys=True).encode())
+
+
+def cache_probe_terms(keywords: list):
+    """Index tokens a changed file must hold to possibly match this query
+    (a superset for punctuated keywords: any token containing one of their
+    \\w-runs). None when a keyword has no \\w-run and cannot be probed."""
+    terms = set()
+    for kw in keywords:
+        term = query_term(kw)
+        if term is not None:
+            for word in {w for words in term[0] for w in words}:
+                terms.update(_keyword_tokens(word))
+            continue
+        if _index_answerable([kw]):
+            terms.update(_expanded_tokens(kw))
+            continue
+        runs = re.findall(r'\w+', kw.lower())
+        if not runs:
+            return None
+        for run in runs:
+            terms.update(_INDEX.expand(run))
+    return terms
+
+
+def cacheable(keywords: list) -> bool:
+    """Whether cache_probe_terms() can probe every keyword, decided without
+    the vocabulary: a phrase/NEAR term or anything with a \\w-run."""
+    return all(query_term(kw) is not None or re.search(r'\w', kw) for kw in keywords)
+
+
+def cache_windows(args) -> dict:
+    """Current members of the time-windowed surfaces, as index keys."""
+    windows = {'inbox': [_INDEX.key(f) for f in inbox_files()]}
+    if args.include_sessions:
+        windows['sessions'] = [_INDEX.key(f) for f in session_files(args.session_days)]
+    return windows
+
+
+def like_source(path: str):
+    """The --like file. A relative PATH is read like the paths in the report:
+    against the agent root first, then the cwd. None if neither exists."""
+    for candidate in (get_agent_root() / Path(path).expanduser(), Path(path).expanduser()):
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def like_query(args) -> dict:
+    """--like PATH: bring the index up to date for every candidate, then score
+    all of them against the source file's TF-IDF vector into _LIKE. The
+    source itself is tokenized but never indexed (it may sit on no surface)
+    and never reported. Returns the source and its heaviest terms."""
+    import math
+    global _LIKE
+    started = time.perf_counter()
+    _INDEX.refresh(candidate_files(args.include_sessions, args.session_days,
+                                   args.include_instruments), jobs=args.jobs)
+    _INDEX.prune()
+    _note_time('refresh', started)
+    source = like_source(args.like)
+    status, _, payload = _sti.analyze(source, None, describe_file, filename_text)
+    tf = {t: len(lines) for t, lines in payload['terms'].items()} if status == 'new' else {}
+    _LIKE = _INDEX.similar(tf, exclude=_INDEX.key(source))
+    heaviest = sorted(tf, key=lambda t: (-(1 + math.log(tf[t])) * _INDEX.idf(t), t))
+    return {'like': _relative(source), 'source_terms': len(tf),
+            'top_terms': heaviest[:LIKE_TERMS_LISTED]}
+
+
+class StudyProfile:
+    """Where one study's time and I/O went (--profile).
+
+    Per surface: wall time of its finder, files it considered, and files and
+    bytes read on its behalf (scan reads, index tokenizing, context lines).
+    Per phase: the surface walk, index refresh, --jobs prefetch, regex matching, postings
+    lookups, scoring (boosts, ranker, floor), context snippets and the
+    extension hook. Regex and postings time is also inside the surface wall
+    times; worker-side reads are counted as whole-file reads.
+    """
+
+    PHASES = ('walk', 'refresh', 'prefetch', 'regex', 'index', 'scoring', 'contexts', 'hook')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.files_enumerated = 0
+        self.files_read = 0
+        self.bytes_read = 0
+        self.phases = dict.fromkeys(self.PHASES, 0.0)
+        self.surfaces = {}
+
+    def _io(self) -> tuple:
+        index_reads = _INDEX.reads if _INDEX is not None else {'files': 0, 'bytes': 0}
+        return (self.files_enumerated, self.files_read + index_reads['files'],
+                self.bytes_read + index_reads['bytes'])
+
+    def mark(self) -> tuple:
+        return (time.perf_counter(),) + self._io()
+
+    def surface(self, name: str, mark: tuple):
+        """Charge everything since `mark` to surface `name`."""
+        now = self.mark()
+        self.surfaces[name] = {
+            'wall_ms': round((now[0] - mark[0]) * 1000, 2),
+            'files_enumerated': now[1] - mark[1],
+            'files_read': now[2] - mark[2], 'bytes_read': now[3] - mark[3]}
+
+    def contract(self) -> dict:
+        """search_contract['profile']."""
+        enumerated, read, nbytes = self._io()
+        return {'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+                'files_enumerated': enumerated, 'files_read': read, 'bytes_read': nbytes,
+                'phases_ms': {k: round(v, 2) for k, v in self.phases.items()},
+                'surfaces': self.surfaces}
+
+
+def _note_time(phase: str, started: float):
+    if _PROFILE is not None:
+        _PROFILE.phases[phase] += (time.perf_counter() - started) * 1000
+
+
+def _note_read(file_path: Path = None, nbytes: int = None):
+    """Count one file read for --profile (`nbytes` default: the file size)."""
+    if _PROFILE is None:
+        return
+    if nbytes is None:
+        try:
+            nbytes = os.stat(file_path).st_size
+        except OSError:
+            nbytes = 0
+    _PROFILE.files_read += 1
+    _PROFILE.bytes_read += nbytes
+
+
+def finder_sections(topic: str, args, domain_keywords: list):
+    """Yield (section, raw findings) one finder at a time, in report order."""
+    if _PROFILE is not None:
+        # Walk once up front so the first surface is not charged for all.
+        started = time.perf_counter()
+        surface_files()
+        _note_time('walk', started)
+    # Parallel per-file work (--jobs N): results land in caches the finders
+    # consult, so everything below runs exactly as it does serially.
+    if args.jobs > 1 and _LIKE is None:
+        started = time.perf_counter()
+        prefetch(candidate_files(args.include_sessions, args.session_days,
+                                 args.include_instruments),
+                 topic, domain_keywords, jobs=args.jobs)
+        _note_time('prefetch', started)
+
+    # Perform focused research with epistemic parameters
+    finders = [
+        ('ldocs', lambda: find_ldocs(topic, domain_keywords=domain_keywords)),
+        ('patterns', lambda: find_patterns(topic, domain_keywords=domain_keywords)),
+        ('project_plans', lambda: find_project_plans(topic, domain_keywords=domain_keywords)),
+        ('sops', lambda: find_sops(topic, domain_keywords=domain_keywords)),
+        ('governance', lambda: find_governance(topic, domain_keywords=domain_keywords)),
+        ('specs', lambda: find_specs(topic, domain_keywords=domain_keywords)),
+        ('knowledge', lambda: find_knowledge(topic, domain_keywords=domain_keywords)),
+        ('inbox', lambda: find_inbox(topic, domain_keywords=domain_keywords))]
+    if args.include_sessions:
+        finders.append(('sessions', lambda: find_sessions(
+            topic, domain_keywords=domain_keywords, days=args.session_days)))
+    if args.include_instruments:
+        finders.append(('instruments',
+                        lambda: find_instruments(topic, domain_keywords=domain_keywords)))
+    for key, finder in finders:
+        mark = _PROFILE.mark() if _PROFILE is not None else None
+        items = finder()
+        if mark is not None:
+            _PROFILE.surface(key, mark)
+        yield key, items
+
+
+def rank_sections(findings: dict, args, keywords: list, purpose_globs: list, floor) -> tuple:
+    """Purpose boosts, ranking, sort and floor over `findings` (in place).
+    Every step is per-item, so ranking sections one at a time gives the same
+    lists as ranking them together. Returns (ranking block, suppressed)."""
+    started = time.perf_counter()
+    # Purpose weighting is applied after all default and opt-in finders have run,
+    # so no result tier can silently bypass the advertised epistemic parameter.
+    for items in findings.values():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            item['purpose_boost'] = compute_purpose_boost(item.get('file', ''), purpose_globs)
+    ranking = apply_ranker(findings, args.ranker, keywords)
+    for items in findings.values():
+        if isinstance(items, list):
+            items.sort(key=lambda item: item.get('score', 0.0), reverse=True)
+
+    # Relevance floor (v3.26 C-26-11; audit R3, gh#1560): suppress items whose
+    # score sits below the floor. Configurable; --no-floor escapes. The same
+    # floor applies to either ranker's score.
+    suppressed = 0
+    if floor is not None:
+        for key in findings:
+            kept = [x for x in findings[key] if x.get('score', floor) >= floor]
+            suppressed += len(findings[key]) - len(kept)
+            findings[key] = kept
+    _note_time('scoring', started)
+    return ranking, suppressed
+
+
+def run_finders(topic: str, args, purpose_globs: list, domain_keywords: list, floor,
+                on_section=None) -> tuple:
+    """Finders, purpose boosts, ranking and floor for one topic.
+    Returns (findings, ranking, suppressed, files that matched pre-floor).
+
+    With `on_section`, each section is ranked as soon as its finder returns
+    and handed to on_section(section, items) — the caller must have brought
+    the index up to date first, so BM25 corpus statistics are already final.
+    """
+    findings, matched = {}, set()
+    ranking, suppressed = None, 0
+    for key, items in finder_sections(topic, args, domain_keywords):
+        findings[key] = items
+        matched.update(item.get('file') for item in items)
+        if on_section is not None:
+            section = {key: items}
+            ranking, dropped = rank_sections(section, args, prepare_keywords(topic),
+                                             purpose_globs, floor)
+            findings[key] = section[key]
+            suppressed += dropped
+            on_section(key, findings[key])
+    # Ranking runs once, over the final findings, so BM25 corpus statistics
+    # reflect every file the index saw this run (composite is the default).
+    if on_section is None:
+        ranking, suppressed = rank_sections(findings, args, prepare_keywords(topic),
+                                            purpose_globs, floor)
+    return findings, ranking, suppressed, matched
+
+
+def study(topic: str, args, config: dict, purpose: str = None,
+          domain_keywords: list = None, emit=None):
+    """Run one study. Returns (JSON document, post-hook floor_info).
+
+    Everything topic-specific is reset here, so a batch or a long-lived
+    process can call it repeatedly against the same index. With `emit`
+    (--ndjson), every hit is passed to emit(record) as soon as its section
+    is ranked, and the summary record last.
+    """
+    global _EXPANSION, _LIKE, _PROFILE
+    _PROFILE = StudyProfile() if args.profile else None
+    _KEYWORD_COUNTS.clear()
+    _MATCH_LINES.clear()
+    _FILE_META.clear()
+    _PREFETCH.clear()
+    _EXPANSION = expansion_setting(args)
+    _LIKE = None
+    if _INDEX is not None:
+        _INDEX.stats = dict.fromkeys(_INDEX.stats, 0)
+
+    # Resolve epistemic parameters (CAP-SESSION-007-06/07)
+    purpose = resolve_purpose(purpose or args.purpose, config)
+    purpose_globs = get_purpose_globs(purpose, config)
+
+    # Domain keywords: per-topic > explicit flag > config > none
+    domain_keywords = domain_keywords or args.domain_keywords or config.get('domain_keywords')
+    floor = None if args.no_floor else config.get('relevance_floor', RELEVANCE_FLOOR_DEFAULT)
+
+    # Result cache: an entry whose stat stamp of the candidate files (and
+    # window membership) still matches is answered before the index is read.
+    # Otherwise bring the index up to date for every candidate and reuse the
+    # entry unless a change since could touch it. Findings are cached
+    # pre-hook, so the hook always runs live. --no-cache is honoured per
+    # study: a --serve daemon opened its cache once.
+    cache_info = {'enabled': False}
+    use_cache = _CACHE is not None and not args.no_cache
+    cached = cache_key = stamp = None
+    # --like: every idf moves with any corpus change, so nothing is cached.
+    like_info = like_query(args) if args.like else None
+    if use_cache and _INDEX is not None and like_info is None:
+        keywords = prepare_keywords(topic) or [topic]
+        candidates = candidate_files(args.include_sessions, args.session_days,
+                                     args.include_instruments)
+        exact = args.ranker == 'bm25'
+        if cacheable(keywords):
+            cache_key = result_cache_key(keywords, args, purpose_globs, domain_keywords, floor)
+            windows = cache_windows(args)
+            stamp = _sti.stat_stamp(candidates, windows)
+            cache_info = {'enabled': True, 'hit': False}
+            if not args.reindex:
+                cached = _CACHE.recall(cache_key, stamp, _INDEX.generation if exact else None)
+                cache_info['validated'] = 'stamp'
+        if cached is None:
+            started = time.perf_counter()
+            _INDEX.refresh(candidates, jobs=args.jobs)
+            _INDEX.prune()
+            _note_time('refresh', started)
+            if cache_key is not None and not args.reindex:
+                cached = _CACHE.lookup(cache_key, _INDEX, lambda: cache_probe_terms(keywords),
+                                       windows, exact_generation=exact, stamp=stamp)
+                cache_info['validated'] = 'index'
+    streamed = {}
+    on_section = None
+    if emit is not None:
+        def on_section(key, items):
+            started = time.perf_counter()
+            attach_contexts({key: items}, None if args.all else REPORT_TOP_K)
+            _note_time('contexts', started)
+            streamed[key] = {item.get('file') for item in items}
+            for rank, item in enumerate(items, 1):
+                emit({'type': 'hit', 'topic': topic, 'section': key, 'rank': rank,
+                      'item': item})
+
+    if cached is not None:
+        cached = copy.deepcopy(cached)
+        findings, ranking, suppressed = cached['findings'], cached['ranking'], cached['suppressed']
+        _MATCH_LINES.update(cached['context_lines'])
+        cache_info['hit'] = True
+        for key, items in findings.items() if on_section else ():
+            on_section(key, items)
+    else:
+        if on_section is not None and _INDEX is not None and not use_cache and not like_info:
+            # Sections are ranked as they finish: settle BM25 corpus
+            # statistics before the first one (the cache path already has).
+            started = time.perf_counter()
+            _INDEX.refresh(candidate_files(args.include_sessions, args.session_days,
+                                           args.include_instruments), jobs=args.jobs)
+            _INDEX.prune()
+            _note_time('refresh', started)
+        findings, ranking, suppressed, matched = run_finders(
+            topic, args, purpose_globs, domain_keywords, floor, on_section=on_section)
+        if cache_key is not None:
+            kept = {item['file'] for items in findings.values() for item in items}
+            entry = copy.deepcopy({
+                'findings': findings, 'ranking': ranking, 'suppressed': suppressed,
+                'context_lines': {f: _MATCH_LINES[f] for f in kept if f in _MATCH_LINES}})
+            for items in entry['findings'].values():
+                for item in items:
+                    item.pop('contexts', None)
+            _CACHE.put(cache_key, entry, _INDEX.generation, matched, windows, stamp)
+    floor_info = {'floor': floor, 'suppressed': suppressed} if floor is not None else None
+
+    # Context snippets: read last, and only for what is displayed — the top
+    # REPORT_TOP_K per section of what survived the floor (--all: every item).
+    started = time.perf_counter()
+    attach_contexts(findings, None if args.all else REPORT_TOP_K)
+    _note_time('contexts', started)
+
+    searched, excluded = surface_contract(args)
+    index_info = {'enabled': _INDEX is not None}
+    if _INDEX is not None:
+        if cache_info.get('validated') != 'stamp':     # a stamp hit never read the index
+            _INDEX.prune()
+        index_info.update({'path': str(_INDEX.path), 'rebuilt': args.reindex,
+                           'files_indexed': len(_INDEX.files), 'refresh': dict(_INDEX.stats),
+                           'generation': _INDEX.generation, 'saved': _INDEX.save(),
+                           'session_segments': _INDEX.segment_info()})
+    if cache_info['enabled']:
+        cache_info.update({'entries': len(_CACHE.entries), 'saved': _CACHE.save()})
+
+    # Extension hook (v3.26 C-26-05) — instance surfaces/annotations join here
+    started = time.perf_counter()
+    payload, hook_report = call_extension_hook({'topic': topic, 'purpose': purpose,
+                                                'findings': findings, 'floor_info': floor_info})
+    _note_time('hook', started)
+    findings = payload.get('findings', findings)
+    floor_info = payload.get('floor_info', floor_info)
+    if like_info is not None:
+        ranking.update(like_info)
+    # Hits the hook added (additive-only, L464) follow the streamed ones.
+    for key, items in findings.items() if emit else ():
+        for rank, item in enumerate(items if isinstance(items, list) else (), 1):
+            if item.get('file') not in streamed.get(key, ()):
+                emit({'type': 'hit', 'topic': topic, 'section': key, 'rank': rank,
+                      'item': item, 'source': 'extension_hook'})
+
+    output = {
+        'timestamp': datetime.now().isoformat(),
+        'agent_path': str(get_agent_root()),
+        'topic': topic,
+        'purpose': purpose,
+        'domain_keywords': domain_keywords,
+        'findings': findings,
+        'total_artifacts': sum(len(v) for v in findings.values() if isinstance(v, list)),
+        'search_contract': {
+            'keywords': [] if like_info else prepare_keywords(topic),
+            'surfaces_searched': searched,
+            'surfaces_excluded': excluded,
+            'surfaces_out_of_universe': SURFACES_OUT_OF_UNIVERSE,
+            'purpose_globs': purpose_globs,
+            'sessions': {'included': args.include_sessions,
+                         'recency_days': args.session_days if args.include_sessions else None,
+                         'date_basis': 'filename date; undated files included'},
+            'instruments_included': args.include_instruments,
+            'relevance_floor': floor,
+            'suppressed_below_floor': suppressed if floor is not None else None,
+            'ranking': ranking,
+            'expansion': expansion_contract(args, topic),
+            'index': index_info,
+            'cache': cache_info,
+            'jobs': args.jobs,
+            'served_by': 'daemon' if _SERVING else 'in-process',
+        }
+    }
+    if hook_report is not None and hook_report['status'] != 'absent':
+        output['search_contract']['extension_hook'] = hook_report
+    if _PROFILE is not None:
+        output['search_contract']['profile'] = _PROFILE.contract()
+    if emit is not None:
+        emit(summary_record(output))
+    return output, floor_info
+
+
+def summary_record(output: dict) -> dict:
+    """--ndjson closing record: the study document minus its findings."""
+    summary = {'type': 'summary'}
+    summary.update((k, v) for k, v in output.items() if k != 'findings')
+    summary['counts'] = {k: len(v) for k, v in output['findings'].items()
+                         if isinstance(v, list)}
+    return summary
+
+
+# ---------------------------------------------------------------------------
+# Fleet mode (--fleet ROOT...). This agent and each sibling root are studied in
+# their own worker process against that root's own index, with THIS agent's
+# epistemic parameters (config, purpose, domain keywords), so composite scores
+# are directly comparable. BM25 idf and average length differ per corpus, so
+# BM25 is re-scored with fleet-wide statistics before the merged sections are
+# sorted and floored. A root that fails is reported and skipped (ADR-004).
+# ---------------------------------------------------------------------------
+
+def fleet_roots(args) -> list:
+    """This agent's root first, then --fleet roots, each once."""
+    roots = []
+    for root in [get_agent_root(), *args.fleet]:
+        root = Path(root).expanduser().resolve()
+        if root not in roots:
+            roots.append(root)
+    return roots
+
+
+def _fleet_task(task):
+    """Study one fleet root in this process. Returns its floor-less findings
+    and what the merge needs: context line numbers, per-keyword counts, doc
+    lengths and corpus statistics (None without an index)."""
+    global _INDEX, _CACHE
+    root, index_path, topic, options, config, purpose, domain_keywords = task
+    saved_root = os.environ.get('AGET_STUDY_ROOT')
+    os.environ['AGET_STUDY_ROOT'] = root
+    reset_surfaces()
+    _FILE_META.clear()
+    try:
+        if not Path(root).is_dir():
+            return {'root': root, 'error': 'not a directory'}
+        args = argparse.Namespace(**options)
+        open_study_run(args, index_path=index_path and Path(index_path))
+        output, _ = study(topic, args, config, purpose=purpose, domain_keywords=domain_keywords)
+        files = set()
+        for items in output['findings'].values():
+            for item in items if isinstance(items, list) else ():
+                item.pop('contexts', None)     # re-attached after the merge
+                files.add(item.get('file'))
+        corpus = None
+        if _INDEX is not None:
+            stats = _INDEX.corpus_stats()
+            corpus = {'docs': stats['docs'], 'avg_length': stats['avg_length'],
+                      'doc_freq': {kw: keyword_doc_freq(kw) for kw in prepare_keywords(topic)}}
+        return {'root': root, 'findings': output['findings'],
+                'ranker': output['search_contract']['ranking']['ranker'],
+                'index': output['search_contract']['index']['enabled'],
+                'lines': {f: _MATCH_LINES[f] for f in files if f in _MATCH_LINES},
+                'counts': {f: _KEYWORD_COUNTS[f] for f in files if f in _KEYWORD_COUNTS},
+                'lengths': {f: _INDEX.files[f]['length'] for f in files
+                            if _INDEX is not None and f in _INDEX.files},
+                'corpus': corpus}
+    except Exception as e:  # one bad root must not sink the fleet
+        return {'root': root, 'error': f'{type(e).__name__}: {e}'}
+    finally:
+        _INDEX = _CACHE = None
+        reset_surfaces()
+        _FILE_META.clear()
+        if saved_root is None:
+            os.environ.pop('AGET_STUDY_ROOT', None)
+        else:
+            os.environ['AGET_STUDY_ROOT'] = saved_root
+
+
+def fleet_ranking(findings: dict, ranker: str, keywords: list, corpora: list,
+                  lengths: dict) -> dict:
+    """Score merged fleet findings on one scale; returns the ranking block.
+    BM25 uses summed doc counts, doc frequencies and lengths of every root,
+    so needs every root indexed — otherwise composite, and says so."""
+    ranking = {'requested': ranker, 'ranker': ranker, 'scope': 'fleet'}
+    if ranker == 'bm25' and (not corpora or not all(corpora)):
+        ranking.update({'ranker': 'composite',
+                        'degraded': 'bm25 needs the persistent index in every fleet root'})
+    if ranking['ranker'] == 'composite':
+        ranking['formula'] = ('keyword_coverage x purpose x domain x filename '
+                              'x (1 + log2(match_count))')
+        for items in findings.values():
+            for item in items:
+                item['score'] = composite_score(item)
+        return ranking
+
+    docs = sum(c['docs'] for c in corpora)
+    avg_length = sum(c['docs'] * c['avg_length'] for c in corpora) / docs if docs else 0.0
+    idf = {kw: bm25_idf(sum(c['doc_freq'].get(kw, 0) for c in corpora), docs)
+           for kw in keywords}
+    ranking.update({'formula': 'bm25 x purpose x domain x filename',
+                    'k1': BM25_K1, 'b': BM25_B, 'corpus_docs': docs,
+                    'avg_doc_length': round(avg_length, 2),
+                    'idf': {kw: round(v, 4) for kw, v in idf.items()}})
+    for items in findings.values():
+        for item in items:
+            item['score'] = bm25_score(item, idf, lengths.get(item['file'], avg_length),
+                                       avg_length)
+    return ranking
+
+
+def fleet_study(topic: str, args, config: dict, purpose: str = None,
+                domain_keywords: list = None, emit=None):
+    """Federated study over fleet_roots(). Same document shape as study(),
+    plus 'agent'/'agent_root' on every item and search_contract['fleet'].
+    Items from sibling roots carry absolute 'file' paths (as the canonical
+    ../aget/specs tier already does); a file reached from several roots is
+    listed once, under the first."""
+    purpose = resolve_purpose(purpose or args.purpose, config)
+    purpose_globs = get_purpose_globs(purpose, config)
+    domain_keywords = domain_keywords or args.domain_keywords or config.get('domain_keywords')
+    floor = None if args.no_floor else config.get('relevance_floor', RELEVANCE_FLOOR_DEFAULT)
+    keywords = prepare_keywords(topic)
+
+    # Workers search floor-less and single-process; floor and contexts are
+    # applied to the merged lists. Re-scoring needs every hit's term counts,
+    # which a result-cache hit does not carry, so workers bypass the cache.
+    options = dict(vars(args), fleet=None, no_floor=True, jobs=1, all=False, ndjson=False,
+                   topics_file=None, no_cache=True)
+    local = get_agent_root()
+    # Sibling indexes live under this agent's .aget/index/fleet/ (a read-only
+    # query must not write into other repositories); ours stays where it is.
+    tasks = [(str(root),
+              None if root == local or _sti is None else str(_sti.fleet_index_path(local, root)),
+              topic, options, config, purpose, domain_keywords)
+             for root in fleet_roots(args)]
+    workers = min(len(tasks), args.jobs if args.jobs > 1 else (os.cpu_count() or 1))
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_fleet_task, tasks))
+    except (OSError, RuntimeError):
+        results = [_fleet_task(task) for task in tasks]
+
+    _KEYWORD_COUNTS.clear()
+    _MATCH_LINES.clear()
+    findings, seen, corpora, lengths, fleet = {}, set(), [], {}, []
+    for result in results:
+        root = Path(result['root'])
+        entry = {'agent': root.name, 'root': result['root']}
+        fleet.append(entry)
+        if 'error' in result:
+            entry['error'] = result['error']
+            continue
+        corpora.append(result['corpus'])
+        entry.update({'index': result['index'], 'ranker': result['ranker'], 'hits': 0})
+        for key, items in result['findings'].items():
+            if not isinstance(items, list):
+                continue
+            section = findings.setdefault(key, [])
+            for item in items:
+                file = item.get('file', '')
+                path = os.path.normpath(file if os.path.isabs(file) else root / file)
+                if path in seen:
+                    continue
+                seen.add(path)
+                merged = path if root != local else file
+                for table, source in ((_MATCH_LINES, 'lines'), (_KEYWORD_COUNTS, 'counts'),
+                                      (lengths, 'lengths')):
+                    if file in result[source]:
+                        table[merged] = result[source][file]
+                item.update({'file': merged, 'agent': root.name, 'agent_root': result['root']})
+                section.append(item)
+                entry['hits'] += 1
+
+    ranking = fleet_ranking(findings, args.ranker, keywords, corpora, lengths)
+    suppressed = 0
+    for key, items in findings.items():
+        items.sort(key=lambda item: item.get('score', 0.0), reverse=True)
+        if floor is not None:
+            kept = [x for x in items if x.get('score', floor) >= floor]
+            suppressed += len(items) - len(kept)
+            findings[key] = kept
+    floor_info = {'floor': floor, 'suppressed': suppressed} if floor is not None else None
+    attach_contexts(findings, None if args.all else REPORT_TOP_K)
+
+    searched, excluded = surface_contract(args)
+    output = {
+        'timestamp': datetime.now().isoformat(),
+        'agent_path': str(local),
+        'topic': topic,
+        'purpose': purpose,
+        'domain_keywords': domain_keywords,
+        'findings': findings,
+        'total_artifacts': sum(len(v) for v in findings.values()),
+        'search_contract': {
+            'keywords': keywords,
+            'surfaces_searched': searched,
+            'surfaces_excluded': excluded,
+            'surfaces_out_of_universe': SURFACES_OUT_OF_UNIVERSE,
+            'fleet': fleet,
+            'purpose_globs': purpose_globs,
+            'sessions': {'included': args.include_sessions,
+                         'recency_days': args.session_days if args.include_sessions else None,
+                         'date_basis': 'filename date; undated files included'},
+            'instruments_included': args.include_instruments,
+            'relevance_floor': floor,
+            'suppressed_below_floor': suppressed if floor is not None else None,
+            'ranking': ranking,
+            'jobs': workers,
+            'served_by': 'in-process'
+        }
+    }
+    if emit is not None:
+        for key, items in findings.items():
+            for rank, item in enumerate(items, 1):
+                emit({'type': 'hit', 'topic': topic, 'section': key, 'rank': rank,
+                      'item': item})
+        emit(summary_record(output))
+    return output, floor_info
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description='Study Topic Protocol - Focused Topic Research',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -968,16 +2839,30 @@ def main():
 Examples:
   python3 study_topic.py --topic "wind down"       # Research wind down protocol
   python3 study_topic.py --topic "release" --json  # JSON output
+  python3 study_topic.py --topic "release" --ndjson  # Stream hits, then a summary
   python3 study_topic.py --topic "L477"            # Find L477 references
+  python3 study_topic.py --topic '"wind down" NEAR/5 session'  # Phrase + proximity
+  python3 study_topic.py --topic "relase" --fuzzy --stem  # Typo-tolerant, stemmed
+  python3 study_topic.py --topics-file topics.jsonl  # Batch: one JSON line per topic
+  python3 study_topic.py --serve                   # Resident daemon; later calls use it
+  python3 study_topic.py --topic "release" --fleet ../agent-a ../agent-b  # Federated
+  python3 study_topic.py --like governance/POLICY.md  # Nearest artifacts to a file
   python3 study_topic.py --verify                  # Migration verification
         '''
     )
-    parser.add_argument('--topic', '-t', type=str, help='Topic to research')
-    parser.add_argument('--purpose', choices=['pre-implementation', 'pre-release', 'exploration', 'audit'],
+    parser.add_argument('--topic', '-t', type=str,
+                        help='Topic to research (supports "quoted phrases" and a NEAR/k b)')
+    parser.add_argument('--like', metavar='PATH',
+                        help='Instead of a topic: the artifacts most similar to PATH '
+                             '(TF-IDF cosine over the index, all surfaces searched)')
+    parser.add_argument('--purpose', choices=PURPOSES,
                         help='Epistemic purpose — weights results by KB area (CAP-SESSION-007-06)')
     parser.add_argument('--domain-keywords', nargs='*', metavar='KEYWORD',
                         help='Domain keywords for relevance boosting (CAP-SESSION-007-07)')
     parser.add_argument('--json', action='store_true', help='Output in JSON format')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Stream one JSON record per hit as each surface finishes, '
+                             'then a summary record (search_contract, counts)')
     parser.add_argument('--no-floor', action='store_true',
                         help='Disable the relevance floor (v3.26 C-26-11; useful for exhaustive ID lookups)')
     parser.add_argument('--verify', action='store_true', help='Verification mode for migration')
@@ -989,7 +2874,241 @@ Examples:
                         help='Recency window for --include-sessions (default 90)')
     parser.add_argument('--include-instruments', action='store_true',
                         help='Also search scripts/tests/hooks (OFF by default; executable surface)')
+    parser.add_argument('--ranker', choices=RANKERS, default='composite',
+                        help='Scoring model: composite (default; coverage x boosts x log-damped '
+                             'count) or bm25 (idf + length-normalized, same boosts; needs the index)')
+    parser.add_argument('--stem', action='store_true',
+                        help='Also match stemmed variants of each keyword (release -> '
+                             'releases, released, releasing)')
+    parser.add_argument('--fuzzy', type=int, nargs='?', const=2, metavar='N',
+                        help='Also match typo neighbours: up to 1 edit for 3-5 character '
+                             'keywords, 2 beyond, capped at N (default 2)')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Bypass the persistent index (.aget/index/) and regex-scan every file')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Worker processes for per-file scanning/tokenizing (default: 1)')
+    parser.add_argument('--reindex', action='store_true',
+                        help='Discard the persistent index and rebuild it this run')
+    parser.add_argument('--all', action='store_true',
+                        help=f'Show every item per section, each with context snippets '
+                             f'(default: top {REPORT_TOP_K})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Bypass the result cache (.aget/index/study_topic_results.json)')
+    parser.add_argument('--topics-file', metavar='PATH',
+                        help='Batch mode: JSONL of topics ("-" = stdin); one JSON result '
+                             'per line out, in input order')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run a resident query daemon on a Unix socket under .aget/index/')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Search in-process even if a --serve daemon is running')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-surface wall time, files enumerated/read, bytes '
+                             'read and regex/scoring/hook time (search_contract + report table)')
+    parser.add_argument('--fleet', nargs='+', metavar='ROOT',
+                        help='Also study these sibling agent roots (one process each) and '
+                             'merge the findings, tagged by agent, on one score scale')
+    return parser
+
+
+def emit_record(record: dict):
+    """Write one compact JSON line and flush it, so a reader sees it now."""
+    sys.stdout.write(json.dumps(record, default=str) + '\n')
+    sys.stdout.flush()
+
+
+def render_study(args, config: dict) -> str:
+    """Single-topic study rendered exactly as the CLI prints it."""
+    output, floor_info = (fleet_study if args.fleet else study)(args.topic, args, config)
+    if args.json:
+        return json.dumps(output, indent=2, default=str)
+    contract = output['search_contract']
+    return generate_report(args.topic, output['findings'], floor_info=floor_info,
+                           purpose=output['purpose'], purpose_globs=contract['purpose_globs'],
+                           ranking=contract['ranking'],
+                           surfaces=(contract['surfaces_searched'],
+                                     contract['surfaces_excluded']),
+                           display_limit=None if args.all else REPORT_TOP_K,
+                           profile=contract.get('profile'))
+
+
+# ---------------------------------------------------------------------------
+# Resident daemon (--serve). Keeps the index, the surface walk and compiled
+# query patterns in memory and answers CLI invocations over a Unix socket.
+# Protocol: one JSON request {"argv": [...]} per connection, client half-closes,
+# daemon replies {"stdout": str, "exit": int} and closes. Any failure on the
+# client side = in-process search (ADR-004); the daemon is only ever a cache.
+# ---------------------------------------------------------------------------
+
+DAEMON_POLL_SECONDS = 2.0       # idle surface-watch interval
+DAEMON_CONNECT_TIMEOUT = 0.5    # a live daemon accepts immediately
+DAEMON_REPLY_TIMEOUT = 120.0
+# Flags that change per-process state (index lifecycle, batch stdin) or that
+# ask for in-process search are never forwarded. --ndjson stays local too: a
+# daemon reply is one buffered string, which would defeat the streaming.
+# --like names a file relative to the caller's cwd, not the daemon's.
+DAEMON_LOCAL_FLAGS = ('serve', 'no_daemon', 'no_index', 'reindex', 'topics_file', 'verify',
+                      'ndjson', 'fleet', 'like')
+
+
+def default_socket_path() -> Path:
+    return get_agent_root() / '.aget' / 'index' / 'study_topic.sock'
+
+
+def _recv_all(conn) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+def query_daemon(argv: list, socket_path: Path = None):
+    """Send a CLI invocation to a running daemon. Returns its reply dict, or
+    None when no daemon answers (caller searches in-process)."""
+    import socket
+    socket_path = socket_path or default_socket_path()
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(DAEMON_CONNECT_TIMEOUT)
+            conn.connect(str(socket_path))
+            conn.settimeout(DAEMON_REPLY_TIMEOUT)
+            conn.sendall(json.dumps({'argv': argv,
+                                     'root': str(get_agent_root())}).encode() + b'\n')
+            conn.shutdown(socket.SHUT_WR)
+            reply = json.loads(_recv_all(conn))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(reply, dict) or 'stdout' not in reply:
+        return None
+    return reply
+
 
+class StudyDaemon:
+    """In-memory state of a --serve process and its request handler."""
+
+    def __init__(self, args, socket_path: Path = None):
+        self.args = args
+        self.socket_path = socket_path or default_socket_path()
+        self.parser = build_parser()
+        self.config_path = get_agent_root() / '.aget' / 'config.json'
+        self.config_mtime = None
+        self.config = {}
+        self.queries = 0
+
+    def current_config(self) -> dict:
+        """config.json, re-read only when its mtime moves."""
+        try:
+            mtime = self.config_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self.config_mtime or self.queries == 0:
+            self.config_mtime = mtime
+            self.config = load_study_topic_config()
+        return self.config
+
+    def watch(self):
+        """One surface-watch tick: re-walk if membership may have changed and
+        re-tokenize whatever changed, so the next query starts hot."""
+        if _SURFACE_FILES is None or surfaces_stale():
+            reset_surfaces()
+        if _INDEX is not None:
+            # Opt-in surfaces are kept hot only if --serve itself was given them.
+            _INDEX.refresh(candidate_files(self.args.include_sessions, self.args.session_days,
+                                           self.args.include_instruments),
+                           jobs=self.args.jobs)
+            _INDEX.prune()
+            _INDEX.save()
+
+    def handle(self, request: dict) -> dict:
+        if request.get('root') != str(get_agent_root()):
+            return {'error': 'daemon serves a different agent root'}
+        try:
+            args = self.parser.parse_args(request.get('argv', []))
+        except SystemExit:
+            return {'error': 'unparseable argv'}
+        if any(getattr(args, flag, None) for flag in DAEMON_LOCAL_FLAGS) or not args.topic:
+            return {'error': 'not a daemon query'}
+        # Surface membership is re-checked per query, not only per poll, so a
+        # file created a moment ago is never missed.
+        if _SURFACE_FILES is not None and surfaces_stale():
+            reset_surfaces()
+        config = self.current_config()
+        self.queries += 1
+        return {'stdout': render_study(args, config), 'exit': 0}
+
+    def serve(self) -> int:
+        import signal
+        import socket
+        if not hasattr(socket, 'AF_UNIX'):
+            print("Error: --serve needs Unix domain sockets", file=sys.stderr)
+            return 1
+        if self._alive():
+            print(f"Error: a daemon is already serving {self.socket_path}", file=sys.stderr)
+            return 1
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self.socket_path.unlink()     # stale socket from a dead daemon
+        except OSError:
+            pass
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(str(self.socket_path))
+        except OSError as e:
+            print(f"Error: cannot bind {self.socket_path}: {e}", file=sys.stderr)
+            return 1
+        server.listen(16)
+        server.settimeout(DAEMON_POLL_SECONDS)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))   # unlink the socket on stop
+        print(f"study_topic daemon serving {get_agent_root()} on {self.socket_path}",
+              flush=True)
+        try:
+            self.watch()
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    self.watch()
+                    continue
+                with conn:
+                    conn.settimeout(DAEMON_REPLY_TIMEOUT)
+                    try:
+                        request = json.loads(_recv_all(conn))
+                        reply = self.handle(request if isinstance(request, dict) else {})
+                    except (OSError, ValueError) as e:
+                        reply = {'error': str(e)}
+                    except Exception as e:  # a bad query must not take the daemon down
+                        reply = {'error': f'{type(e).__name__}: {e}'}
+                    try:
+                        conn.sendall(json.dumps(reply, default=str).encode())
+                    except OSError:
+                        pass
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            server.close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+
+    def _alive(self) -> bool:
+        import socket
+        if not self.socket_path.exists():
+            return False
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.settimeout(DAEMON_CONNECT_TIMEOUT)
+                probe.connect(str(self.socket_path))
+            return True
+        except OSError:
+            return False
+
+
+def main():
+    parser = build_parser()
     args = parser.parse_args()
 
     # Verification mode for migration testing
@@ -997,109 +3116,74 @@ Examples:
         print("VERIFY: study_topic protocol (study_topic.py)")
         return 0
 
+    # Resident daemon: own the index for as long as it runs.
+    if args.serve:
+        global _SERVING
+        _SERVING = True
+        open_study_run(args)
+        return StudyDaemon(args).serve()
+
+    # --like replaces the topic: one source file, one local index.
+    if args.like:
+        if args.topic or args.topics_file or args.fleet:
+            print("Error: --like cannot be combined with --topic, --topics-file or --fleet")
+            return 1
+        if _sti is None or args.no_index:
+            print("Error: --like needs the persistent index (drop --no-index)")
+            return 1
+        if like_source(args.like) is None:
+            print(f"Error: --like: no such file: {args.like}")
+            return 1
+        args.topic = f"like {args.like}"
+
     # Topic is required for actual research
-    if not args.topic:
+    if not args.topic and not args.topics_file:
         print("Error: --topic is required for research")
         print("Use --verify for migration verification")
         parser.print_help()
         return 1
 
-    # Load config and resolve epistemic parameters (CAP-SESSION-007-06/07)
-    config = load_study_topic_config()
-    purpose = resolve_purpose(args.purpose, config)
-    purpose_globs = get_purpose_globs(purpose, config)
-
-    # Domain keywords: explicit flag > config > none
-    domain_keywords = args.domain_keywords or config.get('domain_keywords')
-
-    # Perform focused research with epistemic parameters
-    findings = {
-        'ldocs': find_ldocs(args.topic, domain_keywords=domain_keywords),
-        'patterns': find_patterns(args.topic, domain_keywords=domain_keywords),
-        'project_plans': find_project_plans(args.topic, domain_keywords=domain_keywords),
-        'sops': find_sops(args.topic, domain_keywords=domain_keywords),
-        'governance': find_governance(args.topic, domain_keywords=domain_keywords),
-        'specs': find_specs(args.topic, domain_keywords=domain_keywords),
-        'knowledge': find_knowledge(args.topic, domain_keywords=domain_keywords),
-        'inbox': find_inbox(args.topic, domain_keywords=domain_keywords)
-    }
-    # Opt-in surface (2026-07-26 scope revisit). Added only when asked for, so the
-    # default surface list and its rationale are unchanged.
-    if args.include_sessions:
-        findings['sessions'] = find_sessions(
-            args.topic, domain_keywords=domain_keywords, days=args.session_days)
-        SURFACES_SEARCHED.append(
-            f'sessions/*.md, last {args.session_days}d (OPT-IN via --include-sessions)')
-        for i, s in enumerate(SURFACES_EXCLUDED):
-            if s.startswith('sessions/'):
-                SURFACES_EXCLUDED[i] = (
-                    'workspace/, data/ (deliberate — 2026-07-04 scope decision, noise at '
-                    'study-time). sessions/ is INCLUDED this run via --include-sessions')
-    if args.include_instruments:
-        findings['instruments'] = find_instruments(args.topic, domain_keywords=domain_keywords)
-        SURFACES_SEARCHED.append(
-            'scripts/** + tests/** + .claude/hooks/** + .codex/hooks/** '
-            '(OPT-IN via --include-instruments)')
-
-    # Purpose weighting is applied after all default and opt-in finders have run,
-    # so no result tier can silently bypass the advertised epistemic parameter.
-    for items in findings.values():
-        if not isinstance(items, list):
-            continue
-        for item in items:
-            item['purpose_boost'] = compute_purpose_boost(item.get('file', ''), purpose_globs)
-            item['score'] = composite_score(item)
-        items.sort(key=lambda item: item.get('score', 0.0), reverse=True)
-
-    # Relevance floor (v3.26 C-26-11; audit R3, gh#1560): suppress items whose
-    # composite score sits below the floor. Configurable; --no-floor escapes.
-    floor = None if args.no_floor else config.get('relevance_floor', RELEVANCE_FLOOR_DEFAULT)
-    suppressed = 0
-    if floor is not None:
-        for key in findings:
-            kept = [x for x in findings[key] if x.get('score', floor) >= floor]
-            suppressed += len(findings[key]) - len(kept)
-            findings[key] = kept
-    floor_info = {'floor': floor, 'suppressed': suppressed} if floor is not None else None
-
-    # Extension hook (v3.26 C-26-05) — instance surfaces/annotations join here
-    payload = call_extension_hook({'topic': args.topic, 'purpose': purpose,
-                                   'findings': findings, 'floor_info': floor_info})
-    findings = payload.get('findings', findings)
-    floor_info = payload.get('floor_info', floor_info)
+    # A running daemon answers single-topic queries from memory; no daemon,
+    # a refusal or any transport error = the in-process search below.
+    if not any(getattr(args, flag) for flag in DAEMON_LOCAL_FLAGS):
+        reply = query_daemon(sys.argv[1:])
+        if reply is not None:
+            print(reply['stdout'])
+            return reply.get('exit', 0)
 
-    # JSON output
-    if args.json:
-        output = {
-            'timestamp': datetime.now().isoformat(),
-            'agent_path': str(get_agent_root()),
-            'topic': args.topic,
-            'purpose': purpose,
-            'domain_keywords': domain_keywords,
-            'findings': findings,
-            'total_artifacts': sum(len(v) for v in findings.values() if isinstance(v, list)),
-            'search_contract': {
-                'keywords': prepare_keywords(args.topic),
-                'surfaces_searched': SURFACES_SEARCHED,
-                'surfaces_excluded': SURFACES_EXCLUDED,
-                'surfaces_out_of_universe': SURFACES_OUT_OF_UNIVERSE,
-                'purpose_globs': purpose_globs,
-                'sessions': {'included': args.include_sessions,
-                             'recency_days': args.session_days if args.include_sessions else None,
-                             'date_basis': 'filename date; undated files included'},
-                'instruments_included': args.include_instruments,
-                'relevance_floor': floor,
-                'suppressed_below_floor': suppressed if floor is not None else None
-            }
-        }
-        print(json.dumps(output, indent=2, default=str))
+    config = load_study_topic_config()
+    # --fleet: each root's index is opened by its own worker, never here.
+    runner = fleet_study if args.fleet else study
+    if not args.fleet:
+        open_study_run(args)
+
+    # Batch mode: the corpus walk, config and index are paid for once; each
+    # topic streams out as one JSON line as soon as it is done (--ndjson: its
+    # hit records, then its summary record).
+    emit = emit_record if args.ndjson else None
+    if args.topics_file:
+        try:
+            stream = (contextlib.nullcontext(sys.stdin) if args.topics_file == '-'
+                      else open(args.topics_file))
+        except OSError as e:
+            print(f"Error: --topics-file: {e}", file=sys.stderr)
+            return 1
+        with stream as lines:
+            for request in read_topic_requests(lines):
+                if 'error' in request:
+                    emit_record(dict(request, type='error') if emit else request)
+                    continue
+                output, _ = runner(request['topic'], args, config,
+                                   purpose=request.get('purpose'),
+                                   domain_keywords=request.get('domain_keywords'), emit=emit)
+                if emit is None:
+                    emit_record(output)
         return 0
 
-    # Human-readable output
-    report = generate_report(args.topic, findings, floor_info=floor_info,
-                             purpose=purpose, purpose_globs=purpose_globs)
-    print(report)
-
+    if emit is not None:
+        runner(args.topic, args, config, emit=emit)
+        return 0
+    print(render_study(args, config))
     return 0
 
 
@@ -0,0 +1,1149 @@
+#!/usr/bin/env python3
+"""
+Study Topic Index - persistent inverted index for study_topic.py
+
+Every study used to walk each surface and run one regex per keyword over the
+full text of every file. At fleet size (thousands of session files, large spec
+trees, the canonical ../aget/specs tier) that is a multi-second cold scan per
+query, repeated for every topic. The index keeps, per token, the files that
+contain it and the line of each occurrence, so a query reads postings lists and
+only opens a file to render context for an actual hit.
+
+Token model: a token is a lower-cased \\w-run, which is exactly the unit
+study_topic's keyword rules (prepare_keywords / _token_pattern) operate on:
+  - short keywords (word-boundary + s/es/ed/ing) match a fixed set of whole
+    tokens  -> expand(kw, forms)
+  - long keywords (substring semantics) match any token that contains them
+    -> expand(kw)
+Keywords with internal punctuation ("v3.26", "gh#1850") are not token-shaped;
+study_topic answers those with the regex scan (exact, just not indexed).
+
+Filename tokens are indexed on line -1: they count as matches (the
+filename-index recall fix) but never produce a context line.
+
+Positional postings: next to each token's line list the index keeps, in the
+same order, every occurrence's position (its ordinal among the file's tokens;
+filename tokens are numbered after the body). Quoted-phrase and NEAR/k
+keywords are evaluated against these positions, so a precise query never
+reads a file that merely holds its words far apart.
+
+Incremental refresh: every record carries a manifest entry (size, mtime_ns,
+blake2b content hash). A file is re-tokenized only when it was added or its
+bytes changed; a size/mtime mismatch with an identical hash (a git checkout
+rewrites mtime across the whole tree — the artifact find_sessions already
+guards against) just updates the stat fields. Records whose file is gone are
+pruned. `--reindex` discards the index and rebuilds it.
+
+Line-offset table: each file also has the byte offset of every line start
+stored (array('I'), base64), so rendering a context line for a hit is a seek
+and a one-line read rather than a read-and-split of the whole file.
+
+Vocabulary for term expansion (study_topic --stem / --fuzzy): the index keeps
+every token with its document frequency, persisted, so substring expansion
+and idf never read postings. Stem keys (stemmed variants of a keyword are one
+dict lookup) and a trigram index for typo-tolerant neighbours are built from
+it in memory on first use and kept current: fuzzy candidates sharing a
+trigram and within the length bound are verified with a bounded edit
+distance, so a fuzzy keyword never touches raw text.
+
+Similarity search (study_topic --like PATH): documents are sparse TF-IDF
+vectors read straight off the postings (sublinear tf, smoothed idf). Vector
+norms for the whole corpus are one pass over the postings into an
+array('d'), cached per corpus generation; a query accumulates dot products
+into a second array('d') over the postings of its own terms only.
+
+Corpus statistics for BM25 ranking (study_topic --ranker bm25) live here too:
+each record stores its document length (body tokens) and the index keeps the
+running total, so N, average length and per-term document frequency are read
+off the index rather than recomputed per query.
+
+Corpus generation: a counter bumped on every file added, changed or dropped;
+each record carries the generation of its last change. ResultCache uses it to
+decide which cached study results a change can affect (see its docstring).
+
+Session segments: sessions/ is the largest surface (thousands of files
+fleet-wide) and is searched only through a recency window. Session notes
+whose filename carries a date are kept out of the main file, in one segment
+per month (.aget/index/segments/sessions-YYYY-MM.json, with its own shards
+next to it), listed in the main file's segment manifest. A segment is read
+the first time a file of its month is asked for, so --session-days N opens
+only the months inside the window. Once a month is SEAL_AFTER_MONTHS behind
+the current one its segment is written one final time and sealed. Sealed
+records are trusted without a stat and never re-tokenized; a session filed
+late into a sealed month is still added (--reindex rebuilds everything).
+
+Storage: .aget/index/study_topic.json (git-ignored, rebuildable) is a small
+manifest: file records (stat, hash, length, describe() metadata), counters,
+the segment manifest and the names of its shards. Everything bulky lives in
+shards beside it (.aget/index/study_topic/, and one directory per segment):
+postings and positions split SHARDS ways by token, the forward token lists
+and line-offset tables split by file id, and the vocabulary. Tokens that at
+most RARE_DF of a part's files hold (most of any vocabulary, and most of what
+a substring or fuzzy keyword expands to) share one 'rare' shard instead, so
+an expansion does not fan out over every shard. Shards are read on first use, so a query decodes the manifest plus the postings of its own
+tokens; positions only for a phrase or NEAR keyword, line offsets only for
+the files whose context it renders. A save rewrites only the shards that
+changed, under new names, and commits by replacing the manifest; the files
+the previous manifest named are kept one save longer for readers still on
+it. Fail-soft (ADR-004): an unreadable or version-mismatched index (or one
+whose shards are missing) is rebuilt; an unwritable one lives in memory for
+the run. Results never depend on the index existing.
+
+Usage (library — driven by study_topic.py):
+    index = StudyIndex(default_index_path(root), root, describe=..., filename_text=...)
+    index.refresh(paths, jobs=4)                   # optional: tokenize stale files in parallel
+    rec = index.ensure(path)                       # stat; re-tokenize if stale
+    index.occurrences(rec, index.expand('lesson')) # [(token, [line, ...]), ...]
+    index.save()
+"""
+
+import base64
+import datetime
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import shutil
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+
+INDEX_VERSION = 9
+SHARDS = 64                # per part: postings/positions by token, forward lists/offsets by file id
+RARE_DF = 2                # a part's tokens in at most this many files share its 'rare' shard
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_MAX = 128     # LRU bound on cached study results
+TOKEN_RE = re.compile(r'\w+')
+NEWLINE_RE = re.compile(rb'\r\n|\r|\n')   # universal newlines, as read_text() sees them
+SESSION_DATE_RE = re.compile(r'(\d{4})-(\d{2})-\d{2}')   # as study_topic.session_files
+SEAL_AFTER_MONTHS = 1      # the previous month stays open for late edits
+
+
+# Light suffix stripper for --stem, longest suffix first. Not Porter: it only
+# has to give a word and its inflections/derivations one key, identically for
+# the index vocabulary and the scan path.
+STEM_SUFFIXES = ('ational', 'ization', 'fulness', 'iveness', 'ousness', 'ations',
+                 'ation', 'ments', 'ment', 'ness', 'ings', 'edly', 'ing', 'ers', 'ies',
+                 'ied', 'er', 'ed', 'es', 'ly', 's')
+
+
+def stem(token: str) -> str:
+    """Stem key of a lower-cased token ("releases"/"released"/"releasing" ->
+    "releas"). Short or non-alphabetic tokens ("l004", "v3") are their own key."""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    base = token
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == 's' and token[-2] in 'su':
+                break                       # "class", "status" are not plurals
+            base = token[:-len(suffix)]
+            if suffix in ('ies', 'ied'):
+                base += 'y'
+            elif base[-1] == base[-2] and base[-1] not in 'lsz' and suffix != 'ly':
+                base = base[:-1]            # "planning" -> "plan"
+            break
+    return base[:-1] if len(base) > 3 and base.endswith('e') else base
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """Levenshtein distance of a and b, or bound + 1 as soon as it must
+    exceed `bound` (rows are abandoned once every cell is past it)."""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
+
+
+def trigrams(token: str) -> set:
+    """Padded trigrams: every edit destroys at most three, so a token within
+    edit distance d of a word of length n >= 3d - 1 shares at least one."""
+    padded = f'$${token}$$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def default_index_path(agent_root: Path) -> Path:
+    """Index location under the agent's .aget/ (git-ignored)."""
+    return Path(agent_root) / '.aget' / 'index' / 'study_topic.json'
+
+
+def fleet_index_path(agent_root: Path, sibling_root: Path) -> Path:
+    """Where this agent keeps its index of a --fleet sibling: under its own
+    .aget/index/, keyed by the sibling's path, so a fleet query never writes
+    into another repository's working tree."""
+    sibling = Path(sibling_root).resolve()
+    tag = hashlib.blake2b(str(sibling).encode(), digest_size=6).hexdigest()
+    return Path(agent_root) / '.aget' / 'index' / 'fleet' / f'{sibling.name}-{tag}' / 'study_topic.json'
+
+
+def default_cache_path(agent_root: Path) -> Path:
+    """Result cache location, next to the index."""
+    return Path(agent_root) / '.aget' / 'index' / 'study_topic_results.json'
+
+
+@lru_cache(maxsize=1 << 16)
+def shard_of(token: str) -> int:
+    """Postings shard of a token (stable across processes, unlike hash())."""
+    return zlib.crc32(token.encode()) % SHARDS
+
+
+def segment_of(key: str):
+    """Segment (month, 'YYYY-MM') of an index key: dated session notes only."""
+    parts = key.split('/')
+    if len(parts) == 2 and parts[0] == 'sessions':
+        m = SESSION_DATE_RE.search(parts[1])
+        if m:
+            return '-'.join(m.groups())
+    return None
+
+
+def seal_cutoff(today: datetime.date = None) -> str:
+    """Months before this one ('YYYY-MM') are sealed."""
+    today = today or datetime.date.today()
+    months = today.year * 12 + today.month - 1 - SEAL_AFTER_MONTHS
+    return f'{months // 12:04d}-{months % 12 + 1:02d}'
+
+
+def _write_atomic(path: Path, payload: dict) -> bool:
+    tmp = path.with_suffix('.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(payload, separators=(',', ':')))
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def content_hash(data: bytes) -> str:
+    """Manifest content hash (blake2b, 128-bit — identity, not security)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def stat_stamp(paths, extra=None) -> str:
+    """Corpus stamp for ResultCache: each path's size and mtime_ns (the
+    index's own freshness test) plus `extra` (window membership), hashed.
+    Equal stamps mean no file a study could read has changed."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            digest.update(f'{path}\0-\n'.encode())
+            continue
+        digest.update(f'{path}\0{st.st_size}\0{st.st_mtime_ns}\n'.encode())
+    digest.update(json.dumps(extra, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def decode(data: bytes) -> str:
+    """Decode exactly as Path.read_text() would (locale encoding, universal
+    newlines), so indexed and scanned text never disagree."""
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
+def line_offsets(data: bytes) -> str:
+    """Byte offset of every line start, packed as base64(array('I')).
+    Empty string when an offset would not fit (files over 4 GiB)."""
+    starts = array('I', [0])
+    try:
+        starts.extend(m.end() for m in NEWLINE_RE.finditer(data))
+    except OverflowError:
+        return ''
+    return base64.b64encode(starts.tobytes()).decode('ascii')
+
+
+def tokenize(content: str, extra_text: str = '') -> tuple:
+    """(terms, positions): lower-cased \\w-run token -> list of 0-based line
+    numbers, one entry per occurrence, and token -> the same occurrences'
+    token positions. Tokens from `extra_text` (the filename index) land on
+    line -1 and are numbered after the body."""
+    terms, positions = {}, {}
+    position = 0
+    for lineno, line in chain(enumerate(content.split('\n')), [(-1, extra_text)]):
+        for m in TOKEN_RE.finditer(line):
+            token = m.group(0).lower()
+            terms.setdefault(token, []).append(lineno)
+            positions.setdefault(token, []).append(position)
+            position += 1
+    return terms, positions
+
+
+def analyze(file_path: Path, known_hash: str = None, describe=None, filename_text=None):
+    """Read and tokenize one file — the expensive half of indexing, kept free
+    of index state so StudyIndex.refresh can run it in worker processes.
+
+    Returns (status, stat, payload): status 'gone' (unreadable/undecodable),
+    'same' (content hash equals `known_hash`) or 'new' (payload holds hash,
+    terms, positions, length, line offsets and describe() metadata).
+    """
+    try:
+        st = os.stat(file_path)
+        data = Path(file_path).read_bytes()
+    except OSError:
+        return 'gone', None, None
+    digest = content_hash(data)
+    if digest == known_hash:
+        return 'same', (st.st_size, st.st_mtime_ns), None
+    try:
+        content = decode(data)
+    except UnicodeDecodeError:
+        return 'gone', None, None
+    terms, positions = tokenize(content,
+                                filename_text(Path(file_path)) if filename_text else '')
+    payload = {'hash': digest, 'terms': terms, 'positions': positions,
+               'line_offsets': line_offsets(data),
+               'length': sum(1 for lines in terms.values() for ln in lines if ln >= 0),
+               'meta': describe(content) if describe else {}}
+    return 'new', (st.st_size, st.st_mtime_ns), payload
+
+
+def _analyze_task(task):
+    return analyze(*task)
+
+
+class StudyIndex:
+    """On-disk token -> {file id: [line, ...]} index over study surfaces.
+
+    Files enter the index the first time a finder asks for them (`ensure`) and
+    are re-tokenized only when their content hash changes, so the index always
+    covers exactly the files the finders enumerate. `rebuild=True` ignores the
+    stored index (the --reindex escape hatch).
+
+    The main file and each loaded session segment are the "parts" in memory
+    (None = main, 'YYYY-MM' = a segment); each has its own shards. postings,
+    positions and the vocabulary hold the union of what has been read so far.
+    """
+
+    def __init__(self, path: Path, root: Path, describe=None, filename_text=None,
+                 rebuild: bool = False):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.describe = describe            # content -> per-file metadata dict
+        self.filename_text = filename_text  # Path -> searchable filename text
+        self.stats = {'added': 0, 'changed': 0, 'deleted': 0, 'rehashed_unchanged': 0}
+        self.reads = {'files': 0, 'bytes': 0}   # file reads done for us (study_topic --profile)
+        self._clear()
+        if rebuild:
+            self.dirty = True
+        else:
+            self.load()
+
+    def _clear(self):
+        """Empty in-memory state: a fresh index, or a view about to be re-read."""
+        self.files = {}      # key -> {'id', 'gen', 'size', 'mtime_ns', 'hash', 'length', 'meta'}
+        self.postings = {}   # token -> {file id: [line, ...]}, over the shards read
+        self.positions = {}  # token -> {file id: [position, ...]}, parallel to postings
+        self.vocab = {}      # token -> document frequency, over the parts' vocabularies read
+        self.stems = None    # stem(token) -> [token, ...], built on first --stem query
+        self.segments = {}   # month -> {'files', 'sealed', 'stamp'}: the segment manifest
+        self.next_id = 0
+        self.total_length = 0
+        self.generation = 0
+        self.dirty = False
+        self._expansions = {}
+        self._terms = {}         # file id -> [token, ...]: the forward index (removal, ResultCache)
+        self._offsets = {}       # file id -> base64 line-offset table
+        self._line_tables = {}   # file id -> decoded array('I') of line starts
+        self._trigrams = None    # trigram -> {token}, built on first fuzzy query
+        self._norms = None       # (generation, files, {file id: row}, array('d') of norms)
+        self._loaded = set()         # segments merged into memory this process
+        self._dirty_segments = set()
+        self._shard_files = {}       # part -> {shard name: file name}, as its manifest lists them
+        self._part_vocab = {}        # part -> {token: document frequency}
+        self._read = set()           # (part, shard name) read into memory
+        self._dirty_shards = set()   # (part, shard name) to rewrite on save
+        self._complete = {}          # kind -> tokens / shard numbers read for every part in memory
+        self._lost = False           # a listed shard vanished under us: do not save
+
+    # -- persistence -------------------------------------------------------
+
+    def load(self):
+        """Load the manifest; any failure, version mismatch or missing shard
+        starts empty. Shards are read later, as queries need them."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if (not isinstance(data, dict) or data.get('version') != INDEX_VERSION
+                or not self._shards_present(None, data.get('shards', {}))):
+            self.dirty = True
+            return
+        self.files = data.get('files', {})
+        self.segments = data.get('segments', {})
+        self.next_id = data.get('next_id', 0)
+        self.total_length = data.get('total_length', 0)
+        self.generation = data.get('generation', 0)
+        self._shard_files[None] = data.get('shards', {})
+
+    def part_dir(self, part) -> Path:
+        """Directory of a part's shards: beside the main file or its segment."""
+        if part is None:
+            return self.path.with_suffix('')
+        return self.path.parent / 'segments' / f'sessions-{part}'
+
+    def _shards_present(self, part, shards: dict) -> bool:
+        try:
+            present = set(os.listdir(self.part_dir(part)))
+        except OSError:
+            present = set()
+        return set(shards.values()) <= present
+
+    def segment_path(self, month: str) -> Path:
+        return self.path.parent / 'segments' / f'sessions-{month}.json'
+
+    def _load_segment(self, month: str):
+        """Merge one month's records into memory (once). A missing, unreadable
+        or out-of-step segment (its stamp differs from the manifest's) is
+        dropped from the manifest and its files are re-tokenized on demand."""
+        if month in self._loaded:
+            return
+        self._loaded.add(month)
+        self._complete.clear()          # a new part: its shards are still unread
+        entry = self.segments.get(month)
+        if entry is None:
+            return
+        try:
+            data = json.loads(self.segment_path(month).read_text())
+        except (OSError, ValueError):
+            data = None
+        if (not isinstance(data, dict) or data.get('version') != INDEX_VERSION
+                or data.get('stamp') != entry['stamp']
+                or not self._shards_present(month, data.get('shards', {}))):
+            del self.segments[month]
+            self.dirty = True
+            return
+        for key, rec in data['files'].items():
+            self.files[key] = rec
+            self.total_length += rec.get('length', 0)
+        self._shard_files[month] = data.get('shards', {})
+
+    def _parts(self) -> list:
+        return [None, *sorted(self._loaded)]
+
+    def _load_shard(self, part, name: str):
+        """Read one shard of one part into memory (once). A shard its manifest
+        lists but that cannot be read was replaced under us by other
+        processes' saves: it reads as empty and save() re-reads the index
+        from disk instead of writing this incomplete view."""
+        if (part, name) in self._read:
+            return
+        self._read.add((part, name))
+        if name == 'vocab':
+            vocab = self._part_vocab.setdefault(part, {})
+        file_name = self._shard_files.get(part, {}).get(name)
+        if file_name is None:
+            return
+        try:
+            data = json.loads((self.part_dir(part) / file_name).read_text())
+        except (OSError, ValueError):
+            self._lost = True
+            return
+        kind = name.split('-')[0]
+        if kind in ('postings', 'positions'):
+            table = self.postings if kind == 'postings' else self.positions
+            for token, plist in data.items():
+                table.setdefault(token, {}).update(plist)
+        elif kind == 'rare':
+            for token, (lines, positions) in data.items():
+                self.postings.setdefault(token, {}).update(lines)
+                self.positions.setdefault(token, {}).update(positions)
+        elif kind == 'terms':
+            self._terms.update(data)
+        elif kind == 'offsets':
+            self._offsets.update(data)
+        else:
+            vocab.update(data)
+            for token, df in data.items():
+                if token in self.vocab:
+                    self.vocab[token] += df
+                else:
+                    self._count(token, df)
+
+    @staticmethod
+    def _home(kind: str, token: str, df: int) -> str:
+        """The shard holding a token's `kind` lists in a part where `df`
+        files hold it: rare tokens (most of a vocabulary, and most of what a
+        substring or fuzzy keyword expands to) share one small shard."""
+        return 'rare' if df <= RARE_DF else f'{kind}-{shard_of(token):02d}'
+
+    def _want(self, kind: str, tokens):
+        """Read the shards holding these tokens' `kind` lists (postings or
+        positions), in every part in memory that has them."""
+        done = self._complete.setdefault(kind, set())
+        if done.issuperset(tokens):
+            return
+        self._vocabulary()
+        for token in tokens:
+            if token not in done:
+                done.add(token)
+                for part in self._parts():
+                    df = self._part_vocab[part].get(token)
+                    if df is not None:
+                        self._load_shard(part, self._home(kind, token, df))
+
+    def _want_file(self, kind: str, fid: str):
+        """Read the `kind` shard (terms or offsets) that holds one file id."""
+        n = int(fid) % SHARDS
+        done = self._complete.setdefault(kind, set())
+        if n not in done:
+            done.add(n)
+            for part in self._parts():
+                self._load_shard(part, f'{kind}-{n:02d}')
+
+    def _edit(self, part, name: str):
+        """Read a shard about to change and mark it for the next save."""
+        self._load_shard(part, name)
+        self._dirty_shards.add((part, name))
+
+    def _edit_tokens(self, part, tokens, delta: int):
+        """Read and mark the shards of these tokens before each one's document
+        frequency in `part` moves by `delta` (it may cross into or out of the
+        rare shard). Call before changing their lists."""
+        vocab = self._part_vocab[part]
+        names = set()
+        for token in tokens:
+            df = vocab.get(token, 0)
+            low, high = sorted((df, df + delta))
+            if 0 < low <= RARE_DF or 0 < high <= RARE_DF:
+                names.add('rare')
+            if high > RARE_DF:
+                n = shard_of(token)
+                names.update((f'postings-{n:02d}', f'positions-{n:02d}'))
+        for name in names:
+            self._edit(part, name)
+
+    def _vocabulary(self) -> dict:
+        """The vocabulary of every part in memory (token -> document frequency)."""
+        if 'vocab' not in self._complete:
+            self._complete['vocab'] = set()
+            for part in self._parts():
+                self._load_shard(part, 'vocab')
+        return self.vocab
+
+    def _touch(self, key: str):
+        """Mark the part of the index holding `key` as needing a write."""
+        self.dirty = True
+        month = segment_of(key)
+        if month is not None:
+            if month not in self._loaded:
+                self._loaded.add(month)
+                self._complete.clear()
+            self._dirty_segments.add(month)
+
+    def segment_info(self) -> dict:
+        """Segment manifest summary for study_topic's search_contract."""
+        return {'segments': len(self.segments),
+                'sealed': sum(1 for e in self.segments.values() if e['sealed']),
+                'loaded': sorted(m for m in self._loaded if m in self.segments)}
+
+    def save(self):
+        """Write the index if it changed. Unwritable = in-memory only.
+
+        Only changed shards are written, under fresh names; dated session
+        records go to their month's segment (only segments that changed, or
+        are being sealed, are written); the main file, written last, carries
+        the segment manifest and commits the save.
+        """
+        if self._lost:
+            self._clear()
+            self.load()
+            return False
+        if not self.dirty:
+            return False
+        cutoff = seal_cutoff()
+        for month in self._loaded:
+            entry = self.segments.get(month)
+            if entry is not None and not entry['sealed'] and month < cutoff:
+                self._dirty_segments.add(month)
+        owner = {rec['id']: segment_of(key) for key, rec in self.files.items()}
+        contents = {slot: {} for slot in self._dirty_shards}
+        for side, (kind, table) in enumerate((('postings', self.postings),
+                                              ('positions', self.positions))):
+            for token, plist in table.items():
+                name = f'{kind}-{shard_of(token):02d}'
+                for fid, value in plist.items():
+                    part = owner[fid]
+                    if self._part_vocab[part].get(token, 0) <= RARE_DF:
+                        shard = contents.get((part, 'rare'))
+                        if shard is not None:
+                            shard.setdefault(token, [{}, {}])[side][fid] = value
+                    else:
+                        shard = contents.get((part, name))
+                        if shard is not None:
+                            shard.setdefault(token, {})[fid] = value
+        for kind, table in (('terms', self._terms), ('offsets', self._offsets)):
+            for fid, value in table.items():
+                shard = contents.get((owner[fid], f'{kind}-{int(fid) % SHARDS:02d}'))
+                if shard is not None:
+                    shard[fid] = value
+        for part, vocab in self._part_vocab.items():
+            if (part, 'vocab') in contents:
+                contents[(part, 'vocab')] = vocab
+        written = {None, *self._dirty_segments, *(part for part, _ in contents)}
+        previous = {part: dict(self._shard_files.get(part, {})) for part in written}
+        stamp = os.urandom(4).hex()
+        for (part, name), data in contents.items():
+            listed = self._shard_files.setdefault(part, {})
+            if not data:
+                listed.pop(name, None)
+                continue
+            file_name = f'{name}.{stamp}.json'
+            if not _write_atomic(self.part_dir(part) / file_name, data):
+                return False
+            listed[name] = file_name
+        records = {month: {} for month in [None, *self._dirty_segments]}
+        for key, rec in self.files.items():
+            part = records.get(segment_of(key))
+            if part is not None:
+                part[key] = rec
+        for month in self._dirty_segments:
+            if not records[month]:
+                self.segments.pop(month, None)
+                self.segment_path(month).unlink(missing_ok=True)
+                self._shard_files.pop(month, None)
+                continue
+            entry = {'files': len(records[month]), 'sealed': month < cutoff,
+                     'stamp': self.generation}
+            if not _write_atomic(self.segment_path(month),
+                                 {'version': INDEX_VERSION, 'month': month,
+                                  'stamp': entry['stamp'], 'files': records[month],
+                                  'shards': self._shard_files.get(month, {})}):
+                return False
+            self.segments[month] = entry
+        payload = {'version': INDEX_VERSION, 'next_id': self.next_id,
+                   'total_length': sum(rec.get('length', 0) for rec in records[None].values()),
+                   'generation': self.generation, 'segments': self.segments,
+                   'files': records[None], 'shards': self._shard_files.get(None, {})}
+        if not _write_atomic(self.path, payload):
+            return False
+        # Shards neither manifest names (superseded, or left by --reindex).
+        for part in written:
+            keep = {*self._shard_files.get(part, {}).values(), *previous[part].values()}
+            directory = self.part_dir(part)
+            for stray in (directory.iterdir() if directory.is_dir() else ()):
+                if stray.name not in keep:
+                    stray.unlink(missing_ok=True)
+        # Segments no manifest lists (left by --reindex or a lost main file).
+        for stray in self.path.parent.glob('segments/sessions-*'):
+            if stray.name[len('sessions-'):][:7] not in self.segments:
+                if stray.is_dir():
+                    shutil.rmtree(stray, ignore_errors=True)
+                else:
+                    stray.unlink(missing_ok=True)
+        self._dirty_shards.clear()
+        self._dirty_segments.clear()
+        self.dirty = False
+        return True
+
+    # -- maintenance -------------------------------------------------------
+
+    def key(self, file_path: Path) -> str:
+        """Root-relative key; files outside the root (canonical tier) stay absolute."""
+        try:
+            return str(Path(file_path).relative_to(self.root))
+        except ValueError:
+            return str(file_path)
+
+    def ensure(self, file_path: Path):
+        """Return the up-to-date record for a file, (re)indexing it if needed.
+
+        Returns None when the file cannot be read or decoded — the same files
+        the scan path skips.
+        """
+        file_path = Path(file_path)
+        key = self.key(file_path)
+        rec = self._record(key)
+        if self._is_fresh(file_path, key, rec):
+            return rec
+        return self._apply(key, analyze(file_path, rec and rec['hash'],
+                                        self.describe, self.filename_text))
+
+    def refresh(self, paths, jobs: int = 1):
+        """Bring every given file up to date, tokenizing stale ones across
+        `jobs` worker processes. Afterwards ensure() on these paths is a stat
+        check. Postings are merged here, in `paths` order, so file ids — and
+        the index written to disk — do not depend on worker scheduling."""
+        stale = []
+        for file_path in paths:
+            key = self.key(file_path)
+            rec = self._record(key)
+            if not self._is_fresh(file_path, key, rec):
+                stale.append((key, (file_path, rec and rec['hash'],
+                                    self.describe, self.filename_text)))
+        if not stale:
+            return
+        tasks = [task for _, task in stale]
+        if jobs > 1 and len(stale) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    outcomes = list(pool.map(_analyze_task, tasks,
+                                             chunksize=max(1, len(tasks) // (jobs * 4))))
+            except (OSError, RuntimeError):  # no process support here: serial (ADR-004)
+                outcomes = [_analyze_task(task) for task in tasks]
+        else:
+            outcomes = [_analyze_task(task) for task in tasks]
+        for (key, _), outcome in zip(stale, outcomes):
+            self._apply(key, outcome)
+
+    def fresh_record(self, file_path: Path):
+        """The file's record if its manifest still matches the disk, else None
+        (never re-indexes — for readers that must not trigger work)."""
+        key = self.key(file_path)
+        rec = self._record(key)
+        return rec if self._is_fresh(file_path, key, rec) else None
+
+    def _record(self, key: str):
+        """The record for `key`, merging its month's segment first if needed."""
+        month = segment_of(key)
+        if month is not None:
+            self._load_segment(month)
+        return self.files.get(key)
+
+    def _is_fresh(self, file_path, key, rec) -> bool:
+        if not rec:
+            return False
+        month = segment_of(key)
+        if month is not None and self.segments.get(month, {}).get('sealed'):
+            return True      # compacted: trusted as written, never re-tokenized
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        return rec['size'] == st.st_size and rec['mtime_ns'] == st.st_mtime_ns
+
+    def _apply(self, key, outcome):
+        status, stat, payload = outcome
+        if status == 'gone':
+            self._drop(key)
+            return None
+        self.reads['files'] += 1
+        self.reads['bytes'] += stat[0]
+        rec = self.files[key] if status == 'same' else self._add(key, payload)
+        if status == 'same':
+            # Stat drift only (checkout, touch): keep postings, refresh manifest.
+            self.stats['rehashed_unchanged'] += 1
+        rec['size'], rec['mtime_ns'] = stat
+        self._touch(key)
+        return rec
+
+    def prune(self):
+        """Drop records whose file no longer exists (deleted or renamed)."""
+        for key in [k for k in self.files if not (self.root / k).exists()]:
+            self._drop(key)
+
+    def _drop(self, key):
+        if key in self.files:
+            self._remove(key)
+            self.generation += 1
+            self.stats['deleted'] += 1
+
+    def _add(self, key, payload):
+        old = self.files.get(key)
+        fid = old['id'] if old else str(self.next_id)
+        if old:
+            self._remove(key)
+            self.stats['changed'] += 1
+        else:
+            self.next_id += 1
+            self.stats['added'] += 1
+        part = segment_of(key)
+        self._edit(part, 'vocab')
+        vocab = self._part_vocab[part]
+        terms, positions = payload['terms'], payload['positions']
+        self._edit_tokens(part, terms, 1)
+        for token, lines in terms.items():
+            self.postings.setdefault(token, {})[fid] = lines
+            self.positions.setdefault(token, {})[fid] = positions[token]
+            vocab[token] = vocab.get(token, 0) + 1
+            self._count(token, 1)
+        n = int(fid) % SHARDS
+        self._edit(part, f'terms-{n:02d}')
+        self._edit(part, f'offsets-{n:02d}')
+        self._terms[fid] = list(terms)
+        self._offsets[fid] = payload['line_offsets']
+        length = payload['length']
+        self.generation += 1
+        rec = {'id': fid, 'gen': self.generation, 'size': 0, 'mtime_ns': 0, 'hash': payload['hash'],
+               'length': length, 'meta': payload['meta']}
+        self.files[key] = rec
+        self.total_length += length
+        self._touch(key)
+        return rec
+
+    def _remove(self, key):
+        rec = self.files.pop(key, None)
+        if rec is None:
+            return
+        fid = rec['id']
+        part = segment_of(key)
+        self.total_length -= rec.get('length', 0)
+        self._line_tables.pop(fid, None)
+        n = int(fid) % SHARDS
+        self._edit(part, f'terms-{n:02d}')
+        self._edit(part, f'offsets-{n:02d}')
+        self._offsets.pop(fid, None)
+        self._edit(part, 'vocab')
+        vocab = self._part_vocab[part]
+        terms = self._terms.pop(fid, ())
+        self._edit_tokens(part, terms, -1)
+        for token in terms:
+            for table in (self.postings, self.positions):
+                plist = table.get(token)
+                if plist is not None:
+                    plist.pop(fid, None)
+                    if not plist:
+                        del table[token]
+            if vocab.get(token, 0) > 1:
+                vocab[token] -= 1
+            else:
+                vocab.pop(token, None)
+            self._count(token, -1)
+        self._touch(key)
+
+    # -- query -------------------------------------------------------------
+
+    def expand(self, kw: str, forms=None) -> dict:
+        """Vocabulary tokens a keyword matches: the tokens in `forms` (exact
+        whole-token semantics) or, when `forms` is None, every token that
+        contains `kw` (substring semantics). Cached per query term and kept
+        current as new tokens arrive."""
+        vocab = self._vocabulary()
+        kw = kw.lower()
+        forms = frozenset(forms) if forms is not None else None
+        cache_key = (kw, forms)
+        if cache_key not in self._expansions:
+            self._expansions[cache_key] = {t: None for t in vocab
+                                           if self._term_matches(kw, forms, t)}
+        return self._expansions[cache_key]
+
+    @staticmethod
+    def _term_matches(kw, forms, token):
+        return token in forms if forms is not None else kw in token
+
+    def _count(self, token, delta):
+        """Move a token's document frequency; it enters or leaves the
+        vocabulary (and every expansion built from it) at zero."""
+        df = self.vocab.get(token, 0) + delta
+        if df <= 0:
+            if self.vocab.pop(token, None) is not None:
+                self._forget_token(token)
+        elif token in self.vocab:
+            self.vocab[token] = df
+        else:
+            self.vocab[token] = df
+            self._note_new_token(token)
+
+    def _note_new_token(self, token):
+        for (kw, forms), tokens in self._expansions.items():
+            if self._term_matches(kw, forms, token):
+                tokens[token] = None
+        if self.stems is not None:
+            self.stems.setdefault(stem(token), []).append(token)
+        if self._trigrams is not None:
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(token)
+
+    def _forget_token(self, token):
+        for tokens in self._expansions.values():
+            tokens.pop(token, None)
+        if self.stems is not None:
+            key = stem(token)
+            variants = self.stems.get(key, [])
+            if token in variants:
+                variants.remove(token)
+                if not variants:
+                    del self.stems[key]
+        if self._trigrams is not None:
+            for gram in trigrams(token):
+                self._trigrams.get(gram, set()).discard(token)
+
+    def stem_variants(self, word: str) -> list:
+        """Vocabulary tokens sharing `word`'s stem key."""
+        vocab = self._vocabulary()
+        if self.stems is None:
+            self.stems = {}
+            for token in vocab:
+                self.stems.setdefault(stem(token), []).append(token)
+        return self.stems.get(stem(word.lower()), [])
+
+    def fuzzy_neighbours(self, word: str, max_distance: int) -> list:
+        """Vocabulary tokens within `max_distance` edits of `word`: trigram
+        candidates, length-filtered, then verified by bounded edit distance."""
+        vocab = self._vocabulary()
+        word = word.lower()
+        if max_distance <= 0:
+            return [word] if word in vocab else []
+        if self._trigrams is None:
+            self._trigrams = {}
+            for token in vocab:
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+        if len(word) >= 3 * max_distance - 1:
+            candidates = set()
+            for gram in trigrams(word):
+                candidates.update(self._trigrams.get(gram, ()))
+        else:
+            candidates = vocab
+        return sorted(t for t in candidates if abs(len(t) - len(word)) <= max_distance
+                      and edit_distance(t, word, max_distance) <= max_distance)
+
+    def occurrences(self, rec: dict, tokens) -> list:
+        """[(token, [line, ...])] for the given tokens within one file record."""
+        self._want('postings', tokens)
+        fid = rec['id']
+        out = []
+        for token in tokens:
+            lines = self.postings.get(token, {}).get(fid)
+            if lines:
+                out.append((token, lines))
+        return out
+
+    def positions_of(self, rec: dict, tokens) -> dict:
+        """{position: line} of every occurrence of the given tokens in one
+        file (line -1 = filename) — the input to phrase/NEAR matching."""
+        self._want('postings', tokens)
+        self._want('positions', tokens)
+        fid = rec['id']
+        out = {}
+        for token in tokens:
+            positions = self.positions.get(token, {}).get(fid)
+            if positions:
+                out.update(zip(positions, self.postings[token][fid]))
+        return out
+
+    def terms_of(self, rec: dict) -> list:
+        """Every token one file holds (its forward index entry)."""
+        self._want_file('terms', rec['id'])
+        return self._terms.get(rec['id'], [])
+
+    def doc_ids(self, tokens) -> set:
+        """Ids of the files holding any of the given tokens."""
+        self._want('postings', tokens)
+        ids = set()
+        for token in tokens:
+            ids.update(self.postings.get(token, ()))
+        return ids
+
+    def all_ids(self) -> set:
+        return {rec['id'] for rec in self.files.values()}
+
+    def changed_since(self, generation: int) -> list:
+        """[(key, record)] for files added or re-tokenized after `generation`."""
+        return [(key, rec) for key, rec in self.files.items() if rec.get('gen', 0) > generation]
+
+    def corpus_stats(self) -> dict:
+        """BM25 corpus statistics: document count and average body length."""
+        n = len(self.files)
+        return {'docs': n, 'avg_length': (self.total_length / n) if n else 0.0}
+
+    def idf(self, token: str) -> float:
+        """Smoothed TF-IDF idf: never zero, so a term in every file still counts."""
+        n = len(self.files)
+        return math.log((1 + n) / (1 + self._vocabulary().get(token, 0))) + 1
+
+    def _vector_norms(self):
+        """({file id: row}, array('d') of TF-IDF vector norms), recomputed
+        only when the corpus moved (a change, or a session segment merged):
+        idf shifts with either."""
+        if self._norms is None or self._norms[:2] != (self.generation, len(self.files)):
+            self._want('postings', list(self._vocabulary()))
+            rows = {rec['id']: i for i, rec in enumerate(self.files.values())}
+            squares = array('d', bytes(8 * len(rows)))
+            for token, plist in self.postings.items():
+                idf = self.idf(token)
+                for fid, lines in plist.items():
+                    squares[rows[fid]] += ((1 + math.log(len(lines))) * idf) ** 2
+            self._norms = (self.generation, len(self.files), rows,
+                           array('d', (math.sqrt(x) for x in squares)))
+        return self._norms[2], self._norms[3]
+
+    def similar(self, query_tf: dict, exclude: str = None, context_limit: int = 3) -> dict:
+        """Cosine similarity of a term-frequency vector to every indexed file.
+
+        Returns {key: (cosine, shared terms, context lines)} for files sharing
+        at least one term; context lines are the first body line of each of
+        the `context_limit` terms contributing most to the file's score.
+        """
+        rows, norms = self._vector_norms()
+        weights = {t: (1 + math.log(tf)) * self.idf(t) for t, tf in query_tf.items() if tf}
+        query_norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not query_norm:
+            return {}
+        dots = array('d', bytes(8 * len(rows)))
+        shared = array('I', bytes(4 * len(rows)))
+        best = {}                 # row -> [(contribution, first body line)]
+        for token, weight in weights.items():
+            idf = self.idf(token)
+            for fid, lines in self.postings.get(token, {}).items():
+                row = rows[fid]
+                contribution = weight * (1 + math.log(len(lines))) * idf
+                dots[row] += contribution
+                shared[row] += 1
+                body = [ln for ln in lines if ln >= 0]
+                if body:
+                    best.setdefault(row, []).append((contribution, body[0]))
+        out = {}
+        for key, rec in self.files.items():
+            row = rows[rec['id']]
+            if not dots[row] or key == exclude or not norms[row]:
+                continue
+            lines = []
+            for _, line in sorted(best.get(row, ()), reverse=True):
+                if line not in lines:
+                    lines.append(line)
+                if len(lines) >= context_limit:
+                    break
+            out[key] = (dots[row] / (norms[row] * query_norm), shared[row], sorted(lines))
+        return out
+
+    def read_lines(self, file_path: Path, rec: dict, line_numbers: list) -> list:
+        """Text of the given 0-based lines, read by seeking to their stored
+        byte offsets — the rest of the file is never read. Lines past the
+        end read as ''. Falls back to a full read if no table is stored."""
+        starts = self._line_tables.get(rec['id'])
+        if starts is None:
+            self._want_file('offsets', rec['id'])
+            table = self._offsets.get(rec['id'])
+            if not table:
+                self.reads['files'] += 1
+                self.reads['bytes'] += rec['size']
+                lines = Path(file_path).read_text().split('\n')
+                return [lines[n] if n < len(lines) else '' for n in line_numbers]
+            starts = array('I')
+            starts.frombytes(base64.b64decode(table))
+            self._line_tables[rec['id']] = starts
+        out = []
+        with open(file_path, 'rb') as f:
+            for n in line_numbers:
+                if n >= len(starts):
+                    out.append('')
+                    continue
+                f.seek(starts[n])
+                raw = (f.read(starts[n + 1] - starts[n]) if n + 1 < len(starts)
+                       else f.read())
+                self.reads['bytes'] += len(raw)
+                out.append(decode(raw).rstrip('\n'))
+        self.reads['files'] += 1
+        return out
+
+
+class ResultCache:
+    """On-disk LRU of finished study results, validated against the index.
+
+    An entry records a stat_stamp of the corpus it was computed against: while
+    that still matches, recall() answers without reading the index at all.
+    It also records the corpus generation, the files that matched, and the
+    membership of time-windowed surfaces (inbox recency, session dates), so
+    once the stamp moves a lookup re-validates instead of expiring wholesale:
+      - a matched file deleted or changed since        -> stale
+      - any other changed file holding a query term    -> stale (may now match)
+      - a windowed file that entered or left its window -> same two rules
+    Anything else cannot change this query's findings, so the entry survives
+    and is re-stamped with the current generation and stamp. `exact_generation` is for
+    rankers whose scores read corpus-wide statistics (BM25): any change at
+    all is then stale.
+    """
+
+    def __init__(self, path: Path, max_entries: int = RESULT_CACHE_MAX):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.entries = {}    # key -> entry, least recently used first
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == RESULT_CACHE_VERSION:
+            self.entries = data.get('entries', {})
+
+    def save(self) -> bool:
+        if not self.dirty:
+            return False
+        if not _write_atomic(self.path, {'version': RESULT_CACHE_VERSION,
+                                         'entries': self.entries}):
+            return False
+        self.dirty = False
+        return True
+
+    def recall(self, key: str, stamp: str, generation: int = None):
+        """The cached payload for `key` if the corpus stamp is unchanged since
+        it was stored or last validated (and, when given, so is the index
+        generation), else None. Reads no postings: the index may still be
+        unrefreshed, so a None here is a "don't know" for lookup()."""
+        entry = self.entries.get(key)
+        if entry is None or entry.get('stamp') != stamp or (
+                generation is not None and entry['generation'] != generation):
+            return None
+        if next(reversed(self.entries)) != key:        # already most recent: nothing to write
+            self.entries[key] = self.entries.pop(key)
+            self.dirty = True
+        return entry['payload']
+
+    def lookup(self, key: str, index: StudyIndex, probe_terms, windows: dict = None,
+               exact_generation: bool = False, stamp: str = None):
+        """The cached payload for `key` if still valid for the (refreshed)
+        index's corpus, else None (a stale entry is dropped). `probe_terms`
+        is a callable: the query's terms are only expanded if some changed
+        file has to be checked against them."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if not self._valid(entry, index, probe_terms, windows or {}, exact_generation):
+            del self.entries[key]
+            self.dirty = True
+            return None
+        entry['generation'] = index.generation
+        entry['stamp'] = stamp
+        self.entries[key] = self.entries.pop(key)      # most recently used
+        self.dirty = True
+        return entry['payload']
+
+    @staticmethod
+    def _valid(entry, index, probe_terms, windows, exact_generation) -> bool:
+        if exact_generation and entry['generation'] != index.generation:
+            return False
+        matched = set(entry['files'])
+        if any(key not in index.files for key in matched):
+            return False
+        probe = []
+
+        def affects(key):
+            rec = index.files.get(key)
+            if key in matched:
+                return True
+            if rec is None:
+                return False
+            if not probe:
+                probe.append(probe_terms())
+            return not probe[0].isdisjoint(index.terms_of(rec))
+
+        if any(affects(key) for key, _ in index.changed_since(entry['generation'])):
+            return False
+        for name, members in windows.items():
+            if any(affects(key) for key in set(members) ^ set(entry['windows'].get(name, ()))):
+                return False
+        return True
+
+    def put(self, key: str, payload: dict, generation: int, files, windows: dict = None,
+            stamp: str = None):
+        self.entries.pop(key, None)
+        self.entries[key] = {'generation': generation, 'stamp': stamp,
+                             'files': sorted(set(files)), 'windows': windows or {},
+                             'payload': payload}
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self.dirty = True
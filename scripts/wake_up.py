@@ -40,12 +40,24 @@ import argparse
 import importlib.util
 import json
 import os
+import signal
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+try:
+    import extension_hooks as _hooks  # noqa: E402  (shared hook loader)
+except ImportError:  # loader not deployed — hooks exec'd in-process, untimed (ADR-004)
+    _hooks = None
+try:
+    import repo_state as _repo  # noqa: E402  (shared git status collector)
+except ImportError:  # collector not deployed — per-script git calls (ADR-004)
+    _repo = None
 
 
 # =============================================================================
@@ -76,6 +88,11 @@ DEFAULT_CONFIG = {
     'show_pending_work': True,  # gh#1285: surface prior session-note Pending Work
     'show_release_currency': True,  # gh#1833: release-currency signal (v3.26, C-26-01)
     'release_currency_timeout': 5,  # seconds; fail-soft budget for the network check
+    'release_currency_ttl': 21600,  # seconds the cached latest release is fresh; 0 = no cache
+    # Seconds for all collectors together; 0 = no deadline. Above the slowest
+    # collector's own bound (validator 15 s, gh 2 x release_currency_timeout),
+    # so the deadline only cuts off a collector that would have failed anyway.
+    'wake_deadline': 16,
 }
 
 
@@ -119,20 +136,22 @@ def get_git_status(agent_path: Path) -> Dict[str, Any]:
     than glossing "(dirty)" and later asserting "nothing changed" without
     having established a baseline. (Reconcile-dirty-tree-at-boot; promotes a
     one-off session critique into the script per L467 single-channel gap.)
+
+    One `git status --porcelain=v2 --branch` via repo_state.py, which also
+    yields the upstream and ahead/behind counts.
     """
+    if _repo is not None:
+        state = _repo.repo_state(agent_path, run=run_child)
+        return {'branch': state['branch'], 'clean': state['clean'],
+                'changes': list(state['changes']), 'upstream': state['upstream'],
+                'ahead': state['ahead'], 'behind': state['behind']}
     try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-            capture_output=True, text=True, timeout=5,
-            cwd=str(agent_path),
-        )
+        result = run_child(['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+                           timeout=5, cwd=str(agent_path))
         branch = result.stdout.strip() if result.returncode == 0 else 'unknown'
 
-        result2 = subprocess.run(
-            ['git', 'status', '--porcelain'],
-            capture_output=True, text=True, timeout=5,
-            cwd=str(agent_path),
-        )
+        result2 = run_child(['git', 'status', '--porcelain'], timeout=5,
+                            cwd=str(agent_path))
         if result2.returncode == 0:
             changes = [ln for ln in result2.stdout.splitlines() if ln.strip()]
             clean = len(changes) == 0
@@ -176,40 +195,109 @@ def get_calendar_context(config: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def get_release_currency(own_version: str, timeout: int = 5) -> Dict[str, Any]:
+def fetch_latest_release(timeout: int = 5) -> str:
+    """Latest public framework release tag without the 'v' ('' on failure)."""
+    # gh api (plain REST) — NOT `gh release view`: the latter blocks
+    # indefinitely under a non-tty python subprocess in field testing
+    # (F-REL326-G1-1, 2026-07-10), which silently defeats the signal
+    # behind the fail-soft timeout. `gh api` returns in <1s.
+    cmd = ["gh", "api", "repos/aget-framework/aget/releases/latest",
+           "-q", ".tag_name"]
+    latest = ""
+    try:
+        for _attempt in range(2):  # single bounded retry — transient blips
+            proc = run_child(cmd, timeout=timeout)
+            if proc.returncode == 0:
+                latest = proc.stdout.strip().lstrip("v")
+                if latest:
+                    break
+    except Exception:
+        pass
+    return latest
+
+
+def release_cache_path() -> Path:
+    """Latest-release cache, shared by every agent of this user."""
+    root = (_hooks.cache_dir() if _hooks is not None else
+            Path(os.environ.get('AGET_CACHE_DIR') or Path.home() / '.aget' / 'cache'))
+    return root / 'release_currency.json'
+
+
+def write_release_cache(cache: Dict[str, Any]) -> None:
+    """Atomic write; fail-soft (an unwritable cache just means live fetches)."""
+    path = release_cache_path()
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(cache))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def refresh_release_cache(timeout: int = 5) -> str:
+    """Fetch the latest release and store it (the background revalidation)."""
+    latest = fetch_latest_release(timeout)
+    if latest:
+        write_release_cache({'latest': latest, 'fetched_at': time.time()})
+    return latest
+
+
+def _revalidate_in_background(cache: Dict[str, Any], timeout: int) -> None:
+    """Start a detached `wake_up.py --refresh-release-currency` unless one was
+    started recently, so this wake returns now and the next one reads fresh."""
+    now = time.time()
+    if now - cache.get('refreshing_since', 0) < 2 * timeout + 5:
+        return
+    write_release_cache(dict(cache, refreshing_since=now))
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()),
+             '--refresh-release-currency', str(timeout)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        pass
+
+
+def get_release_currency(own_version: str, timeout: int = 5,
+                         ttl: int = DEFAULT_CONFIG['release_currency_ttl']) -> Dict[str, Any]:
     """Release-currency signal (gh#1833, v3.26 C-26-01; L467 Channel-5).
 
     Compares local aget_version against the latest public framework release
     tag so target-misresolution (agent plans against N-1 because no currency
     signal reached its field of view) is caught at session start.
 
+    The latest tag changes about weekly, so it is cached for `ttl` seconds in
+    ~/.aget/cache/release_currency.json (0 = always fetch). 'source' says
+    where the answer came from: 'cache' (fresh), 'stale' (expired; a
+    background refresh was started and this wake does not wait for it) or
+    'live' (no usable cache, fetched now). A wake that gives up on this
+    collector at its deadline reports 'timeout' (COLLECTOR_FALLBACKS).
+
     Fail-soft (ADR-004): any failure — no gh, offline, timeout, auth — returns
     status 'unknown' and MUST NOT block or slow wake-up beyond the timeout.
     Reference implementation: main-supervisor _release_banner (accepted at
     source, natural A/B evidence per #1833 p1 grant).
     """
-    result: Dict[str, Any] = {'status': 'unknown', 'latest': None}
-    try:
-        # gh api (plain REST) — NOT `gh release view`: the latter blocks
-        # indefinitely under a non-tty python subprocess in field testing
-        # (F-REL326-G1-1, 2026-07-10), which silently defeats the signal
-        # behind the fail-soft timeout. `gh api` returns in <1s.
-        cmd = ["gh", "api", "repos/aget-framework/aget/releases/latest",
-               "-q", ".tag_name"]
-        latest = ""
-        for _attempt in range(2):  # single bounded retry — transient blips
-            proc = subprocess.run(cmd, capture_output=True, text=True,
-                                  timeout=timeout, stdin=subprocess.DEVNULL)
-            if proc.returncode == 0:
-                latest = proc.stdout.strip().lstrip("v")
-                if latest:
-                    break
-        if latest:
-            result['latest'] = latest
-            result['status'] = ('current' if latest == own_version
-                                else 'behind')
-    except Exception:
-        pass
+    latest, source = '', 'live'
+    if ttl > 0:
+        cache = load_json_file(release_cache_path(), {})
+        if isinstance(cache, dict) and cache.get('latest'):
+            latest = cache['latest']
+            if time.time() - cache.get('fetched_at', 0) < ttl:
+                source = 'cache'
+            else:
+                source = 'stale'
+                _revalidate_in_background(cache, timeout)
+    if not latest:
+        latest = refresh_release_cache(timeout) if ttl > 0 else fetch_latest_release(timeout)
+
+    result: Dict[str, Any] = {'status': 'unknown', 'latest': None, 'source': source}
+    if latest:
+        result['latest'] = latest
+        result['status'] = ('current' if latest == own_version
+                            else 'behind')
     return result
 
 
@@ -338,8 +426,152 @@ def get_pending_work(agent_path: Path, max_items: int = 10) -> Dict[str, Any]:
     return result
 
 
+def get_reliance_attestation(agent_path: Path, validator: Path) -> Dict[str, Any]:
+    """Run the reliance-manifest validator; summary is its last output line."""
+    try:
+        r = run_child([sys.executable, str(validator)], timeout=15,
+                      cwd=str(agent_path))
+        tail = (r.stdout or r.stderr).strip().splitlines()
+        return {
+            'ok': r.returncode == 0,
+            'summary': tail[-1] if tail else f'exit {r.returncode}',
+        }
+    except Exception as e:
+        return {'ok': False, 'summary': f'validator error: {e}'}
+
+
+# What a collector reports when it misses the wake deadline: the same shape
+# as its own fail-soft result (ADR-004), so output code needs no late case.
+COLLECTOR_FALLBACKS = {
+    'git': lambda: {'branch': 'unknown', 'clean': None, 'changes': []},
+    'pending_work': lambda: {'source': None, 'items': [], 'truncated': False},
+    # 'timeout', not 'live': nothing was fetched, so consumers can tell a
+    # deadline miss from a real answer.
+    'release_currency': lambda: {'status': 'unknown', 'latest': None, 'source': 'timeout'},
+    # ok None = not yet known; a validator still running has not failed.
+    'reliance_attestation': lambda: {
+        'ok': None, 'summary': 'validator still running at wake deadline'},
+}
+
+
+# Child processes of running collectors, and the collector threads that
+# missed the deadline. A late collector is abandoned on its daemon thread;
+# run_collectors kills its children and run_child refuses it new ones (a
+# killed `gh` would otherwise be retried), so nothing is orphaned when the
+# interpreter exits.
+_CHILDREN: Dict[subprocess.Popen, threading.Thread] = {}
+_ABANDONED: Set[threading.Thread] = set()
+_CHILDREN_LOCK = threading.Lock()
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    """Kill a run_child() child and whatever it started (`gh` and the
+    validator may spawn their own helpers)."""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def run_child(cmd: List[str], timeout: float, **kwargs: Any) -> subprocess.CompletedProcess:
+    """subprocess.run(capture_output=True, text=True) for collectors: the
+    child leads its own process group and is registered in _CHILDREN while
+    it runs. Raises TimeoutExpired at once in an abandoned collector."""
+    worker = threading.current_thread()
+    with _CHILDREN_LOCK:
+        if worker in _ABANDONED:
+            raise subprocess.TimeoutExpired(cmd, 0)
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True,
+                                start_new_session=True, **kwargs)
+        _CHILDREN[proc] = worker
+    with proc:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill(proc)
+            proc.communicate()
+            raise
+        finally:
+            with _CHILDREN_LOCK:
+                _CHILDREN.pop(proc, None)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def abandon(workers: List[threading.Thread], wait: float = 1.0) -> None:
+    """Kill and reap the children of collector threads past the deadline."""
+    with _CHILDREN_LOCK:
+        _ABANDONED.update(workers)
+        children = [proc for proc, worker in _CHILDREN.items() if worker in _ABANDONED]
+    for proc in children:
+        if proc.returncode is not None:  # reaped, not yet deregistered
+            continue
+        _kill(proc)
+        try:
+            proc.wait(wait)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+def _ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def run_collectors(collectors: Dict[str, Callable[[], Any]], deadline: float,
+                   timings: Optional[Dict[str, float]] = None
+                   ) -> Tuple[Dict[str, Any], List[str]]:
+    """Run independent collectors concurrently, waiting at most `deadline`
+    seconds in total (0 = wait for all).
+
+    Returns (results by name, names that missed the deadline or raised).
+    `timings`, if given, receives each collector's ms; a late one gets the
+    time waited for it, a lower bound.
+    Workers are daemon threads, not a ThreadPoolExecutor: the executor joins
+    its workers at interpreter exit, so a hung `gh` would still hold the
+    process open after the output was printed. Children started through
+    run_child() by a late collector are killed and reaped at the deadline.
+    """
+    results: Dict[str, Any] = {}
+    took: Dict[str, float] = {}
+
+    def run(name: str, collect: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            results[name] = collect()
+        except Exception as e:
+            print(f"Warning: wake collector {name} failed: {e}", file=sys.stderr)
+        took[name] = _ms(started)
+
+    workers = []
+    for name, collect in collectors.items():
+        worker = threading.Thread(target=run, args=(name, collect),
+                                  name=f'wake_{name}', daemon=True)
+        worker.start()
+        workers.append(worker)
+
+    started = time.perf_counter()
+    ends_at = time.monotonic() + deadline
+    for worker in workers:
+        worker.join(max(0.0, ends_at - time.monotonic()) if deadline > 0 else None)
+    # Snapshot: a straggler may still finish after the deadline.
+    done = dict(results)
+    abandon([worker for worker in workers if worker.is_alive()])
+    if timings is not None:
+        waited = _ms(started)
+        timings.update({name: took.get(name, waited) for name in collectors})
+    return done, [name for name in collectors if name not in done]
+
+
 def get_wake_data(agent_path: Path) -> Dict[str, Any]:
-    """Gather all data needed for wake output."""
+    """Gather all data needed for wake output.
+
+    Each collector's wall time lands in data['timings_ms'] (L039), so a wake
+    latency budget can be checked per collector, not just in total.
+    """
+    timings: Dict[str, float] = {}
     data = {
         'timestamp': datetime.now().isoformat(),
         'agent_path': str(agent_path),
@@ -348,6 +580,7 @@ def get_wake_data(agent_path: Path) -> Dict[str, Any]:
     }
 
     # L021 Check 1: version.json
+    started = time.perf_counter()
     version_file = agent_path / '.aget' / 'version.json'
     version_data = load_json_file(version_file, {})
 
@@ -358,8 +591,10 @@ def get_wake_data(agent_path: Path) -> Dict[str, Any]:
         'archetype': version_data.get('archetype', ''),
         'template': version_data.get('template', ''),
     }
+    timings['version'] = _ms(started)
 
     # L021 Check 2: identity.json
+    started = time.perf_counter()
     identity_file = agent_path / '.aget' / 'identity.json'
     identity_data = load_json_file(identity_file, {})
 
@@ -371,8 +606,10 @@ def get_wake_data(agent_path: Path) -> Dict[str, Any]:
         'name': identity_data.get('name', data['version']['agent_name']),
         'north_star': north_star,
     }
+    timings['identity'] = _ms(started)
 
     # L021 Check 3: Structure validation
+    started = time.perf_counter()
     required_dirs = ['.aget']
     optional_dirs = ['governance', 'sessions', 'planning']
 
@@ -390,32 +627,44 @@ def get_wake_data(agent_path: Path) -> Dict[str, Any]:
 
     for d in optional_dirs:
         data['structure']['optional'][d] = (agent_path / d).is_dir()
+    timings['structure'] = _ms(started)
 
     # L021 Check 4: Config (C3 — config-driven display)
+    started = time.perf_counter()
     config_file = agent_path / '.aget' / 'config.json'
     config_data = load_json_file(config_file, {})
     wake_config = config_data.get('wake_up', {})
 
     # Merge with defaults
     data['config'] = {**DEFAULT_CONFIG, **wake_config}
-
-    # Git status (conditional on config toggle)
-    if data['config'].get('show_git_status', True):
-        data['git'] = get_git_status(agent_path)
+    timings['config'] = _ms(started)
 
     # Calendar awareness (CAP-SESSION-011)
     if data['config'].get('show_calendar', True):
+        started = time.perf_counter()
         data['calendar'] = get_calendar_context(wake_config)
+        timings['calendar'] = _ms(started)
+
+    # The remaining collectors shell out or walk sessions/ and are
+    # independent, so they run concurrently under one wake deadline: wake
+    # latency is the slowest collector (capped), not their sum.
+    collectors = {}
+
+    # Git status (conditional on config toggle)
+    if data['config'].get('show_git_status', True):
+        collectors['git'] = lambda: get_git_status(agent_path)
 
     # Pending Work surfacing (gh#1285 — structural-not-discipline)
     if data['config'].get('show_pending_work', True):
-        data['pending_work'] = get_pending_work(agent_path)
+        collectors['pending_work'] = lambda: get_pending_work(agent_path)
 
     # Release-currency signal (gh#1833, v3.26 C-26-01) — fail-soft, config-gated
     if data['config'].get('show_release_currency', True):
-        data['release_currency'] = get_release_currency(
+        collectors['release_currency'] = lambda: get_release_currency(
             data['version']['aget_version'],
-            timeout=data['config'].get('release_currency_timeout', 5))
+            timeout=data['config'].get('release_currency_timeout', 5),
+            ttl=data['config'].get('release_currency_ttl',
+                                   DEFAULT_CONFIG['release_currency_ttl']))
 
     # R-BND-001-03 self-attestation (v3.25, gh#1787): when the reliance manifest
     # and its validator are both present, attest conformance at wake-up. Absence
@@ -423,17 +672,18 @@ def get_wake_data(agent_path: Path) -> Dict[str, Any]:
     manifest = agent_path / '.aget' / 'skill_reliance_manifest.yaml'
     validator = agent_path / 'scripts' / 'check_skill_reliance_manifest.py'
     if manifest.exists() and validator.exists():
-        import subprocess as _sp
-        try:
-            r = _sp.run([sys.executable, str(validator)], capture_output=True,
-                        text=True, timeout=15, cwd=str(agent_path))
-            tail = (r.stdout or r.stderr).strip().splitlines()
-            data['reliance_attestation'] = {
-                'ok': r.returncode == 0,
-                'summary': tail[-1] if tail else f'exit {r.returncode}',
-            }
-        except Exception as e:
-            data['reliance_attestation'] = {'ok': False, 'summary': f'validator error: {e}'}
+        collectors['reliance_attestation'] = lambda: get_reliance_attestation(
+            agent_path, validator)
+
+    deadline = data['config'].get('wake_deadline', DEFAULT_CONFIG['wake_deadline'])
+    results, late = run_collectors(collectors, deadline, timings)
+    for name in collectors:
+        data[name] = results[name] if name in results else COLLECTOR_FALLBACKS[name]()
+    data['collectors'] = {'deadline': deadline, 'late': late}
+    if late:
+        print(f"Warning: wake collectors not done by the {deadline}s deadline: "
+              f"{', '.join(late)}", file=sys.stderr)
+    data['timings_ms'] = timings
 
     return data
 
@@ -447,7 +697,18 @@ def call_extension_hook(agent_path: Path, data: Dict[str, Any],
     - Hook returns augmented data dict (additive-only per L464)
     - Hook absence = no-op
     - Hook failure = warning + continue
+
+    Loaded, timed and (opt-in) held to a time budget by extension_hooks.py;
+    when a hook exists its report lands in data['extension_hook'].
     """
+    if _hooks is not None:
+        data, report = _hooks.call_hook(agent_path, 'wake_up', 'post_wake', data)
+        if verbose and report['status'] == 'non_dict':
+            log_diagnostic("Extension hook returned non-dict, ignoring")
+        if report['status'] != 'absent':
+            data['extension_hook'] = report
+        return data
+
     ext_path = agent_path / 'scripts' / 'wake_up_ext.py'
     if not ext_path.exists():
         return data
@@ -469,6 +730,19 @@ def call_extension_hook(agent_path: Path, data: Dict[str, Any],
     return data
 
 
+def format_timings(data: Dict[str, Any]) -> str:
+    """--verbose table of data['timings_ms'], slowest collector first."""
+    timings = dict(data.get('timings_ms', {}))
+    total = timings.pop('total', None)
+    late = set(data.get('collectors', {}).get('late', []))
+    lines = ["Wake timings (ms):"]
+    for name, ms in sorted(timings.items(), key=lambda item: -item[1]):
+        lines.append(f"  {name:<22}{ms:>10.2f}{'  (late)' if name in late else ''}")
+    if total is not None:
+        lines.append(f"  {'total':<22}{total:>10.2f}")
+    return "\n".join(lines)
+
+
 def format_human_output(data: Dict[str, Any]) -> str:
     """Format data for human-readable output with config-driven toggles."""
     lines = []
@@ -572,7 +846,7 @@ def format_human_output(data: Dict[str, Any]) -> str:
     # R-BND-001-03 self-attestation line (v3.25, gh#1787)
     ra = data.get('reliance_attestation')
     if ra:
-        mark = "OK" if ra.get('ok') else "ATTENTION"
+        mark = {True: "OK", None: "UNKNOWN"}.get(ra.get('ok'), "ATTENTION")
         lines.append(f"Reliance self-attestation: {mark} — {ra.get('summary', '')}")
         lines.append("")
 
@@ -635,8 +909,16 @@ Exit codes:
         version='wake_up.py 2.0.0 (AGET v3.6.0)',
     )
 
+    parser.add_argument(
+        '--refresh-release-currency', type=int, metavar='TIMEOUT',
+        help=argparse.SUPPRESS,  # background revalidation of the release cache
+    )
+
     args = parser.parse_args()
 
+    if args.refresh_release_currency is not None:
+        return 0 if refresh_release_cache(args.refresh_release_currency) else 1
+
     # L491: --verify mode
     if args.verify:
         script_path = Path(__file__).resolve()
@@ -679,10 +961,16 @@ Exit codes:
         log_diagnostic(f"Data gathered, valid={data['valid']}")
 
     # C1 Extension Hook (WU-008)
+    started = time.perf_counter()
     data = call_extension_hook(agent_path, data, verbose=args.verbose)
+    timings = data.setdefault('timings_ms', {})
+    timings['extension_hook'] = _ms(started)
+    # Wall time since this module loaded (interpreter start-up excluded).
+    timings['total'] = round((time.time() - _start_time) * 1000, 2)
 
     if args.verbose:
         log_diagnostic("Extension hook complete")
+        print(format_timings(data), file=sys.stderr)
 
     # Output
     if args.json:
@@ -53,6 +53,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+try:
+    import extension_hooks as _hooks  # noqa: E402  (shared hook loader)
+except ImportError:  # loader not deployed — hooks exec'd in-process, untimed (ADR-004)
+    _hooks = None
+try:
+    import repo_state as _repo  # noqa: E402  (shared git status collector)
+except ImportError:  # collector not deployed — per-script git calls (ADR-004)
+    _repo = None
+
 
 # =============================================================================
 # L039: Diagnostic Efficiency - Timing
@@ -348,7 +358,11 @@ def scan_nuggets(agent_path: Path) -> List[Dict[str, Any]]:
 
 
 def get_uncommitted_changes(agent_path: Path) -> List[str]:
-    """Check for uncommitted git changes."""
+    """Check for uncommitted git changes. Never from repo_state's cache: it
+    is keyed on .git/index and HEAD, so it misses edits to tracked files and
+    new untracked files, which are what this check is for."""
+    if _repo is not None:
+        return list(_repo.repo_state(agent_path, cache=False)['changes'])
     try:
         result = subprocess.run(
             ['git', 'status', '--porcelain'],
@@ -505,7 +519,18 @@ def call_extension_hook(agent_path: Path, data: Dict[str, Any],
     - Hook returns augmented data dict (additive-only per L464)
     - Hook absence = no-op
     - Hook failure = warning + continue
+
+    Loaded, timed and (opt-in) held to a time budget by extension_hooks.py;
+    when a hook exists its report lands in data['extension_hook'].
     """
+    if _hooks is not None:
+        data, report = _hooks.call_hook(agent_path, 'wind_down', 'post_wind_down', data)
+        if verbose and report['status'] == 'non_dict':
+            log_diagnostic("Extension hook returned non-dict, ignoring")
+        if report['status'] != 'absent':
+            data['extension_hook'] = report
+        return data
+
     ext_path = agent_path / 'scripts' / 'wind_down_ext.py'
     if not ext_path.exists():
         return data
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import generate_corpus  # noqa: E402
+
+
+def test_generated_corpus_is_deterministic_and_searchable(tmp_path):
+    """Same seed, same tree; every file lands on a study_topic surface."""
+    a, b = tmp_path / "a", tmp_path / "b"
+    counts = {"ldocs": 4, "sessions": 6, "specs": 2, "plans": 2, "sops": 2,
+              "governance": 2, "knowledge": 2, "patterns": 2, "inbox": 2}
+    manifest = generate_corpus.generate(a, counts=counts, vocab=300, max_lines=30, seed=7)
+    assert generate_corpus.generate(b, counts=counts, vocab=300, max_lines=30, seed=7) == manifest
+    files = sorted(p.relative_to(a) for p in a.rglob("*.md"))
+    assert files == sorted(p.relative_to(b) for p in b.rglob("*.md"))
+    assert all((a / f).read_bytes() == (b / f).read_bytes() for f in files)
+    assert manifest["files"] == len(files) == sum(counts.values())
+
+    env = dict(os.environ, AGET_STUDY_ROOT=str(a))
+    out = subprocess.run([sys.executable, str(ROOT / "scripts" / "study_topic.py"),
+                          "--topic", manifest["queries"]["common"], "--json", "--no-floor",
+                          "--include-sessions", "--session-days", "1000", "--no-daemon"],
+                         capture_output=True, text=True, env=env, check=True)
+    findings = json.loads(out.stdout)["findings"]
+    assert {k: len(v) for k, v in findings.items()} == {
+        "ldocs": 4, "patterns": 2, "project_plans": 2, "sops": 2, "governance": 2,
+        "specs": 2, "knowledge": 2, "inbox": 2, "sessions": 6}
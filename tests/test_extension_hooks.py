@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import extension_hooks  # noqa: E402
+
+
+def _hook(agent: Path, name: str, body: str):
+    (agent / "scripts").mkdir(parents=True, exist_ok=True)
+    (agent / "scripts" / f"{name}_ext.py").write_text(body)
+
+
+def test_hook_code_cache_budget_and_failures(tmp_path, monkeypatch):
+    """Code is compiled once per source hash (marshal cache, then in-process
+    module); overruns and failures fall back to the caller's data."""
+    monkeypatch.setenv("AGET_CACHE_DIR", str(tmp_path / "cache"))
+    agent = tmp_path / "agent"
+    data = {"base": 1}
+    assert extension_hooks.call_hook(agent, "demo", "post", data) == (
+        data, {"hook": "scripts/demo_ext.py", "status": "absent"})
+
+    _hook(agent, "demo", "def post(d):\n    d['added'] = True\n    return d\n")
+    out, report = extension_hooks.call_hook(agent, "demo", "post", data)
+    assert out == {"base": 1, "added": True} and data == {"base": 1}
+    assert report["status"] == "ok" and report["code_cache"] == "miss"
+    assert report["budget_ms"] == extension_hooks.HOOK_BUDGET_MS_DEFAULT == 0
+    assert extension_hooks.call_hook(agent, "demo", "post", data)[1]["code_cache"] == "memory"
+    extension_hooks._MODULES.clear()
+    assert extension_hooks.call_hook(agent, "demo", "post", data)[1]["code_cache"] == "hit"
+
+    _hook(agent, "demo", "import time\ndef post(d):\n    time.sleep(1)\n    return {}\n")
+    out, report = extension_hooks.call_hook(agent, "demo", "post", data, budget_ms=50)
+    assert out is data and report["status"] == "over_budget" and report["code_cache"] == "miss"
+    (agent / ".aget").mkdir()
+    (agent / ".aget" / "config.json").write_text(json.dumps({"extension_hooks": {"budget_ms": 40}}))
+    assert extension_hooks.call_hook(agent, "demo", "post", data)[1]["budget_ms"] == 40
+
+    _hook(agent, "demo", "def post(d):\n    raise ValueError('boom')\n")
+    out, report = extension_hooks.call_hook(agent, "demo", "post", data)
+    assert out is data and report["status"] == "failed" and report["error"] == "boom"
+    assert extension_hooks.call_hook(agent, "demo", "other", data)[1]["status"] == "no_entry"
+
+
+def test_hook_code_cache_keys_on_path_and_evicts(tmp_path, monkeypatch):
+    """Identical hooks in two agents keep their own co_filename; a changed
+    source replaces its entry and long-unused entries are dropped."""
+    monkeypatch.setenv("AGET_CACHE_DIR", str(tmp_path / "cache"))
+    body = "def where():\n    return where.__code__.co_filename\n"
+    for name in ("one", "two"):
+        _hook(tmp_path / name, "demo", body)
+    for name in ("one", "two"):
+        extension_hooks._MODULES.clear()
+        module, outcome = extension_hooks.load_hook(tmp_path / name / "scripts" / "demo_ext.py")
+        assert outcome == "miss"
+        assert module.where() == str(tmp_path / name / "scripts" / "demo_ext.py")
+    hooks = tmp_path / "cache" / "hooks"
+    assert len(list(hooks.iterdir())) == 2
+
+    stale = hooks / "gone-0000-1111-tag.bin"
+    stale.write_bytes(b"")
+    os.utime(stale, (0, 0))
+    _hook(tmp_path / "one", "demo", body + "# edited\n")
+    extension_hooks.load_hook(tmp_path / "one" / "scripts" / "demo_ext.py")
+    assert len(list(hooks.iterdir())) == 2 and not stale.exists()
+
+
+def test_study_topic_reports_hook_cost(tmp_path):
+    (tmp_path / "governance").mkdir()
+    (tmp_path / "governance" / "CHARTER.md").write_text("quasar charter\n")
+    _hook(tmp_path, "study_topic",
+          "def post_study(p):\n    p['findings']['extra'] = [{'file': 'x.md'}]\n    return p\n")
+    env = dict(os.environ, AGET_STUDY_ROOT=str(tmp_path), AGET_CACHE_DIR=str(tmp_path / "cache"))
+    out = subprocess.run([sys.executable, str(ROOT / "scripts" / "study_topic.py"),
+                          "--topic", "quasar", "--json", "--no-daemon"],
+                         capture_output=True, text=True, env=env, check=True)
+    doc = json.loads(out.stdout)
+    assert doc["findings"]["extra"] == [{"file": "x.md"}]
+    report = doc["search_contract"]["extension_hook"]
+    assert report["hook"] == "scripts/study_topic_ext.py" and report["status"] == "ok"
+    assert report["load_ms"] >= 0 and report["run_ms"] >= 0
+
+    (tmp_path / "scripts" / "study_topic_ext.py").unlink()
+    out = subprocess.run([sys.executable, str(ROOT / "scripts" / "study_topic.py"),
+                          "--topic", "quasar", "--json", "--no-daemon"],
+                         capture_output=True, text=True, env=env, check=True)
+    assert "extension_hook" not in json.loads(out.stdout)["search_contract"]
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import repo_state  # noqa: E402
+
+
+def _git(repo: Path, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def test_one_status_call_parsed_and_cached(tmp_path):
+    """Branch, counts and v1-style change lines from one porcelain=v2 call;
+    reused until the index changes."""
+    assert repo_state.repo_state(tmp_path)["is_repo"] is False
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    for name in ("a", "b", "c d"):
+        (repo / name).write_text(name)
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "init")
+    _git(repo, "mv", "a", "a2")
+    (repo / "b").write_text("changed")
+    (repo / "new dir").mkdir()
+    (repo / "new dir" / "f").write_text("f")
+
+    state = repo_state.repo_state(repo)
+    assert state["is_repo"] and state["branch"] == "main" and len(state["oid"]) == 40
+    assert state["upstream"] is None and state["ahead"] is None
+    assert state["changes"] == ["R  a -> a2", " M b", "?? new dir/"]
+    assert (state["staged"], state["unstaged"], state["untracked"]) == (1, 1, 1)
+    assert state["clean"] is False
+    assert repo_state.repo_state(repo) is state
+    assert repo_state.repo_state(repo, cache=False) is not state
+
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "next")
+    assert repo_state.repo_state(repo)["clean"] is True
+
+
+def test_wind_down_sees_edits_the_cache_would_miss(tmp_path):
+    """An edit to a tracked file leaves .git/index alone; wind-down still
+    reports it."""
+    import wind_down
+
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a").write_text("a")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    assert wind_down.get_uncommitted_changes(tmp_path) == []
+    assert repo_state.repo_state(tmp_path)["clean"] is True
+    (tmp_path / "a").write_text("edited")
+    (tmp_path / "new").write_text("new")
+    assert wind_down.get_uncommitted_changes(tmp_path) == [" M a", "?? new"]
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_batch_topics_stream_one_result_per_topic(tmp_path):
+    """--topics-file streams one JSON line per topic with the same findings
+    and search_contract a single --json run produces; bad lines become error
+    records in place rather than aborting the batch."""
+    _corpus(tmp_path)
+    topics = tmp_path / "topics.jsonl"
+    topics.write_text('"quasar check"\n\nnot json\n'
+                      '{"topic": "release", "purpose": "audit", "domain_keywords": ["quasar"]}\n'
+                      '{"topic": "release", "domain_keywords": "abc"}\n'
+                      '{"topic": "release", "purpose": "bogus"}\n')
+    env = {**os.environ, "AGET_STUDY_ROOT": str(tmp_path)}
+    proc = subprocess.run([sys.executable, str(SCRIPT), "--topics-file", "-", "--no-floor"],
+                          input=topics.read_text(), text=True, capture_output=True,
+                          env=env, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    lines = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert len(lines) == 5
+    assert lines[1] == {"line": 3, "error": lines[1]["error"]}
+    assert lines[3] == {"line": 5, "error": "domain_keywords must be a list of strings"}
+    assert lines[4]["line"] == 6 and lines[4]["error"].startswith("purpose must be one of")
+
+    singles = [_findings(tmp_path, "--topic", "quasar check", "--no-floor"),
+               _findings(tmp_path, "--topic", "release", "--no-floor", "--purpose", "audit",
+                         "--domain-keywords", "quasar")]
+    for batch, single in zip((lines[0], lines[2]), singles):
+        assert batch["findings"] == single["findings"]
+        for contract in (batch["search_contract"], single["search_contract"]):
+            contract.pop("index")
+            contract.pop("cache")
+        assert batch["search_contract"] == single["search_contract"]
+        assert batch["purpose"] == single["purpose"]
+
+    missing = _run(tmp_path, "--topics-file", str(tmp_path / "nonexistent.jsonl"))
+    assert missing.returncode == 1 and not missing.stdout
+    assert missing.stderr.startswith("Error: --topics-file:") and "Traceback" not in missing.stderr
+
+
+def test_ndjson_streams_hits_then_summary(tmp_path):
+    """--ndjson emits one record per hit, section by section in rank order,
+    then a summary; together they carry exactly what --json reports."""
+    _corpus(tmp_path)
+    args = ("--topic", "quasar release", "--no-floor")
+    whole = _findings(tmp_path, *args)
+    for extra in ((), ("--no-index",), ("--ranker", "bm25", "--no-cache")):
+        result = _run(tmp_path, *args, *extra, "--ndjson")
+        assert result.returncode == 0, result.stderr
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        summary = records.pop()
+        assert summary["type"] == "summary" and "findings" not in summary
+        streamed = {key: [] for key in summary["counts"]}
+        for record in records:
+            assert record["type"] == "hit" and record["topic"] == "quasar release"
+            streamed[record["section"]].append(record["item"])
+            assert record["rank"] == len(streamed[record["section"]])
+        if not extra:
+            assert streamed == whole["findings"]
+        assert summary["total_artifacts"] == len(records) == whole["total_artifacts"]
+
+    topics = tmp_path / "topics.jsonl"
+    topics.write_text('"quasar"\n{bad\n"kelvin"\n')
+    batch = _run(tmp_path, "--topics-file", str(topics), "--ndjson", "--no-floor")
+    kinds = [(r["type"], r.get("topic")) for r in map(json.loads, batch.stdout.splitlines())]
+    assert kinds[-2:] == [("error", None), ("summary", "kelvin")]
+    assert kinds.index(("summary", "quasar")) == len(kinds) - 3 > 0
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_daemon_serves_queries_and_falls_back(tmp_path):
+    """--serve answers CLI queries from memory (same findings as in-process),
+    sees files created after it started, and the CLI silently falls back to
+    in-process search once the daemon is gone."""
+    import socket
+    import time
+    if not hasattr(socket, "AF_UNIX"):
+        return
+    _corpus(tmp_path)
+    env = {**os.environ, "AGET_STUDY_ROOT": str(tmp_path)}
+    daemon = subprocess.Popen([sys.executable, str(SCRIPT), "--serve"], env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    sock = tmp_path / ".aget" / "index" / "study_topic.sock"
+    try:
+        for _ in range(100):
+            if sock.exists():
+                break
+            time.sleep(0.05)
+        assert sock.exists(), daemon.stderr.read() if daemon.poll() is not None else ""
+        args = ("--topic", "quasar", "--no-floor")
+        served = _findings(tmp_path, *args)
+        local = _findings(tmp_path, *args, "--no-daemon")
+        assert served["search_contract"]["served_by"] == "daemon"
+        assert local["search_contract"]["served_by"] == "in-process"
+        assert served["findings"] == local["findings"]
+
+        (tmp_path / "governance" / "QUASAR_NOTES.md").write_text("quasar quasar\n")
+        refreshed = _findings(tmp_path, *args)
+        assert "QUASAR_NOTES.md" in [x["doc"] for x in refreshed["findings"]["governance"]]
+
+        # Per-query state: an edited title is re-read, and --no-cache is
+        # honoured by the daemon rather than only at its start-up.
+        ldoc = tmp_path / ".aget" / "evolution" / "L010_quasar_checks.md"
+        ldoc.write_text(ldoc.read_text().replace("# Quasar checks", "# Quasar audits"))
+        edited = _findings(tmp_path, *args)
+        assert edited["findings"]["ldocs"][0]["title"] == "Quasar audits"
+        assert _findings(tmp_path, *args)["search_contract"]["cache"]["hit"] is True
+        uncached = _findings(tmp_path, *args, "--no-cache")
+        assert uncached["search_contract"]["served_by"] == "daemon"
+        assert uncached["search_contract"]["cache"] == {"enabled": False}
+    finally:
+        daemon.terminate()
+        daemon.wait(timeout=10)
+    assert not sock.exists()
+    after = _findings(tmp_path, "--topic", "quasar", "--no-floor")
+    assert after["search_contract"]["served_by"] == "in-process"
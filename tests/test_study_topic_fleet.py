@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_fleet_merges_roots_with_provenance(tmp_path):
+    """--fleet studies each root with an index of its own, tags every hit with its
+    agent, re-scores BM25 on fleet-wide statistics, and skips a bad root."""
+    local, sibling = tmp_path / "local", tmp_path / "sibling"
+    _corpus(local)
+    (sibling / ".aget" / "evolution").mkdir(parents=True)
+    (sibling / ".aget" / "evolution" / "L020_quasar_drift.md").write_text(
+        "# Quasar drift\n\nquasar quasar release\n")
+    for ranker in ("composite", "bm25"):
+        args = ("--topic", "quasar", "--no-floor", "--ranker", ranker)
+        alone = _findings(local, *args)
+        # The fleet of one (this root, named twice) is the plain study.
+        solo = _findings(local, *args, "--fleet", str(local))
+        assert {k: [(x["file"], x["score"]) for x in v] for k, v in solo["findings"].items()} \
+            == {k: [(x["file"], x["score"]) for x in v] for k, v in alone["findings"].items()}
+
+        fleet = _findings(local, *args, "--fleet", str(sibling), str(tmp_path / "missing"))
+        contract = fleet["search_contract"]
+        assert [(e["agent"], "error" in e) for e in contract["fleet"]] == [
+            ("local", False), ("sibling", False), ("missing", True)]
+        ldocs = fleet["findings"]["ldocs"]
+        assert {(x["agent"], x["file"]) for x in ldocs} == {
+            ("local", ".aget/evolution/L010_quasar_checks.md"),
+            ("sibling", str(sibling / ".aget" / "evolution" / "L020_quasar_drift.md"))}
+        assert all(x["contexts"] for x in ldocs)
+        assert contract["ranking"]["ranker"] == ranker
+    assert contract["ranking"]["corpus_docs"] == 4
+    # The sibling's index is kept under the querying agent, not in its tree.
+    assert not (sibling / ".aget" / "index").exists()
+    assert list((local / ".aget" / "index" / "fleet").glob("sibling-*/study_topic.json"))
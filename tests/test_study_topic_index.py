@@ -0,0 +1,157 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _load_study_topic(root: Path, monkeypatch):
+    monkeypatch.setenv("AGET_STUDY_ROOT", str(root))
+    spec = importlib.util.spec_from_file_location("study_topic_under_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_index_results_match_full_scan(tmp_path):
+    """The index is an accelerator only: findings equal the --no-index scan."""
+    _corpus(tmp_path)
+    for topic in ("quasar check", "release", "quasar v3.26", "checks"):
+        args = ("--topic", topic, "--no-floor", "--domain-keywords", "release", "quasar steps")
+        indexed = _findings(tmp_path, *args)
+        scanned = _findings(tmp_path, *args, "--no-index")
+        assert indexed["findings"] == scanned["findings"], topic
+        assert indexed["search_contract"]["index"]["enabled"] is True
+        assert scanned["search_contract"]["index"] == {"enabled": False}
+
+
+def test_index_refreshes_only_changed_files(tmp_path):
+    """Warm runs re-tokenize nothing; edits, deletions and mtime-only drift are
+    told apart via the manifest's content hash."""
+    _corpus(tmp_path)
+    first = _findings(tmp_path, "--topic", "nebula", "--no-floor")
+    assert (tmp_path / ".aget" / "index" / "study_topic.json").exists()
+    assert first["search_contract"]["index"]["refresh"]["added"] == 3
+    assert first["total_artifacts"] == 0
+
+    warm = _findings(tmp_path, "--topic", "nebula", "--no-floor")
+    assert warm["search_contract"]["index"]["refresh"] == {
+        "added": 0, "changed": 0, "deleted": 0, "rehashed_unchanged": 0}
+
+    charter = tmp_path / "governance" / "CHARTER.md"
+    charter.write_text("nebula charter, much longer now\n")
+    sop = tmp_path / "sops" / "SOP_release.md"
+    os.utime(sop, ns=(sop.stat().st_atime_ns, sop.stat().st_mtime_ns + 10**9))
+    (tmp_path / ".aget" / "evolution" / "L010_quasar_checks.md").unlink()
+    changed = _findings(tmp_path, "--topic", "nebula", "--no-floor")
+    assert changed["search_contract"]["index"]["refresh"] == {
+        "added": 0, "changed": 1, "deleted": 1, "rehashed_unchanged": 1}
+    assert [x["doc"] for x in changed["findings"]["governance"]] == ["CHARTER.md"]
+
+
+def test_reindex_rebuilds_from_scratch(tmp_path):
+    """--reindex is the escape hatch: every file is tokenized again."""
+    _corpus(tmp_path)
+    _findings(tmp_path, "--topic", "quasar")
+    rebuilt = _findings(tmp_path, "--topic", "quasar", "--reindex")
+    assert rebuilt["search_contract"]["index"]["rebuilt"] is True
+    assert rebuilt["search_contract"]["index"]["refresh"]["added"] == 3
+
+
+def test_query_reads_only_its_own_shards(tmp_path, monkeypatch):
+    """The manifest holds records only: a query decodes the vocabulary and
+    its tokens' postings, positions only for a phrase and line offsets only
+    for rendered context. A missing shard means a rebuild, not lost hits."""
+    _corpus(tmp_path)
+    args = ("--topic", "release", "--no-floor", "--no-cache")
+    expected = _findings(tmp_path, *args)
+    sti = _load_study_topic(tmp_path, monkeypatch)._sti
+    index = sti.StudyIndex(sti.default_index_path(tmp_path), tmp_path)
+    assert len(index.files) == 3 and not index._read
+    sop = index.files["sops/SOP_release.md"]
+    n, row = sti.shard_of("release"), int(sop["id"]) % sti.SHARDS
+    assert [token for token, _ in index.occurrences(sop, ["release"])] == ["release"]
+    assert {name for _, name in index._read} == {"vocab", f"postings-{n:02d}"}
+    assert index.positions_of(sop, ["release"])
+    assert index.read_lines(tmp_path / "sops" / "SOP_release.md", sop, [0]) == ["# Release"]
+    assert {name for _, name in index._read} == {
+        "vocab", f"postings-{n:02d}", f"positions-{n:02d}", f"offsets-{row:02d}"}
+
+    for shard in (tmp_path / ".aget" / "index" / "study_topic").glob(f"postings-{n:02d}.*"):
+        shard.unlink()
+    again = _findings(tmp_path, *args)
+    assert again["findings"] == expected["findings"]
+    assert again["search_contract"]["index"]["refresh"]["added"] == 3
+
+
+def test_session_segments_by_month(tmp_path):
+    """Dated session notes live in monthly segments: a --session-days window
+    opens only its months, and sealed (old) months are never re-tokenized."""
+    import datetime
+    today = datetime.date.today()
+    this_month = today.strftime("%Y-%m")
+    sessions = tmp_path / "sessions"
+    sessions.mkdir()
+    (sessions / "SESSION_2020-01-15.md").write_text("quasar drift\n")
+    (sessions / "SESSION_2020-01-20.md").write_text("quasar again\n")
+    (sessions / f"SESSION_{today.isoformat()}.md").write_text("quasar today\n")
+    (sessions / "notes.md").write_text("undated quasar\n")
+
+    def run(days, *extra):
+        found = _findings(tmp_path, "--topic", "quasar", "--no-floor", "--no-cache",
+                          "--include-sessions", "--session-days", str(days), *extra)
+        return sorted(x["doc"] for x in found["findings"]["sessions"]), \
+            found["search_contract"]["index"]
+
+    docs, index = run(100000)
+    assert len(docs) == 4
+    assert index["session_segments"] == {"segments": 2, "sealed": 1,
+                                         "loaded": ["2020-01", this_month]}
+    index_dir = tmp_path / ".aget" / "index"
+    main = json.loads((index_dir / "study_topic.json").read_text())
+    assert "sessions/notes.md" in main["files"]
+    assert not any(key.startswith("sessions/SESSION_") for key in main["files"])
+    old = index_dir / "segments" / "sessions-2020-01.json"
+    assert set(json.loads(old.read_text())["files"]) == {
+        "sessions/SESSION_2020-01-15.md", "sessions/SESSION_2020-01-20.md"}
+
+    # The window opens only its own month's segment.
+    assert run(30)[1]["session_segments"]["loaded"] == [this_month]
+
+    # Sealed: an edit to an old note is not re-tokenized; a late addition is.
+    stamp = old.stat().st_mtime_ns
+    (sessions / "SESSION_2020-01-15.md").write_text("rewritten, nothing to see\n")
+    docs, index = run(100000)
+    assert "SESSION_2020-01-15" in docs and index["refresh"]["changed"] == 0
+    assert old.stat().st_mtime_ns == stamp
+    (sessions / "SESSION_2020-01-28.md").write_text("late quasar\n")
+    docs, index = run(100000)
+    assert "SESSION_2020-01-28" in docs and index["refresh"]["added"] == 1
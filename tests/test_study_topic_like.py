@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_like_ranks_nearest_artifacts_by_cosine(tmp_path):
+    """--like PATH: every surface is scored against the source's TF-IDF
+    vector; the source itself never appears, the relevance floor and purpose
+    boosts still apply, and --no-index is refused (similarity needs vectors)."""
+    _corpus(tmp_path)
+    (tmp_path / "governance" / "MISSION.md").write_text(
+        "quasar release discipline\nno checklist for quasars\n")
+    (tmp_path / "draft.md").write_text("quasars everywhere\nrelease discipline\n")
+    found = _findings(tmp_path, "--like", "draft.md", "--no-floor")
+    ranking = found["search_contract"]["ranking"]
+    assert ranking["ranker"] == "similarity" and ranking["like"] == "draft.md"
+    assert found["search_contract"]["keywords"] == []
+    governance = found["findings"]["governance"]
+    assert [x["doc"] for x in governance] == ["CHARTER.md", "MISSION.md"]
+    assert 0 < governance[1]["similarity"] < governance[0]["similarity"] < 1
+    assert abs(governance[0]["score"] - governance[0]["similarity"] * 10) < 1e-3
+    assert all(x["contexts"] for x in governance)
+
+    source = _findings(tmp_path, "--like", "governance/CHARTER.md", "--no-floor")
+    assert "governance/CHARTER.md" not in {
+        x["file"] for items in source["findings"].values() for x in items}
+    floored = _findings(tmp_path, "--like", "draft.md")
+    assert len(floored["findings"]["governance"]) <= len(governance)
+
+    refused = _run(tmp_path, "--like", "draft.md", "--no-index")
+    assert refused.returncode == 1 and "--like needs the persistent index" in refused.stdout
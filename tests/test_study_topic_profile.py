@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_profile_reports_surfaces_and_phases(tmp_path):
+    """--profile adds per-surface time and I/O and per-phase time to the
+    contract and a table to the report; without it, neither appears."""
+    _corpus(tmp_path)
+    for extra in ((), ("--no-index",)):
+        found = _findings(tmp_path, "--topic", "quasar", "--profile", "--no-cache", *extra)
+        profile = found["search_contract"]["profile"]
+        assert set(profile["surfaces"]) == set(found["findings"])
+        assert profile["files_enumerated"] == 3
+        assert sum(s["files_enumerated"] for s in profile["surfaces"].values()) == 3
+        assert profile["files_read"] >= 3 and profile["bytes_read"] > 0
+        assert set(profile["phases_ms"]) >= {"regex", "scoring", "hook"}
+    assert "profile" not in _findings(tmp_path, "--topic", "quasar")["search_contract"]
+    report = _run(tmp_path, "--topic", "quasar", "--profile").stdout
+    assert "### Profile" in report and "| Phase | ms |" in report
@@ -0,0 +1,109 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _load_study_topic(root: Path, monkeypatch):
+    monkeypatch.setenv("AGET_STUDY_ROOT", str(root))
+    spec = importlib.util.spec_from_file_location("study_topic_under_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_phrase_and_near_operators(tmp_path):
+    """A quoted phrase matches its words in sequence (punctuation and line
+    breaks between them ignored); NEAR/k matches them at most k tokens apart,
+    in either order. Index and scan paths agree."""
+    (tmp_path / "governance").mkdir(parents=True)
+    docs = {
+        "ADJACENT.md": "how we wind down a session\n",
+        "SPLIT.md": "against the wind.\nDown the hall we went\n",
+        "APART.md": "down in the valley the cold wind blew\n",
+        "INFLECT.md": "winds downed every line\n",
+    }
+    for name, text in docs.items():
+        (tmp_path / "governance" / name).write_text(text)
+    (tmp_path / "governance" / "wind_down_notes.md").write_text("nothing here\n")
+
+    def hits(topic, *extra):
+        found = _findings(tmp_path, "--topic", topic, "--no-floor", *extra)
+        return {x["doc"]: x["match_count"] for x in found["findings"]["governance"]}
+
+    for extra in ((), ("--no-index",)):
+        assert set(hits("wind down", *extra)) == set(docs) | {"wind_down_notes.md"}
+        assert hits('"wind down"', *extra) == {"ADJACENT.md": 1, "SPLIT.md": 1,
+                                               "INFLECT.md": 1, "wind_down_notes.md": 1}
+        assert set(hits("wind NEAR/3 down", *extra)) == {
+            "ADJACENT.md", "SPLIT.md", "INFLECT.md", "wind_down_notes.md"}
+        assert set(hits("down NEAR/5 wind", *extra)) == set(hits("wind NEAR/5 down", *extra)) \
+            == set(docs) | {"wind_down_notes.md"}
+        assert set(hits('"cold wind" NEAR/0 blew', *extra)) == {"APART.md"}
+    keywords = _findings(tmp_path, "--topic", '"wind down" release NEAR x')["search_contract"]
+    assert keywords["keywords"] == ['"wind down"', "release NEAR/10 x"]
+
+
+def test_query_term_parses_unprepared_keywords(tmp_path, monkeypatch):
+    """query_term() does not rely on prepare_keywords() having normalized NEAR."""
+    st = _load_study_topic(tmp_path, monkeypatch)
+    assert st.query_term("release NEAR/3 x") == ((("release",), ("x",)), 3)
+    assert st.query_term("release NEAR x") == ((("release",), ("x",)), st.NEAR_DEFAULT_DISTANCE)
+    assert st.query_term('"wind down" NEAR/2 x') == ((("wind", "down"), ("x",)), 2)
+    assert st.query_term("wind down") == ((("wind", "down"),), None)
+    assert st.query_term("a b c") == ((("a", "b", "c"),), None)
+    assert st.query_term("quasar") is None
+
+
+def test_stem_and_fuzzy_expansion_from_vocabulary(tmp_path):
+    """--stem matches inflections through the stem key; --fuzzy matches typo
+    neighbours within the edit budget. Both are off by default, and the index
+    (vocabulary) and scan (per-token predicate) paths agree."""
+    (tmp_path / "governance").mkdir(parents=True)
+    docs = {"A.md": "we are releasing today\n", "B.md": "the relaese went out\n",
+            "C.md": "one release only\n", "D.md": "nothing relevant\n"}
+    for name, text in docs.items():
+        (tmp_path / "governance" / name).write_text(text)
+
+    def hits(*extra):
+        found = _findings(tmp_path, "--topic", "release", "--no-floor", *extra)
+        return sorted(x["doc"] for x in found["findings"]["governance"]), found
+
+    for extra in ((), ("--no-index",)):
+        assert hits(*extra)[0] == ["C.md"]
+        assert hits("--stem", *extra)[0] == ["A.md", "C.md"]
+        assert hits("--fuzzy", *extra)[0] == ["B.md", "C.md"]
+        assert hits("--fuzzy", "1", *extra)[0] == ["C.md"]      # transposition = 2 edits
+        assert hits("--stem", "--fuzzy", *extra)[0] == ["A.md", "B.md", "C.md"]
+    contract = hits("--stem", "--fuzzy")[1]["search_contract"]["expansion"]
+    assert contract["variants"] == {"release": ["relaese", "releasing"]}
+    # A newly written variant invalidates the cached result.
+    (tmp_path / "governance" / "E.md").write_text("two releases\n")
+    assert hits("--stem")[0] == ["A.md", "C.md", "E.md"]
+
+
+def test_stem_key_and_bounded_edit_distance():
+    sys.path.insert(0, str(ROOT / "scripts"))
+    import study_topic_index as sti
+    assert {sti.stem(w) for w in ("release", "releases", "released", "releasing")} == {"releas"}
+    assert sti.stem("planning") == sti.stem("plan") and sti.stem("studies") == "study"
+    assert sti.stem("class") == "class" and sti.stem("l004") == "l004"
+    assert sti.edit_distance("kitten", "sitting", 3) == 3
+    assert sti.edit_distance("kitten", "sitting", 1) == 2
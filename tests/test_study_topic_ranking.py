@@ -0,0 +1,87 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _load_study_topic(root: Path, monkeypatch):
+    monkeypatch.setenv("AGET_STUDY_ROOT", str(root))
+    spec = importlib.util.spec_from_file_location("study_topic_under_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_bm25_ranker_normalizes_document_length(tmp_path):
+    """--ranker bm25: a short precise L-doc outranks a long file that repeats
+    the same terms; the ranking is declared in search_contract."""
+    _corpus(tmp_path)
+    filler = "governance prose about many unrelated things\n" * 400
+    (tmp_path / "governance" / "POLICY.md").write_text(
+        filler + "nebula pulsar\n" * 40 + filler)
+    (tmp_path / ".aget" / "evolution" / "L020_notes.md").write_text("nebula pulsar lesson\n")
+    args = ("--topic", "nebula pulsar", "--no-floor")
+
+    composite = _findings(tmp_path, *args)
+    assert composite["search_contract"]["ranking"]["ranker"] == "composite"
+    assert composite["findings"]["governance"][0]["score"] > composite["findings"]["ldocs"][0]["score"]
+
+    bm25 = _findings(tmp_path, *args, "--ranker", "bm25")
+    ranking = bm25["search_contract"]["ranking"]
+    assert ranking["ranker"] == "bm25"
+    assert set(ranking["idf"]) == {"nebula", "pulsar"}
+    assert bm25["findings"]["ldocs"][0]["score"] > bm25["findings"]["governance"][0]["score"]
+
+    degraded = _findings(tmp_path, *args, "--ranker", "bm25", "--no-index")
+    assert degraded["search_contract"]["ranking"]["ranker"] == "composite"
+    assert "degraded" in degraded["search_contract"]["ranking"]
+
+
+def test_overlapping_keywords_each_count_in_single_pass(tmp_path):
+    """The single-pass matcher attributes a token to every keyword it holds:
+    "quasars" is one match for "quasar" and one for "quasars"."""
+    _corpus(tmp_path)
+    for extra in ((), ("--no-index",)):
+        payload = _findings(tmp_path, "--topic", "quasar quasars", "--no-floor", *extra)
+        charter = payload["findings"]["governance"][0]
+        assert charter["doc"] == "CHARTER.md"
+        assert charter["match_count"] == 2
+        assert charter["keyword_coverage"] == 1.0
+
+
+def test_compute_domain_boost_keeps_content_signature(tmp_path, monkeypatch):
+    """The public (content, domain_keywords) helper agrees with the count the
+    single-pass matcher feeds domain_boost_for()."""
+    st = _load_study_topic(tmp_path, monkeypatch)
+    assert st.compute_domain_boost("Quasar release notes", ["quasar", "RELEASE", "x"]) == 1.5
+    assert st.compute_domain_boost("anything", []) == 1.0
+    assert st.domain_boost_for(2) == 1.5 and st.domain_boost_for(9) == 2.0
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_result_cache_invalidates_only_affected_entries(tmp_path):
+    """An unchanged corpus answers from the result cache; a change evicts an
+    entry only if it touches a matched file or could add a new match."""
+    _corpus(tmp_path)
+    args = ("--topic", "quasar", "--no-floor")
+
+    def run(*extra):
+        payload = _findings(tmp_path, *args, *extra)
+        return payload["findings"], payload["search_contract"]["cache"]
+
+    cold, info = run()
+    assert info["enabled"] and not info["hit"]
+    warm, info = run()
+    assert info["hit"] and warm == cold
+    assert info["validated"] == "stamp"     # answered before the index was read
+    assert run("--no-cache")[1] == {"enabled": False}
+    assert run("--no-index")[1] == {"enabled": False}
+
+    (tmp_path / "governance" / "UNRELATED.md").write_text("nothing relevant\n")
+    info = run()[1]
+    assert info["hit"] is True and info["validated"] == "index"
+    assert run()[1]["validated"] == "stamp"  # re-stamped by the validation
+    (tmp_path / "governance" / "NEW.md").write_text("a quasar appears\n")
+    added, info = run()
+    assert not info["hit"] and "NEW.md" in [x["doc"] for x in added["governance"]]
+    assert run()[1]["hit"] is True
+    (tmp_path / "sops" / "SOP_release.md").unlink()
+    removed, info = run()
+    assert not info["hit"] and removed["sops"] == []
+
+    # BM25 reads corpus-wide statistics: any change at all is a miss.
+    run("--ranker", "bm25")
+    assert run("--ranker", "bm25")[1]["hit"] is True
+    (tmp_path / "governance" / "UNRELATED.md").write_text("still nothing, longer now\n")
+    assert run("--ranker", "bm25")[1]["hit"] is False
+    assert run()[1]["hit"] is True
@@ -0,0 +1,130 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _run(root: Path, *args):
+    env = {**os.environ, "AGET_STUDY_ROOT": str(root)}
+    return subprocess.run([sys.executable, str(SCRIPT), *args], text=True,
+                          capture_output=True, env=env, timeout=30)
+
+
+def _load_study_topic(root: Path, monkeypatch):
+    monkeypatch.setenv("AGET_STUDY_ROOT", str(root))
+    spec = importlib.util.spec_from_file_location("study_topic_under_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _findings(root: Path, *args):
+    result = _run(root, *args, "--json")
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_context_lines_from_offset_table_match_scan(tmp_path, monkeypatch):
+    """Index-path contexts are read by seeking to stored line offsets; they
+    must equal the scan path's, including CRLF and bare-CR line endings."""
+    (tmp_path / ".aget").mkdir()
+    doc = tmp_path / "notes.md"
+    doc.write_bytes("intro\r\nquasar one\r\n\r\nthird quasar\rfourth quasar\nwörld quasar\n"
+                    .encode("utf-8"))
+    st = _load_study_topic(tmp_path, monkeypatch)
+    scanned = st.search_file_for_topic(doc, "quasar")
+    st._PREFETCH.clear()
+    st._INDEX = st._sti.StudyIndex(tmp_path / "index.json", tmp_path,
+                                   describe=st.describe_file, filename_text=st.filename_text)
+    indexed = st.search_file_for_topic(doc, "quasar")
+    assert indexed == scanned
+    assert [c["line"] for c in indexed["contexts"]] == [2, 4, 5]
+    assert st._INDEX.read_lines(doc, st._INDEX.files["notes.md"], [5, 0, 99]) == [
+        "wörld quasar", "intro", ""]
+
+
+def test_contexts_only_for_displayed_items_unless_all(tmp_path):
+    """Context snippets are extracted for the top REPORT_TOP_K items of each
+    section; --all lists every item with its snippets."""
+    (tmp_path / "governance").mkdir(parents=True)
+    for i in range(8):
+        (tmp_path / "governance" / f"DOC_{i}.md").write_text(
+            "intro\n" + "pulsar line\n" * (i + 1))
+    for extra in ((), ("--no-index",)):
+        docs = _findings(tmp_path, "--topic", "pulsar", "--no-floor", *extra)["findings"]["governance"]
+        assert len(docs) == 8
+        assert [("contexts" in x) for x in docs] == [True] * 5 + [False] * 3
+        assert docs[0]["contexts"][0] == {"line": 2, "context": "pulsar line"}
+        full = _findings(tmp_path, "--topic", "pulsar", "--no-floor", "--all", *extra)
+        assert all(x["contexts"] for x in full["findings"]["governance"])
+    report = _run(tmp_path, "--topic", "pulsar", "--no-floor")
+    assert report.returncode == 0 and "  > L2: pulsar line" in report.stdout
+
+
+def test_mmap_scan_matches_read_text_scan(tmp_path, monkeypatch):
+    """Files over MMAP_MIN_BYTES are scanned on an mmap, decoding only hit
+    lines; results equal the read_text() scan, including mixed newlines,
+    case aliases (Kelvin sign), punctuated keywords and phrase domains."""
+    (tmp_path / ".aget").mkdir()
+    doc = tmp_path / "SPEC_big.md"
+    body = ("filler line\r\n" * 50 + "Quasar v3.26 released\r\nwörld QUASARS\rkelvin Kelvin\n"
+            + "release discipline matters\n" + "more filler\n" * 50 + "last quasar")
+    doc.write_bytes(body.encode("utf-8"))
+    bad = tmp_path / "SPEC_bad.md"
+    bad.write_bytes(b"quasar here\n\xff\xfe broken\n")
+    st = _load_study_topic(tmp_path, monkeypatch)
+    queries = [("quasar", None), ("quasar v3.26", ["release discipline"]),
+               ("kelvin", None), ("quasars release", ["matters"])]
+    expected = [st.search_file_for_topic(doc, t, domain_keywords=d) for t, d in queries]
+    assert st.search_file_for_topic(bad, "quasar") is None
+    monkeypatch.setattr(st, "MMAP_MIN_BYTES", 1)
+    monkeypatch.setattr(st, "MMAP_CHUNK", 7)
+    st._PREFETCH.clear()
+    mapped = [st.search_file_for_topic(doc, t, domain_keywords=d) for t, d in queries]
+    assert mapped == expected
+    assert expected[0]["match_count"] == 3 and expected[2]["match_count"] == 2
+    assert st.search_file_for_topic(bad, "quasar") is None
+
+
+def test_mmap_case_aliases_are_complete(tmp_path, monkeypatch):
+    """Every BMP character that IGNORECASE-matches or lower-cases to an ASCII
+    letter is a prefilter alias (re-derived so a Unicode upgrade is caught)."""
+    import re
+    (tmp_path / ".aget").mkdir()
+    st = _load_study_topic(tmp_path, monkeypatch)
+    icase, ascii_letter = re.compile("(?i)[a-z]"), re.compile("[a-z]")
+    derived = {chr(c) for c in range(0x80, 0x10000)
+               if icase.match(chr(c)) or ascii_letter.search(chr(c).lower())}
+    assert derived == set(st.ASCII_CASE_ALIASES)
+
+
+def test_parallel_jobs_match_serial(tmp_path):
+    """--jobs N only spreads per-file work: findings equal --jobs 1 on both
+    the scan path and the index path (cold build and warm query)."""
+    _corpus(tmp_path)
+    for i in range(12):
+        (tmp_path / ".aget" / "evolution" / f"L1{i:02d}_quasar_{i}.md").write_text(
+            "quasar release notes\n" * (i + 1))
+    args = ("--topic", "quasar release", "--no-floor", "--include-instruments")
+    for extra in (("--no-index",), ("--reindex",), ()):
+        serial = _findings(tmp_path, *args, *extra)
+        parallel = _findings(tmp_path, *args, *extra, "--jobs", "3")
+        assert parallel["findings"] == serial["findings"], extra
+        assert parallel["search_contract"]["jobs"] == 3
@@ -0,0 +1,66 @@
+import importlib.util
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "study_topic.py"
+
+
+def _load_study_topic(root: Path, monkeypatch):
+    monkeypatch.setenv("AGET_STUDY_ROOT", str(root))
+    spec = importlib.util.spec_from_file_location("study_topic_under_test", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _corpus(root: Path):
+    (root / ".aget" / "evolution").mkdir(parents=True)
+    (root / "governance").mkdir()
+    (root / "sops").mkdir()
+    (root / ".aget" / "evolution" / "L010_quasar_checks.md").write_text(
+        "# Quasar checks\n\nThe quasar check runs before release.\nChecked twice.\n")
+    (root / "governance" / "CHARTER.md").write_text(
+        "quasars everywhere\nrelease discipline\nno checklist here\n")
+    (root / "sops" / "SOP_release.md").write_text(
+        "# Release\nrelease quasar steps, v3.26 notes\n")
+
+
+def test_single_walk_classifies_surfaces_and_prunes(tmp_path, monkeypatch):
+    """One scandir walk feeds every finder; excluded trees are never entered
+    and each file lands in the surface(s) SURFACE_RULES declares."""
+    _corpus(tmp_path)
+    for rel in ("workspace/deep/x.md", "data/y.md", ".git/objects/z.md", "docs/other/a.md",
+                ".aget/evolution/notes.md", ".aget/evolution/discoveries/origin.md",
+                "specs/B.yaml", "specs/A.md", "planning/PROJECT_PLAN_x.md", "planning/other.md"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("quasar\n")
+    st = _load_study_topic(tmp_path, monkeypatch)
+    visited = []
+    real_scandir = st.os.scandir
+    monkeypatch.setattr(st.os, "scandir", lambda p: visited.append(p) or real_scandir(p))
+    surfaces = st.surface_files()
+    assert st.surface_files() is surfaces
+    rel = {name: [str(p.relative_to(tmp_path)) for p in files] for name, files in surfaces.items()}
+    assert rel["ldocs"] == [".aget/evolution/L010_quasar_checks.md",
+                            ".aget/evolution/discoveries/origin.md"]
+    assert rel["specs"] == ["specs/A.md", "specs/B.yaml"]
+    assert rel["project_plans"] == ["planning/PROJECT_PLAN_x.md"]
+    assert not any(("workspace" in str(p)) or ("data" in str(p)) or (".git" in str(p))
+                   or ("other" in str(p)) for p in visited)
+    walked = len(visited)
+    st.find_ldocs("quasar")
+    st.find_specs("quasar")
+    assert len(visited) == walked
+
+
+def test_canonical_spec_tier_is_walked_recursively(tmp_path, monkeypatch):
+    """Specs nested under ../aget/specs are found, after the instance tier."""
+    agent = tmp_path / "agent"
+    for rel in ("agent/specs/LOCAL.md", "aget/specs/TOP.yaml", "aget/specs/TOP.md",
+                "aget/specs/sub/NESTED_SPEC.md", "aget/specs/sub/deeper/DEEP.yaml"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("quasar\n")
+    st = _load_study_topic(agent, monkeypatch)
+    assert [str(p.relative_to(tmp_path)) for p in st.surface_files()["specs"]] == [
+        "agent/specs/LOCAL.md", "aget/specs/TOP.md", "aget/specs/sub/NESTED_SPEC.md",
+        "aget/specs/TOP.yaml", "aget/specs/sub/deeper/DEEP.yaml"]
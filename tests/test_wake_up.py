@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "scripts" / "wake_up.py"
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import wake_up  # noqa: E402
+
+
+def test_collectors_run_concurrently_under_deadline():
+    """Latency is the slowest collector, capped by the deadline; a late or
+    failing collector is reported, not waited for."""
+    def boom():
+        raise RuntimeError("boom")
+
+    started = time.monotonic()
+    timings = {}
+    results, late = wake_up.run_collectors(
+        {"a": lambda: time.sleep(0.3) or "a", "b": lambda: time.sleep(0.3) or "b",
+         "slow": lambda: time.sleep(5), "boom": boom}, deadline=0.6, timings=timings)
+    assert time.monotonic() - started < 1.5
+    assert results == {"a": "a", "b": "b"} and late == ["slow", "boom"]
+    assert set(timings) == {"a", "b", "slow", "boom"}
+    assert 300 <= timings["a"] < 600 <= timings["slow"] and timings["boom"] < 300
+    assert wake_up.run_collectors({"x": lambda: time.sleep(0.2) or 1}, 0) == ({"x": 1}, [])
+
+
+def test_slow_gh_does_not_delay_wake(tmp_path):
+    """A hung `gh` degrades release currency to 'unknown' at the deadline;
+    the other collectors still report."""
+    agent = tmp_path / "agent"
+    (agent / ".aget").mkdir(parents=True)
+    (agent / ".aget" / "version.json").write_text(json.dumps({"aget_version": "1.0.0"}))
+    (agent / ".aget" / "config.json").write_text(json.dumps({"wake_up": {"wake_deadline": 1}}))
+    (agent / "sessions").mkdir()
+    (agent / "sessions" / "SESSION_2026-01-01.md").write_text("## Pending Work\n- ship it\n")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "gh").write_text(f"#!/bin/sh\nsleep 10 &\necho $! > {tmp_path / 'gh_pid'}\n"
+                                "wait\necho v9.9.9\n")
+    (bin_dir / "gh").chmod(0o755)
+
+    env = dict(os.environ, PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+               AGET_CACHE_DIR=str(tmp_path / "cache"))
+    started = time.monotonic()
+    proc = subprocess.run([sys.executable, str(SCRIPT), "--dir", str(agent), "--json",
+                           "--verbose"], capture_output=True, text=True, env=env)
+    assert time.monotonic() - started < 5
+    data = json.loads(proc.stdout)
+    assert data["collectors"] == {"deadline": 1, "late": ["release_currency"]}
+    assert data["release_currency"] == {"status": "unknown", "latest": None,
+                                        "source": "timeout"}
+    assert data["pending_work"]["items"] == ["ship it"]
+    assert "extension_hook" not in data
+    assert "release_currency" in proc.stderr
+
+    timings = data["timings_ms"]
+    assert set(timings) == {"version", "identity", "structure", "config", "calendar", "git",
+                            "pending_work", "release_currency", "extension_hook", "total"}
+    assert timings["release_currency"] >= 1000 > timings["git"]
+    table = proc.stderr[proc.stderr.index("Wake timings (ms):"):].splitlines()
+    assert table[1].split() == ["release_currency", f"{timings['release_currency']:.2f}", "(late)"]
+    assert table[-2].split()[0] == "total"
+    # The abandoned gh and what it started were killed, not orphaned.
+    stat = Path(f"/proc/{(tmp_path / 'gh_pid').read_text().strip()}/stat")
+    assert not stat.exists() or stat.read_text().split(") ")[1][0] == "Z"
+
+
+def test_late_validator_attests_unknown_not_failure(tmp_path):
+    """A validator still running at the deadline is 'not yet known'."""
+    agent = tmp_path / "agent"
+    (agent / ".aget").mkdir(parents=True)
+    (agent / ".aget" / "config.json").write_text(json.dumps(
+        {"wake_up": {"wake_deadline": 1, "show_release_currency": False}}))
+    (agent / ".aget" / "skill_reliance_manifest.yaml").write_text("skills: []\n")
+    (agent / "scripts").mkdir()
+    (agent / "scripts" / "check_skill_reliance_manifest.py").write_text(
+        "import time\ntime.sleep(10)\n")
+    proc = subprocess.run([sys.executable, str(SCRIPT), "--dir", str(agent), "--json"],
+                          capture_output=True, text=True)
+    assert json.loads(proc.stdout)["reliance_attestation"] == {
+        "ok": None, "summary": "validator still running at wake deadline"}
+    human = subprocess.run([sys.executable, str(SCRIPT), "--dir", str(agent)],
+                           capture_output=True, text=True).stdout
+    assert "Reliance self-attestation: UNKNOWN" in human
+
+
+def test_release_currency_cache_ttl_and_stale_refresh(tmp_path, monkeypatch):
+    """Fresh cache answers without gh; an expired one answers 'stale' at once
+    and a detached refresh rewrites it."""
+    monkeypatch.setenv("AGET_CACHE_DIR", str(tmp_path / "cache"))
+    calls = tmp_path / "gh_calls"
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "gh").write_text(f"#!/bin/sh\necho x >> {calls}\ncat {tmp_path / 'tag'}\n")
+    (bin_dir / "gh").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    (tmp_path / "tag").write_text("v2.0.0\n")
+
+    def gh_calls():
+        return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+    assert wake_up.get_release_currency("1.0.0", ttl=0) == {
+        "status": "behind", "latest": "2.0.0", "source": "live"}
+    assert not wake_up.release_cache_path().exists()
+    assert wake_up.get_release_currency("1.0.0", ttl=60)["source"] == "live"
+    assert wake_up.get_release_currency("2.0.0", ttl=60) == {
+        "status": "current", "latest": "2.0.0", "source": "cache"}
+    assert gh_calls() == 2
+
+    (tmp_path / "tag").write_text("v3.0.0\n")
+    cache = wake_up.release_cache_path()
+    cache.write_text(json.dumps({"latest": "2.0.0", "fetched_at": time.time() - 120}))
+    assert wake_up.get_release_currency("2.0.0", ttl=60) == {
+        "status": "current", "latest": "2.0.0", "source": "stale"}
+    for _ in range(100):
+        if json.loads(cache.read_text())["latest"] == "3.0.0":
+            break
+        time.sleep(0.05)
+    assert wake_up.get_release_currency("2.0.0", ttl=60) == {
+        "status": "behind", "latest": "3.0.0", "source": "cache"}
+    assert gh_calls() == 3